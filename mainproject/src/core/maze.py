@@ -1,4 +1,5 @@
 from enum import Enum
+from .union_find import DisjointSet
 
 class CellType(Enum):
     EMPTY = 0
@@ -20,6 +21,12 @@ class Maze:
         self.start = (-1, -1)
         self.goal = (-1, -1)
         self.portals = {}
+        # disjoint sets over walkable cells + portal pairs, built on first query.
+        # once a maze is in play, edits must go through set_cell to keep it valid
+        self._conn = None
+        # callables(x, y) told after every set_cell, e.g. to redraw one cached tile
+        self.listeners = []
+
     def in_bounds(self, x, y):
         return 0 <= x < self.rows and 0 <= y < self.cols
 
@@ -32,4 +39,89 @@ class Maze:
         if (x, y) == entry:
             return exit_pos
         else:
-            return entry
\ No newline at end of file
+            return entry
+
+    def set_cell(self, x, y, cell_type, portal_id=-1):
+        cell = self.grid[x][y]
+        old_type = cell.type
+
+        if old_type == CellType.PORTAL:
+            self._unlink_portal(cell.portal_id, (x, y))
+        if self.start == (x, y):
+            self.start = (-1, -1)
+        if self.goal == (x, y):
+            self.goal = (-1, -1)
+
+        cell.type = cell_type
+        cell.portal_id = portal_id if cell_type == CellType.PORTAL else -1
+
+        if cell_type == CellType.START:
+            self.start = (x, y)
+        elif cell_type == CellType.GOAL:
+            self.goal = (x, y)
+        elif cell_type == CellType.PORTAL:
+            self._link_portal(portal_id, (x, y))
+
+        for listener in self.listeners:
+            listener(x, y)
+
+        if self._conn is None:
+            return
+
+        # removing floor or a portal link can split a component: rebuild lazily.
+        # opening a wall or linking a portal only ever merges, so union in place
+        if old_type == CellType.PORTAL or (cell_type == CellType.WALL and old_type != CellType.WALL):
+            self._conn = None
+            return
+
+        if old_type == CellType.WALL and cell_type != CellType.WALL:
+            self._join_neighbours(x, y)
+        if cell_type == CellType.PORTAL:
+            ends = self.portals[portal_id]
+            if len(ends) == 2:
+                self._conn.union(self._index(*ends[0]), self._index(*ends[1]))
+
+    def connected(self, a, b):
+        """True if b is reachable from a without breaking any walls."""
+        if self._conn is None:
+            self._build_connectivity()
+        return self._conn.find(self._index(*a)) == self._conn.find(self._index(*b))
+
+    def _index(self, x, y):
+        return x * self.cols + y
+
+    def _link_portal(self, pid, pos):
+        ends = [p for p in self.portals.get(pid, ()) if p != (-1, -1) and p != pos]
+        ends.append(pos)
+        self.portals[pid] = tuple(ends)
+
+    def _unlink_portal(self, pid, pos):
+        ends = tuple(p for p in self.portals.get(pid, ()) if p != (-1, -1) and p != pos)
+        if ends:
+            self.portals[pid] = ends
+        else:
+            self.portals.pop(pid, None)
+
+    def _join_neighbours(self, x, y):
+        here = self._index(x, y)
+        for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]:
+            nx, ny = x + dx, y + dy
+            if self.in_bounds(nx, ny) and self.grid[nx][ny].type != CellType.WALL:
+                self._conn.union(here, self._index(nx, ny))
+
+    def _build_connectivity(self):
+        self._conn = DisjointSet(self.rows * self.cols)
+        for x in range(self.rows):
+            row = self.grid[x]
+            for y in range(self.cols):
+                if row[y].type == CellType.WALL:
+                    continue
+                # right and down neighbours cover every edge once
+                if y + 1 < self.cols and row[y + 1].type != CellType.WALL:
+                    self._conn.union(self._index(x, y), self._index(x, y + 1))
+                if x + 1 < self.rows and self.grid[x + 1][y].type != CellType.WALL:
+                    self._conn.union(self._index(x, y), self._index(x + 1, y))
+
+        for ends in self.portals.values():
+            if len(ends) == 2 and (-1, -1) not in ends:
+                self._conn.union(self._index(*ends[0]), self._index(*ends[1]))
@@ -4,9 +4,18 @@ from ..core.maze import CellType
 
 
 class BFSSolver:
-    def __init__(self, maze, k):
+    def __init__(self, maze, k, use_portals=True):
         self.maze = maze
         self.K = k
+        self.use_portals = use_portals
+
+    def is_solvable(self):
+        # walls-free connectivity is exact for K=0 and a sufficient check for any K
+        if self.use_portals and self.maze.connected(self.maze.start, self.maze.goal):
+            return True
+        if self.K == 0 and self.use_portals:
+            return False
+        return self.shortest_path() != -1
 
     
     def shortest_path(self):
@@ -41,7 +50,7 @@ class BFSSolver:
                             visited[nx][ny][cur.breaks_used] = True
                             q.append(State(nx, ny, cur.breaks_used))
 
-                if self.maze.is_portal(cur.x, cur.y):
+                if self.use_portals and self.maze.is_portal(cur.x, cur.y):
                     px, py = self.maze.exit_portal(cur.x, cur.y)
                     if not visited[px][py][cur.breaks_used]:
                         visited[px][py][cur.breaks_used] = True
@@ -100,7 +109,7 @@ class BFSSolver:
                         q.append((nx, ny, b))
 
             
-            if self.maze.is_portal(x, y):
+            if self.use_portals and self.maze.is_portal(x, y):
                 px, py = self.maze.exit_portal(x, y)
                 if not visited[px][py][b]:
                     visited[px][py][b] = True
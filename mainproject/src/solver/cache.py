@@ -0,0 +1,23 @@
+from collections import OrderedDict
+from .bfs_solver import BFSSolver
+from .AStarSolver import AStarSolver
+
+MAX_ENTRIES = 32
+
+_solutions = OrderedDict()
+
+
+def solve(maze, K, key):
+    """((bfs_dist, bfs_path), (astar_dist, astar_path)) memoised by the maze store id."""
+    if key in _solutions:
+        _solutions.move_to_end(key)
+        return _solutions[key]
+
+    bfs = BFSSolver(maze, K).shortest_path_with_path()
+    astar = AStarSolver(maze, K).shortest_path()
+    result = (bfs if bfs else (0, []), astar if astar else (0, []))
+
+    _solutions[key] = result
+    if len(_solutions) > MAX_ENTRIES:
+        _solutions.popitem(last=False)
+    return result
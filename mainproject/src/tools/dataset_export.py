@@ -0,0 +1,169 @@
+import argparse
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.core.maze import CellType
+from src.solver.bfs_solver import BFSSolver
+from src.tools.dataset_generator import generate_maze
+
+# per-maze arrays in every shard; the leading axis is the maze index
+FIELDS = ["cells", "portals", "dist", "path", "seeds"]
+
+
+def maze_to_arrays(maze):
+    cells = np.empty((maze.rows, maze.cols), dtype=np.uint8)
+    portals = np.full((maze.rows, maze.cols), -1, dtype=np.int8)
+    for i in range(maze.rows):
+        row = maze.grid[i]
+        for j in range(maze.cols):
+            cell = row[j]
+            cells[i, j] = cell.type.value
+            if cell.type == CellType.PORTAL:
+                portals[i, j] = cell.portal_id
+    return cells, portals
+
+
+def distance_field(maze, K):
+    """Steps to the goal from every (breaks_used, x, y) state, -1 if it can't get there.
+
+    Reverse BFS over the same layered graph BFSSolver walks forwards.
+    """
+    R, C = maze.rows, maze.cols
+    dist = np.full((K + 1, R, C), -1, dtype=np.int32)
+    d = dist.tolist()
+
+    gx, gy = maze.goal
+    q = deque()
+    for b in range(K + 1):
+        d[b][gx][gy] = 0
+        q.append((gx, gy, b))
+
+    while q:
+        x, y, b = q.popleft()
+        nd = d[b][x][y] + 1
+
+        # entering (x, y) costs a break if it is a wall
+        pb = b - 1 if maze.grid[x][y].type == CellType.WALL else b
+        if pb >= 0:
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                ux, uy = x + dx, y + dy
+                if maze.in_bounds(ux, uy) and d[pb][ux][uy] == -1:
+                    d[pb][ux][uy] = nd
+                    q.append((ux, uy, pb))
+
+        if maze.is_portal(x, y):
+            ux, uy = maze.exit_portal(x, y)
+            if d[b][ux][uy] == -1:
+                d[b][ux][uy] = nd
+                q.append((ux, uy, b))
+
+    dist[...] = d
+    return dist
+
+
+def path_mask(maze, K):
+    mask = np.zeros((maze.rows, maze.cols), dtype=np.bool_)
+    res = BFSSolver(maze, K).shortest_path_with_path()
+    if res:
+        for x, y in res[1]:
+            mask[x, y] = True
+    return mask
+
+
+def build_shard(out_dir, shard_idx, count, R, C, portal_pairs, wall_noise, K, seed, fmt):
+    rng = random.Random(seed * 1000003 + shard_idx)
+    fields = {name: [] for name in FIELDS}
+
+    while len(fields["seeds"]) < count:
+        gen_seed = rng.getrandbits(32)
+        maze = generate_maze(R, C, portal_pairs, wall_noise, gen_seed)
+        dist = distance_field(maze, K)
+        sx, sy = maze.start
+        if dist[0, sx, sy] == -1:
+            continue
+
+        cells, portals = maze_to_arrays(maze)
+        fields["cells"].append(cells)
+        fields["portals"].append(portals)
+        fields["dist"].append(dist)
+        fields["path"].append(path_mask(maze, K))
+        fields["seeds"].append(gen_seed)
+
+    arrays = {name: np.stack(vals) if name != "seeds" else np.array(vals, dtype=np.uint32)
+              for name, vals in fields.items()}
+
+    name = f"shard_{shard_idx:05d}"
+    if fmt == "npz":
+        path = os.path.join(out_dir, name + ".npz")
+        np.savez(path, **arrays)
+    else:
+        path = os.path.join(out_dir, name)
+        os.makedirs(path, exist_ok=True)
+        for field, arr in arrays.items():
+            np.save(os.path.join(path, field + ".npy"), arr)
+    return path
+
+
+def export_dataset(out_dir, n_mazes, R=15, C=15, portal_pairs=3, wall_noise=15, K=0,
+                   shard_size=1024, workers=None, seed=0, fmt="npy"):
+    """Generate n_mazes solvable mazes across worker processes and write them as shards.
+
+    fmt="npy" writes one directory of .npy files per shard so load_shard can
+    memory-map them; fmt="npz" writes a single (uncompressed) archive per shard.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    counts = [shard_size] * (n_mazes // shard_size)
+    if n_mazes % shard_size:
+        counts.append(n_mazes % shard_size)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(build_shard, out_dir, i, count, R, C, portal_pairs, wall_noise, K, seed, fmt)
+                   for i, count in enumerate(counts)]
+        shards = [f.result() for f in futures]
+
+    meta = {
+        "rows": R, "cols": C, "portal_pairs": portal_pairs, "wall_noise": wall_noise,
+        "K": K, "seed": seed, "format": fmt, "count": n_mazes,
+        "cell_types": {t.name: t.value for t in CellType},
+        "shards": [os.path.basename(p) for p in shards],
+    }
+    with open(os.path.join(out_dir, "meta.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return shards
+
+
+def load_shard(path):
+    # .npy directories are memory-mapped, so nothing is read until it's indexed
+    if path.endswith(".npz"):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+    return {name: np.load(os.path.join(path, name + ".npy"), mmap_mode='r') for name in FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export generated mazes as NumPy shards")
+    parser.add_argument("out_dir")
+    parser.add_argument("-n", "--count", type=int, default=10000)
+    parser.add_argument("--size", default="15x15")
+    parser.add_argument("--portals", type=int, default=3)
+    parser.add_argument("--noise", type=int, default=15)
+    parser.add_argument("-k", type=int, default=0)
+    parser.add_argument("--shard-size", type=int, default=1024)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--format", choices=["npy", "npz"], default="npy")
+    args = parser.parse_args()
+
+    R, C = map(int, args.size.split("x"))
+    shards = export_dataset(args.out_dir, args.count, R, C, args.portals, args.noise, args.k,
+                            args.shard_size, args.workers, args.seed, args.format)
+    print(f"Wrote {args.count} mazes to {len(shards)} shards in {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
 import random
-import sys
-sys.setrecursionlimit(10000)
 from src.core.maze import Maze, CellType
 from src.solver.bfs_solver import BFSSolver
 
@@ -8,39 +6,56 @@ from src.solver.bfs_solver import BFSSolver
 DX = [-1, 1, 0, 0]
 DY = [0, 0, -1, 1]
 
-def rand_odd(lo, hi):
-    x = random.randint(lo//2, (hi-1)//2)*2+1
+def rand_odd(lo, hi, rng=random):
+    x = rng.randint(lo//2, (hi-1)//2)*2+1
     return min(x, hi)
 
-def get_portal_chars():
+def get_portal_chars(rng=random):
     chars = []
     for c in range(ord('A'), ord('Z') + 1):
         if chr(c) not in ['S', 'G']:
             chars.append(chr(c))
-    random.shuffle(chars)
+    rng.shuffle(chars)
     return chars
 
-def generate_maze(R, C, portal_pairs, wall_noise):
+def make_rng(seed=None):
+    # accepts an int seed or an existing random.Random so callers can share one stream
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+def generate_maze(R, C, portal_pairs, wall_noise, seed=None):
+    rng = make_rng(seed)
     maze = Maze(R, C)
     grid = [['#']*C for _ in range(R)]
 
-    def dfs(x, y):
+    def visit(x, y):
         grid[x][y] = '.'
         dirs = list(range(4))
-        random.shuffle(dirs)
-        for d in dirs:
-            nx, ny = x+DX[d]*2, y+DY[d]*2
-            if 0<nx<R-1 and 0 <ny<C-1 and grid[nx][ny] == '#':
-                grid[x+DX[d]][y+DY[d]] = '.'
-                dfs(nx, ny)
-
-    dfs(1, 1)
+        rng.shuffle(dirs)
+        return [x, y, dirs, 0]
+
+    # explicit-stack DFS: same visiting order (and rng calls) as the recursive
+    # version, without the recursion limit capping the maze size
+    stack = [visit(1, 1)]
+    while stack:
+        frame = stack[-1]
+        x, y, dirs, k = frame
+        if k == 4:
+            stack.pop()
+            continue
+        frame[3] = k + 1
+        d = dirs[k]
+        nx, ny = x+DX[d]*2, y+DY[d]*2
+        if 0<nx<R-1 and 0 <ny<C-1 and grid[nx][ny] == '#':
+            grid[x+DX[d]][y+DY[d]] = '.'
+            stack.append(visit(nx, ny))
     grid[1][1] = 'S'
     grid[R-2][C-2] = 'G'
 
     for i in range(1, R-1):
         for j in range(1, C-1):
-            if grid[i][j] == '.' and random.random() < wall_noise/100.0:
+            if grid[i][j] == '.' and rng.random() < wall_noise/100.0:
                 grid[i][j] = '#'
 
     grid[1][1] = 'S'
@@ -52,8 +67,8 @@ def generate_maze(R, C, portal_pairs, wall_noise):
             if grid[i][j] == '.':
                 empty.append((i, j))
 
-    random.shuffle(empty)
-    portal_chars = get_portal_chars()
+    rng.shuffle(empty)
+    portal_chars = get_portal_chars(rng)
     pid_map = {}
     next_pid = 0
     idx = 0
@@ -0,0 +1,192 @@
+import datetime
+from collections import deque
+
+from src.core.maze import CellType
+from src.solver.bfs_solver import BFSSolver
+from src.solver.AStarSolver import AStarSolver
+from src.tools.dataset_generator import generate_maze, make_rng
+
+METRICS = ["path_len", "expanded", "dead_end_ratio", "portal_gain", "breaks_needed"]
+
+
+def bands_for(R, C):
+    """Difficulty bands for an R x C map: metric -> (lo, hi); missing metrics are not constrained.
+
+    Path lengths are fractions of the start-to-goal Manhattan distance, the
+    shortest walk without portals; anything shorter needs a portal shortcut.
+    Expanded counts scale with the open interior.
+    """
+    d = (R - 3) + (C - 3)
+    area = (R - 2) * (C - 2)
+    return {
+        "easy": {
+            "path_len": (d // 3, d * 3 // 4),
+            "expanded": (0, area * 3 // 10),
+            "dead_end_ratio": (0.0, 0.28),
+            "breaks_needed": (0, 1),
+        },
+        "medium": {
+            "path_len": (d * 3 // 4, d * 5 // 4),
+            "expanded": (area // 4, area * 7 // 10),
+            "dead_end_ratio": (0.22, 0.35),
+        },
+        "hard": {
+            "path_len": (d, d * 2),
+            "expanded": (area * 7 // 10, area * 12 // 5),
+            "dead_end_ratio": (0.3, 1.0),
+            "portal_gain": (0.0, 0.5),
+            "breaks_needed": (2, 5),
+        },
+    }
+
+
+# the 15x15 maps the game generates
+BANDS = bands_for(15, 15)
+
+INFEASIBLE = float('inf')
+
+
+def min_breaks(maze):
+    # 0-1 BFS where entering a wall costs one break
+    INF = float('inf')
+    dist = [[INF] * maze.cols for _ in range(maze.rows)]
+    sx, sy = maze.start
+    dist[sx][sy] = 0
+    dq = deque([(sx, sy)])
+
+    while dq:
+        x, y = dq.popleft()
+        d = dist[x][y]
+        if (x, y) == maze.goal:
+            return d
+
+        nxt = []
+        for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+            nx, ny = x + dx, y + dy
+            if maze.in_bounds(nx, ny):
+                nxt.append((nx, ny, 1 if maze.grid[nx][ny].type == CellType.WALL else 0))
+        if maze.is_portal(x, y):
+            px, py = maze.exit_portal(x, y)
+            nxt.append((px, py, 0))
+
+        for nx, ny, w in nxt:
+            if d + w < dist[nx][ny]:
+                dist[nx][ny] = d + w
+                if w:
+                    dq.append((nx, ny))
+                else:
+                    dq.appendleft((nx, ny))
+
+    return -1
+
+
+def dead_end_ratio(maze):
+    walkable = 0
+    dead_ends = 0
+    for i in range(maze.rows):
+        for j in range(maze.cols):
+            if maze.grid[i][j].type == CellType.WALL:
+                continue
+            walkable += 1
+            exits = 0
+            for dx, dy in [(-1, 0), (1, 0), (0, -1), (0, 1)]:
+                nx, ny = i + dx, j + dy
+                if maze.in_bounds(nx, ny) and maze.grid[nx][ny].type != CellType.WALL:
+                    exits += 1
+            if exits <= 1:
+                dead_ends += 1
+    return dead_ends / walkable if walkable else 0.0
+
+
+def measure(maze, K, breaks=None):
+    """Feature row for one maze, or None when it can't be solved with K breaks."""
+    if breaks is None:
+        breaks = min_breaks(maze)
+    if breaks == -1 or breaks > K:
+        return None
+
+    path_len = BFSSolver(maze, K).shortest_path()
+
+    astar = AStarSolver(maze, K)
+    astar.shortest_path()
+
+    no_portal = BFSSolver(maze, K, use_portals=False).shortest_path()
+    if no_portal == -1:
+        portal_gain = 1.0
+    else:
+        portal_gain = (no_portal - path_len) / no_portal if no_portal else 0.0
+
+    return {
+        "path_len": path_len,
+        "expanded": astar.expanded,
+        "dead_end_ratio": dead_end_ratio(maze),
+        "portal_gain": portal_gain,
+        "breaks_needed": breaks,
+    }
+
+
+def score_batch(rows, band):
+    """Distance of every row from the band, computed one metric column at a time.
+
+    A row inside the band scores 0. Each metric contributes how far it falls
+    outside its range, normalised by the range width.
+    """
+    scores = [0.0 if row is not None else INFEASIBLE for row in rows]
+
+    for metric, (lo, hi) in band.items():
+        width = max(hi - lo, 1)
+        column = [row[metric] if row is not None else lo for row in rows]
+        for i, v in enumerate(column):
+            scores[i] += max(0, lo - v, v - hi) / width
+
+    return scores
+
+
+def generate_targeted(band, R, C, portal_pairs, wall_noise, K=None, seed=None,
+                      batch_size=8, max_batches=16):
+    """Generate candidates in batches and keep the one closest to the band.
+
+    Returns (maze, K, gen_seed, metrics). gen_seed regenerates the maze with
+    generate_maze, so the result can be shared as an MS3 code. When K is None
+    each candidate gets K = breaks needed plus one or two spare breaks.
+    """
+    rng = make_rng(seed)
+    best = None
+
+    for _ in range(max_batches):
+        batch = []
+        rows = []
+        for _ in range(batch_size):
+            gen_seed = rng.getrandbits(32)
+            maze = generate_maze(R, C, portal_pairs, wall_noise, gen_seed)
+            needed = min_breaks(maze)
+            if K is None:
+                cand_k = min(5, max(needed, 0) + rng.randint(1, 2))
+            else:
+                cand_k = K
+            batch.append((maze, cand_k, gen_seed))
+            rows.append(measure(maze, cand_k, needed))
+
+        scores = score_batch(rows, band)
+        i = min(range(len(scores)), key=scores.__getitem__)
+        if scores[i] != INFEASIBLE and (best is None or scores[i] < best[0]):
+            best = (scores[i], batch[i], rows[i])
+
+        if best is not None and best[0] == 0:
+            break
+
+    if best is None:
+        raise RuntimeError("No solvable candidate found")
+
+    _, (maze, cand_k, gen_seed), metrics = best
+    return maze, cand_k, gen_seed, metrics
+
+
+def daily_seed(date=None):
+    date = date or datetime.date.today()
+    return int(date.strftime("%Y%m%d"))
+
+
+def daily_challenge(date=None, band="medium", R=15, C=15, portal_pairs=3, wall_noise=15):
+    # same date -> same map for every player, since the search is seeded by the date
+    return generate_targeted(bands_for(R, C)[band], R, C, portal_pairs, wall_noise, seed=daily_seed(date))
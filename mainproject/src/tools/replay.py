@@ -0,0 +1,259 @@
+import argparse
+import base64
+import json
+import os
+import time
+
+from src.core.maze import CellType
+from src.solver.bfs_solver import BFSSolver
+
+# prefix code, most significant bit first:
+#   move   0dd   (3 bits)
+#   portal 10    (2 bits)
+#   break  11dd  (4 bits)
+# dd indexes DIRS. The blob is a LEB128 action count followed by the packed bits.
+DIRS = [(-1, 0), (1, 0), (0, -1), (0, 1)]
+DIR_INDEX = {d: i for i, d in enumerate(DIRS)}
+MOVE, PORTAL, BREAK = range(3)
+
+
+def compute_score(bfs_dist, steps):
+    return (bfs_dist / steps) * 100 if steps > 0 else 0
+
+
+class ReplayRecorder:
+    """Accumulates the player's successful actions as prefix-coded bits."""
+
+    def __init__(self):
+        self.bits = 0
+        self.nbits = 0
+        self.count = 0
+
+    def _push(self, value, width):
+        self.bits = (self.bits << width) | value
+        self.nbits += width
+        self.count += 1
+
+    def move(self, dx, dy):
+        self._push(DIR_INDEX[(dx, dy)], 3)
+
+    def portal(self):
+        self._push(0b10, 2)
+
+    def break_wall(self, dx, dy):
+        self._push(0b1100 | DIR_INDEX[(dx, dy)], 4)
+
+    def __len__(self):
+        return self.count
+
+    def encode(self):
+        head = bytearray()
+        n = self.count
+        while True:
+            byte = n & 0x7f
+            n >>= 7
+            head.append(byte | (0x80 if n else 0))
+            if not n:
+                break
+        pad = -self.nbits % 8
+        body = (self.bits << pad).to_bytes((self.nbits + pad) // 8, "big")
+        return base64.urlsafe_b64encode(bytes(head) + body).decode().rstrip("=")
+
+
+def _unpack(blob):
+    # (action count, payload as one int, payload bit length)
+    pad = len(blob) % 4
+    raw = base64.urlsafe_b64decode(blob + "=" * (4 - pad) if pad else blob)
+    count = shift = i = 0
+    while True:
+        if i >= len(raw):
+            raise ValueError("Truncated replay header")
+        byte = raw[i]
+        count |= (byte & 0x7f) << shift
+        shift += 7
+        i += 1
+        if not byte & 0x80:
+            break
+    body = raw[i:]
+    return count, int.from_bytes(body, "big"), len(body) * 8
+
+
+def decode_actions(blob):
+    """[(MOVE|PORTAL|BREAK, direction or None), ...]"""
+    count, bits, nbits = _unpack(blob)
+    out = []
+    pos = nbits
+    for _ in range(count):
+        if pos < 2:
+            raise ValueError("Truncated replay")
+        if not (bits >> (pos - 1)) & 1:
+            if pos < 3:
+                raise ValueError("Truncated replay")
+            out.append((MOVE, (bits >> (pos - 3)) & 3))
+            pos -= 3
+        elif not (bits >> (pos - 2)) & 1:
+            out.append((PORTAL, None))
+            pos -= 2
+        else:
+            if pos < 4:
+                raise ValueError("Truncated replay")
+            out.append((BREAK, (bits >> (pos - 4)) & 3))
+            pos -= 4
+    return out
+
+
+class ReplayVerifier:
+    """Re-simulates replays on one maze with Player's rules, on flat tables.
+
+    Neighbour, portal-exit and wall tables are built once per maze; each replay
+    only copies the wall bytearray, so batches on the same maze stay cheap.
+    A replay only holds actions that succeeded in the game, so any action the
+    simulation can't perform means the replay was tampered with.
+    """
+
+    def __init__(self, maze, K, bfs_dist=None):
+        R, C = maze.rows, maze.cols
+        self.K = K
+        self.start = maze.start[0] * C + maze.start[1]
+        self.goal = maze.goal[0] * C + maze.goal[1]
+
+        self.walls = bytearray(R * C)
+        self.exits = [-1] * (R * C)
+        for x in range(R):
+            for y in range(C):
+                i = x * C + y
+                if maze.grid[x][y].type == CellType.WALL:
+                    self.walls[i] = 1
+                elif maze.is_portal(x, y):
+                    ex, ey = maze.exit_portal(x, y)
+                    self.exits[i] = ex * C + ey
+
+        self.neighbours = []
+        for dx, dy in DIRS:
+            table = []
+            for x in range(R):
+                for y in range(C):
+                    nx, ny = x + dx, y + dy
+                    table.append(nx * C + ny if 0 <= nx < R and 0 <= ny < C else -1)
+            self.neighbours.append(table)
+
+        if bfs_dist is None:
+            res = BFSSolver(maze, K).shortest_path_with_path()
+            bfs_dist = res[0] if res else 0
+        self.bfs_dist = bfs_dist
+
+    def steps(self, blob):
+        """Step count of a replay that legally ends on the goal, else None."""
+        try:
+            count, bits, pos = _unpack(blob)
+        except ValueError:
+            return None
+
+        walls = self.walls[:]
+        exits = self.exits
+        nbr = self.neighbours
+        i = self.start
+        breaks = self.K
+        steps = 0
+        for _ in range(count):
+            if pos < 2:
+                return None
+            if not (bits >> (pos - 1)) & 1:
+                if pos < 3:
+                    return None
+                j = nbr[(bits >> (pos - 3)) & 3][i]
+                pos -= 3
+                if j < 0 or walls[j]:
+                    return None
+                i = j
+                steps += 1
+            elif not (bits >> (pos - 2)) & 1:
+                pos -= 2
+                j = exits[i]
+                if j < 0:
+                    return None
+                i = j
+                steps += 1
+            else:
+                if pos < 4 or breaks == 0:
+                    return None
+                j = nbr[(bits >> (pos - 4)) & 3][i]
+                pos -= 4
+                if j < 0 or not walls[j]:
+                    return None
+                walls[j] = 0
+                breaks -= 1
+        return steps if i == self.goal else None
+
+    def check(self, entry):
+        """(ok, steps, recomputed score) for a leaderboard entry carrying a replay."""
+        blob = entry.get("replay")
+        steps = self.steps(blob) if blob else None
+        if steps is None:
+            return False, None, None
+        score = round(compute_score(self.bfs_dist, steps), 2)
+        return abs(score - entry["score"]) < 0.006, steps, score
+
+
+def verify_batch(maze, K, entries):
+    verifier = ReplayVerifier(maze, K)
+    return [verifier.check(entry) for entry in entries]
+
+
+def _boards(path):
+    # (seed, entries) from a leaderboard.json, a leaderboard.db, or the configured backend
+    if path and path.endswith(".json"):
+        with open(path, "r") as f:
+            yield from json.load(f).items()
+        return
+    if path:
+        from web.leaderboard_sqlite import SqliteBackend
+        backend = SqliteBackend(path)
+    else:
+        from web.leaderboard import get_backend
+        backend = get_backend()
+    try:
+        try:
+            seeds = backend.seeds()
+        except NotImplementedError as e:
+            raise SystemExit(f"{e}; pass a leaderboard.json or leaderboard.db instead")
+        for seed in seeds:
+            yield seed, backend.get_scores(seed)
+    finally:
+        backend.close()
+
+
+def main():
+    from src.tools.seed_codec import decode
+
+    parser = argparse.ArgumentParser(description="Re-simulate leaderboard replays and flag bad scores")
+    parser.add_argument("leaderboard", nargs="?",
+                        help="leaderboard.json or leaderboard.db to check (default: the game's backend)")
+    parser.add_argument("--store", default="maze_store", help="maze store directory (id -> seed code)")
+    args = parser.parse_args()
+
+    checked = bad = 0
+    start = time.perf_counter()
+    for seed, entries in _boards(args.leaderboard):
+        try:
+            with open(os.path.join(args.store, seed), "r") as f:
+                code = f.read().strip()
+        except OSError:
+            # older boards were keyed by the seed code itself
+            code = seed
+        try:
+            maze, K = decode(code)
+        except ValueError:
+            print(f"{seed}: maze not found, skipped {len(entries)} scores")
+            continue
+        for entry, (ok, steps, score) in zip(entries, verify_batch(maze, K, entries)):
+            checked += 1
+            if not ok:
+                bad += 1
+                print(f"{seed}: {entry['name']} claimed {entry['score']}, replay gives {score}")
+    elapsed = time.perf_counter() - start
+    print(f"Checked {checked} scores, {bad} rejected, {checked / elapsed if elapsed else 0:.0f}/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,259 @@
+import base64
+import hashlib
+import re
+import zlib
+
+from src.core.maze import Maze, CellType
+from src.tools.dataset_generator import generate_maze
+
+GEN_VERSION = "MS3"
+MAZE_VERSION = "MS4"
+# short codes only name a maze; the full code comes from the maze store
+SHORT_VERSION = "MSH"
+ID_LENGTH = 10
+
+# generator name -> callable(R, C, portal_pairs, wall_noise, seed)
+GENERATORS = {
+    "dfs": generate_maze,
+}
+
+FLAG_ZLIB = 1
+# largest side a code may ask for; the play view handles 1001x1001, anything
+# beyond would only let a pasted code stall or exhaust memory while building it
+MAX_SIDE = 1001
+
+# cell codes are CellType values, 3 bits each, 8 cells packed into every 3 bytes
+_TYPES = [CellType(v) for v in range(len(CellType))]
+# 12 bits -> the 4 codes they hold, so decoding is two lookups per 3 bytes
+_UNPACK12 = [((v >> 9) & 7, (v >> 6) & 7, (v >> 3) & 7, v & 7) for v in range(4096)]
+
+LEGACY_CHARS = {"#": CellType.WALL, ".": CellType.EMPTY, "S": CellType.START, "G": CellType.GOAL}
+
+
+def _to_base36(n):
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    if n == 0:
+        return "0"
+    out = []
+    while n:
+        n, r = divmod(n, 36)
+        out.append(digits[r])
+    return "".join(reversed(out))
+
+
+def _b64decode(payload):
+    pad = len(payload) % 4
+    if pad:
+        payload += '=' * (4 - pad)
+    return base64.urlsafe_b64decode(payload)
+
+
+def _parse_size(size_str):
+    R, C = map(int, size_str.split("x"))
+    if R < 3 or C < 3:
+        raise ValueError(f"Maze too small: {R}x{C}")
+    if R > MAX_SIDE or C > MAX_SIDE:
+        raise ValueError(f"Maze too large: {R}x{C} (max {MAX_SIDE}x{MAX_SIDE})")
+    return R, C
+
+
+def encode_generated(R, C, portal_pairs, wall_noise, K, seed, gen="dfs"):
+    if gen not in GENERATORS:
+        raise ValueError(f"Unknown generator {gen}")
+    if seed < 0:
+        raise ValueError("Seed must be non-negative")
+    params = f"{R}x{C}.{portal_pairs}.{wall_noise}.{K}"
+    return f"{GEN_VERSION}|{gen}|{params}|{_to_base36(seed)}"
+
+
+def parse_generated(code):
+    parts = code.strip().split("|")
+    if len(parts) != 4 or parts[0] != GEN_VERSION:
+        raise ValueError("Invalid MS3 format")
+
+    gen = parts[1]
+    if gen not in GENERATORS:
+        raise ValueError(f"Unknown generator {gen}")
+
+    size_str, portal_pairs, wall_noise, K = parts[2].split(".")
+    R, C = _parse_size(size_str)
+    seed = int(parts[3], 36)
+    return gen, (R, C, int(portal_pairs), int(wall_noise), int(K)), seed
+
+
+def decode_generated(code):
+    gen, (R, C, portal_pairs, wall_noise, K), seed = parse_generated(code)
+    maze = GENERATORS[gen](R, C, portal_pairs, wall_noise, seed)
+    return maze, K
+
+
+def pack_cells(maze):
+    """Row-major 3-bit cell codes followed by one portal id byte per portal cell."""
+    out = bytearray()
+    portal_ids = bytearray()
+    acc = 0
+    n = 0
+    for row in maze.grid:
+        for cell in row:
+            acc = (acc << 3) | cell.type.value
+            n += 1
+            if cell.type == CellType.PORTAL:
+                portal_ids.append(cell.portal_id)
+            if n == 8:
+                out += acc.to_bytes(3, "big")
+                acc = 0
+                n = 0
+    if n:
+        out += (acc << (3 * (8 - n))).to_bytes(3, "big")
+    return bytes(out + portal_ids)
+
+
+def unpack_cells(body, rows, cols):
+    """Build a Maze straight from packed bytes, without an intermediate cell list."""
+    total = rows * cols
+    groups = (total + 7) // 8
+    if len(body) < groups * 3:
+        raise ValueError("Payload too short")
+
+    maze = Maze(rows, cols)
+    portal_ids = body[groups * 3:]
+    next_portal = 0
+    portal_map = {}
+    unpack = _UNPACK12
+
+    idx = 0
+    for g in range(groups):
+        v = int.from_bytes(body[g * 3:g * 3 + 3], "big")
+        for code in unpack[v >> 12] + unpack[v & 0xfff]:
+            if idx == total:
+                break
+            if code >= len(_TYPES):
+                raise ValueError(f"Bad cell code {code}")
+            x, y = divmod(idx, cols)
+            idx += 1
+            if code == 0:
+                continue
+            cell = maze.grid[x][y]
+            cell.type = _TYPES[code]
+            if code == CellType.START.value:
+                maze.start = (x, y)
+            elif code == CellType.GOAL.value:
+                maze.goal = (x, y)
+            elif code == CellType.PORTAL.value:
+                if next_portal >= len(portal_ids):
+                    raise ValueError("Portal table too short")
+                cell.portal_id = portal_ids[next_portal]
+                next_portal += 1
+                portal_map.setdefault(cell.portal_id, []).append((x, y))
+
+    for pid, pts in portal_map.items():
+        if len(pts) == 2: maze.portals[pid] = (pts[0], pts[1])
+    return maze
+
+
+def encode_maze(maze, K, compress=None):
+    """MS4 code for any maze. compress=None keeps zlib only when it makes the code shorter."""
+    body = pack_cells(maze)
+    crc = zlib.crc32(body).to_bytes(4, "big")
+
+    data = bytes([0]) + body
+    if compress is not False:
+        packed = bytes([FLAG_ZLIB]) + zlib.compress(body, 9)
+        if compress or len(packed) < len(data):
+            data = packed
+
+    encoded = base64.urlsafe_b64encode(data + crc).decode().rstrip("=")
+    return f"{MAZE_VERSION}|{maze.rows}x{maze.cols}|{K}|{encoded}"
+
+
+def maze_id(maze, K):
+    """Truncated hash of the canonical grid bytes; identical mazes share an id whatever their code."""
+    canonical = f"{maze.rows}x{maze.cols}|{K}|".encode() + pack_cells(maze)
+    digest = hashlib.sha256(canonical).digest()
+    return base64.b32encode(digest).decode().lower()[:ID_LENGTH]
+
+
+def short_code(mid):
+    return f"{SHORT_VERSION}|{mid}"
+
+
+def _decode_ms4(parts):
+    if len(parts) != 4: raise ValueError("Invalid MS4 format")
+    R, C = _parse_size(parts[1])
+    K = int(parts[2])
+    raw = _b64decode(parts[3])
+    if len(raw) < 5:
+        raise ValueError("Payload too short")
+
+    flags, body, crc = raw[0], raw[1:-4], raw[-4:]
+    if flags & FLAG_ZLIB:
+        # a valid payload is at most the packed cells plus one id byte per cell
+        limit = (R * C + 7) // 8 * 3 + R * C
+        inflater = zlib.decompressobj()
+        body = inflater.decompress(body, limit)
+        if inflater.unconsumed_tail:
+            raise ValueError("Payload too long")
+    if zlib.crc32(body).to_bytes(4, "big") != crc:
+        raise ValueError("Checksum mismatch")
+    return unpack_cells(body, R, C), K
+
+
+def _decode_legacy(parts):
+    # MS1|WxH|payload (K=3) and MS2|WxH|K|payload; payload is base64 of RLE or one char per cell
+    if parts[0] == "MS2":
+        if len(parts) != 4: raise ValueError("Invalid MS2 format")
+        K = int(parts[2])
+    else:
+        if len(parts) != 3: raise ValueError("Invalid MS1 format")
+        K = 3
+    W, H = map(int, parts[1].split("x"))
+    if not (0 < W <= MAX_SIDE and 0 < H <= MAX_SIDE):
+        raise ValueError(f"Bad maze size: {W}x{H}")
+    text = _b64decode(parts[-1]).decode()
+
+    if any(ch.isdigit() for ch in text):
+        runs = [(int(count), ch) for count, ch in re.findall(r"(\d+)(\D)", text)]
+    else:
+        runs = [(1, ch) for ch in text]
+    if sum(count for count, _ in runs) != W * H:
+        raise ValueError(f"Size mismatch: {sum(count for count, _ in runs)} vs {W*H}")
+
+    maze = Maze(H, W)
+    portal_map = {}
+    idx = 0
+    for count, ch in runs:
+        if ch in LEGACY_CHARS:
+            cell_type = LEGACY_CHARS[ch]
+        elif "a" <= ch <= "j":
+            cell_type = CellType.PORTAL
+        else:
+            raise ValueError(f"Bad cell {ch!r}")
+        for _ in range(count):
+            x, y = divmod(idx, W)
+            idx += 1
+            cell = maze.grid[x][y]
+            cell.type = cell_type
+            if cell_type == CellType.START:
+                maze.start = (x, y)
+            elif cell_type == CellType.GOAL:
+                maze.goal = (x, y)
+            elif cell_type == CellType.PORTAL:
+                cell.portal_id = ord(ch) - ord("a")
+                portal_map.setdefault(cell.portal_id, []).append((x, y))
+
+    for pid, pts in portal_map.items():
+        if len(pts) == 2: maze.portals[pid] = (pts[0], pts[1])
+    return maze, K
+
+
+def decode(code):
+    """(maze, K) for any seed version: MS1/MS2 grids, MS3 generator codes, MS4 packed grids."""
+    parts = code.strip().split("|")
+    version = parts[0]
+    if version == GEN_VERSION:
+        return decode_generated(code)
+    if version == MAZE_VERSION:
+        return _decode_ms4(parts)
+    if version in ("MS1", "MS2"):
+        return _decode_legacy(parts)
+    raise ValueError("Unknown Version")
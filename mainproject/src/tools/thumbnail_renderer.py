@@ -0,0 +1,198 @@
+import argparse
+import os
+import struct
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from src.core.maze import CellType
+from src.tools.dataset_export import maze_to_arrays, load_shard
+from src.tools.seed_codec import decode
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), 'assets')
+
+# same palette and fallbacks as web/renderer.py
+PORTAL_COLORS = [
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 0),
+    (255, 128, 0),
+    (128, 0, 255),
+    (0, 255, 128),
+]
+FALLBACK_COLORS = {
+    'grass': (34, 139, 34),
+    'wall': (70, 70, 70),
+    'cat': (255, 165, 0),
+    'fish': (0, 0, 255),
+}
+
+# atlas layout: one tile per cell type, then one per portal colour
+TILE_GRASS, TILE_WALL, TILE_START, TILE_GOAL, TILE_PORTAL = range(5)
+TYPE_TO_TILE = np.zeros(len(CellType), dtype=np.intp)
+TYPE_TO_TILE[CellType.EMPTY.value] = TILE_GRASS
+TYPE_TO_TILE[CellType.WALL.value] = TILE_WALL
+TYPE_TO_TILE[CellType.START.value] = TILE_START
+TYPE_TO_TILE[CellType.GOAL.value] = TILE_GOAL
+TYPE_TO_TILE[CellType.PORTAL.value] = TILE_PORTAL
+
+
+def _load_tile(key, tile, pygame):
+    # RGBA array of shape (tile, tile, 4); flat colour when the sprite can't be read
+    if pygame is not None:
+        try:
+            img = pygame.image.load(os.path.join(ASSET_DIR, key + '.png'))
+            scale = pygame.transform.smoothscale if img.get_bitsize() in (24, 32) else pygame.transform.scale
+            img = scale(img, (tile, tile))
+            rgb = pygame.surfarray.array3d(img).transpose(1, 0, 2)
+            alpha = pygame.surfarray.array_alpha(img).T[..., None]
+            return np.concatenate([rgb, alpha], axis=2).astype(np.uint8)
+        except (FileNotFoundError, pygame.error):
+            pass
+    out = np.empty((tile, tile, 4), dtype=np.uint8)
+    out[..., :3] = FALLBACK_COLORS[key]
+    out[..., 3] = 255
+    return out
+
+
+def _over(dst, src):
+    a = src[..., 3:4].astype(np.float32) / 255.0
+    return (src[..., :3] * a + dst * (1.0 - a)).astype(np.uint8)
+
+
+def build_atlas(tile=8):
+    """(5 + portal colours, tile, tile, 3) uint8 atlas built without a display.
+
+    Sprites are read through pygame when it is installed (SDL dummy driver is
+    enough since nothing is converted to the display format); otherwise the
+    renderer's flat fallback colours are used.
+    """
+    try:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        import pygame
+    except ImportError:
+        pygame = None
+
+    grass = _load_tile('grass', tile, pygame)[..., :3]
+    atlas = np.empty((TILE_PORTAL + len(PORTAL_COLORS), tile, tile, 3), dtype=np.uint8)
+    atlas[TILE_GRASS] = grass
+    atlas[TILE_WALL] = _over(grass, _load_tile('wall', tile, pygame))
+    atlas[TILE_START] = _over(grass, _load_tile('cat', tile, pygame))
+    atlas[TILE_GOAL] = _over(grass, _load_tile('fish', tile, pygame))
+
+    yy, xx = np.mgrid[:tile, :tile]
+    c = (tile - 1) / 2.0
+    r2 = (xx - c) ** 2 + (yy - c) ** 2
+    outer = r2 <= (tile * 0.45) ** 2
+    inner = r2 <= (tile * 0.27) ** 2
+    for pid, color in enumerate(PORTAL_COLORS):
+        t = grass.copy()
+        t[outer] = color
+        t[inner] = tuple(min(255, v + 50) for v in color)
+        atlas[TILE_PORTAL + pid] = t
+
+    return atlas
+
+
+def compose(cells, portals, atlas):
+    """Whole-maze images from cell arrays by indexing the atlas.
+
+    cells/portals are (R, C) or a batch (N, R, C); returns (..., R*T, C*T, 3).
+    """
+    idx = TYPE_TO_TILE[cells]
+    is_portal = cells == CellType.PORTAL.value
+    idx = np.where(is_portal, TILE_PORTAL + portals.astype(np.intp) % len(PORTAL_COLORS), idx)
+
+    tiles = atlas[idx]                        # (..., R, C, T, T, 3)
+    *lead, R, C, T, _, ch = tiles.shape
+    tiles = np.moveaxis(tiles, -4, -3)        # (..., R, T, C, T, 3)
+    return tiles.reshape(*lead, R * T, C * T, ch)
+
+
+def write_png(path, img):
+    # minimal RGB PNG writer so workers don't need a display or pygame
+    h, w, _ = img.shape
+    raw = np.empty((h, w * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = img.reshape(h, w * 3)
+
+    def chunk(tag, data):
+        body = tag + data
+        return struct.pack(">I", len(data)) + body + struct.pack(">I", zlib.crc32(body) & 0xffffffff)
+
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(chunk(b"IHDR", struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)))
+        f.write(chunk(b"IDAT", zlib.compress(raw.tobytes(), 6)))
+        f.write(chunk(b"IEND", b""))
+
+
+_atlas = None
+
+
+def _init_worker(tile):
+    global _atlas
+    _atlas = build_atlas(tile)
+
+
+def _render_chunk(out_dir, names, cells, portals):
+    images = compose(cells, portals, _atlas)
+    for name, img in zip(names, images):
+        write_png(os.path.join(out_dir, name + ".png"), img)
+    return len(names)
+
+
+def render_thumbnails(out_dir, names, cells, portals, tile=8, batch=256, workers=None):
+    """Write one PNG per maze; cells/portals are (N, R, C) arrays, e.g. a dataset shard."""
+    os.makedirs(out_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(tile,)) as pool:
+        futures = [pool.submit(_render_chunk, out_dir, names[i:i + batch],
+                               np.asarray(cells[i:i + batch]), np.asarray(portals[i:i + batch]))
+                   for i in range(0, len(names), batch)]
+        return sum(f.result() for f in futures)
+
+
+def render_mazes(out_dir, named_mazes, tile=8, batch=256, workers=None):
+    # mazes of different sizes can't share a batch array, so group them by shape
+    groups = {}
+    for name, maze in named_mazes:
+        groups.setdefault((maze.rows, maze.cols), []).append((name, maze_to_arrays(maze)))
+
+    total = 0
+    for items in groups.values():
+        names = [name for name, _ in items]
+        cells = np.stack([arrs[0] for _, arrs in items])
+        portals = np.stack([arrs[1] for _, arrs in items])
+        total += render_thumbnails(out_dir, names, cells, portals, tile, batch, workers)
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render maze thumbnails without a display")
+    parser.add_argument("out_dir")
+    parser.add_argument("--shard", action="append", default=[], help="dataset shard to render")
+    parser.add_argument("--codes", help="text file with one share code per line")
+    parser.add_argument("--tile", type=int, default=8)
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    total = 0
+    for shard in args.shard:
+        data = load_shard(shard)
+        prefix = os.path.basename(shard.rstrip("/")).replace(".npz", "")
+        names = [f"{prefix}_{i:05d}" for i in range(len(data["seeds"]))]
+        total += render_thumbnails(args.out_dir, names, data["cells"], data["portals"],
+                                   args.tile, workers=args.workers)
+
+    if args.codes:
+        with open(args.codes) as f:
+            codes = [line.strip() for line in f if line.strip()]
+        named = [(f"code_{i:05d}", decode(code)[0]) for i, code in enumerate(codes)]
+        total += render_mazes(args.out_dir, named, args.tile, workers=args.workers)
+
+    print(f"Rendered {total} thumbnails to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the game imports its packages from mainproject/, the directory main.py runs in
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,26 @@
+import random
+
+import pytest
+
+from src.core.maze import CellType
+from src.solver.bfs_solver import BFSSolver
+from src.tools.dataset_export import distance_field
+from src.tools.dataset_generator import generate_maze
+
+
+@pytest.mark.parametrize("seed", [1, 7, 2024])
+@pytest.mark.parametrize("K", [0, 2])
+def test_distance_field_matches_bfs(seed, K):
+    maze = generate_maze(11, 13, 3, 15, seed)
+    dist = distance_field(maze, K)
+    assert dist.shape == (K + 1, 11, 13)
+    assert dist[0][maze.start] == BFSSolver(maze, K).shortest_path()
+
+    # any open cell with b breaks spent is a fresh search with K - b breaks left
+    rng = random.Random(seed)
+    open_cells = [(x, y) for x in range(maze.rows) for y in range(maze.cols)
+                  if maze.grid[x][y].type != CellType.WALL]
+    for x, y in rng.sample(open_cells, 15):
+        for b in range(K + 1):
+            maze.start = (x, y)
+            assert dist[b, x, y] == BFSSolver(maze, K - b).shortest_path(), (x, y, b)
@@ -0,0 +1,41 @@
+import datetime
+
+import pytest
+
+from src.solver.bfs_solver import BFSSolver
+from src.tools.dataset_generator import generate_maze
+from src.tools.difficulty import bands_for, daily_challenge, generate_targeted, measure, min_breaks
+
+
+def cells(maze):
+    return [[(c.type, c.portal_id) for c in row] for row in maze.grid]
+
+
+@pytest.mark.parametrize("seed", range(4))
+@pytest.mark.parametrize("band", ["easy", "medium"])
+def test_generated_map_is_in_band(band, seed):
+    limits = bands_for(15, 15)[band]
+    maze, K, gen_seed, metrics = generate_targeted(limits, 15, 15, 3, 15, seed=seed)
+    for metric, (lo, hi) in limits.items():
+        assert lo <= metrics[metric] <= hi, metric
+    # gen_seed is what gets shared, so it has to give back the same map and numbers
+    again = generate_maze(15, 15, 3, 15, gen_seed)
+    assert cells(again) == cells(maze)
+    assert measure(again, K) == metrics
+
+
+def test_daily_challenge_is_fixed_per_date():
+    day = datetime.date(2026, 3, 14)
+    maze, K, gen_seed, _ = daily_challenge(day)
+    again, K2, gen_seed2, _ = daily_challenge(day)
+    assert (gen_seed2, K2) == (gen_seed, K)
+    assert cells(again) == cells(maze)
+    assert daily_challenge(day + datetime.timedelta(days=1))[2] != gen_seed
+
+
+@pytest.mark.parametrize("seed", range(40))
+def test_min_breaks_matches_bfs(seed):
+    maze = generate_maze(7, 9, seed % 3, 40, seed)
+    # the fewest breaks BFS needs to reach the goal at all
+    fewest = next((k for k in range(maze.rows * maze.cols) if BFSSolver(maze, k).shortest_path() != -1), -1)
+    assert min_breaks(maze) == fewest
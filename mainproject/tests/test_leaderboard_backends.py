@@ -0,0 +1,145 @@
+import pytest
+
+from web.leaderboard import JsonBackend, make_entry, sort_key
+from web.leaderboard_http import HttpBackend
+from web.leaderboard_journal import JournalBackend
+from web.leaderboard_server import start_local_server
+from web.leaderboard_shards import ShardedBackend
+from web.leaderboard_sqlite import SqliteBackend
+
+
+class FakeStorage:
+    """localStorage stand-in: string keys and values."""
+
+    def __init__(self):
+        self.data = {}
+
+    def getItem(self, key):
+        return self.data.get(key)
+
+    def setItem(self, key, value):
+        self.data[key] = value
+
+    def removeItem(self, key):
+        self.data.pop(key, None)
+
+    @property
+    def length(self):
+        return len(self.data)
+
+    def key(self, i):
+        return list(self.data)[i]
+
+
+@pytest.fixture(params=["json", "sqlite", "journal", "sharded", "http"])
+def backend(request, tmp_path, monkeypatch):
+    kind = request.param
+    if kind == "json":
+        monkeypatch.chdir(tmp_path)
+        b = JsonBackend()
+    elif kind == "sqlite":
+        b = SqliteBackend(str(tmp_path / "scores.db"))
+    elif kind == "journal":
+        b = JournalBackend(str(tmp_path / "scores"))
+    elif kind == "sharded":
+        b = ShardedBackend(FakeStorage())
+    else:
+        server = start_local_server(SqliteBackend(str(tmp_path / "server.db")))
+        request.addfinalizer(server.shutdown)
+        b = HttpBackend(server.url, cache_ttl=0)
+    yield b
+    b.close()
+
+
+# (score, time); two results tie on both
+RESULTS = [(900, 12.5), (700, 9.0), (900, 10.0), (500, 30.0), (700, 9.0), (1000, 40.0), (100, 5.0)]
+
+
+def fill(backend, seed="MSH|seed"):
+    entries = [make_entry(f"p{i}", score, t) for i, (score, t) in enumerate(RESULTS)]
+    backend.add_scores((seed, e) for e in entries)
+    backend.add_score("MSH|other", make_entry("x", 5000, 1.0))
+    return sorted(entries, key=sort_key)
+
+
+def keys(rows):
+    return [sort_key(e) for e in rows]
+
+
+def test_scores_come_back_sorted(backend):
+    expected = fill(backend)
+    assert keys(backend.get_scores("MSH|seed")) == keys(expected)
+    assert backend.get_scores("MSH|missing") == []
+
+
+def test_pagination(backend):
+    expected = fill(backend)
+    assert keys(backend.get_scores("MSH|seed", 0, 3)) == keys(expected[:3])
+    assert keys(backend.get_scores("MSH|seed", 3, 3)) == keys(expected[3:6])
+    assert keys(backend.get_scores("MSH|seed", 6, 3)) == keys(expected[6:])
+    assert keys(backend.get_scores("MSH|seed", 5)) == keys(expected[5:])
+    assert backend.get_scores("MSH|seed", 20, 3) == []
+
+
+def test_count(backend):
+    fill(backend)
+    assert backend.count("MSH|seed") == len(RESULTS)
+    assert backend.count("MSH|other") == 1
+    assert backend.count("MSH|missing") == 0
+
+
+@pytest.mark.parametrize("score, t, rank", [
+    (2000, 0.0, 1),     # beats everything
+    (1000, 40.0, 1),    # ties the leader
+    (900, 11.0, 3),     # between two 900s
+    (700, 9.0, 4),      # ties share the better rank
+    (700, 9.5, 6),
+    (0, 99.0, 8),       # below everything
+])
+def test_rank(backend, score, t, rank):
+    fill(backend)
+    assert backend.get_rank("MSH|seed", score, t) == rank
+    assert backend.get_rank("MSH|missing", score, t) == 1
+
+
+def test_around(backend):
+    expected = fill(backend)
+    first, rows = backend.get_around("MSH|seed", 500, 30.0, radius=1)
+    assert first == 5
+    assert keys(rows) == keys(expected[4:7])
+
+
+def test_seeds(backend):
+    assert list(backend.seeds()) == []
+    fill(backend)
+    assert sorted(backend.seeds()) == ["MSH|other", "MSH|seed"]
+
+
+def test_sharded_counts_past_the_kept_top():
+    storage = FakeStorage()
+    backend = ShardedBackend(storage, top_n=3)
+    backend.add_scores(("MSH|seed", make_entry("p", s, 1.0)) for s in range(10))
+    assert [e["score"] for e in backend.get_scores("MSH|seed")] == [9, 8, 7]
+    assert backend.count("MSH|seed") == 10
+
+    # the total survives a reload from storage
+    assert ShardedBackend(storage, top_n=3).count("MSH|seed") == 10
+
+
+def test_pages_split_runs_of_ties(backend):
+    # long runs of equal (score, time) cut at every offset must still tile the board exactly
+    entries = [make_entry(f"p{i}", 50 - (i // 7) * 10, 5.0 + (i % 2), f"r{i}") for i in range(30)]
+    backend.add_scores(("s", e) for e in entries)
+    full = backend.get_scores("s")
+    assert keys(full) == sorted(keys(entries))
+    for size in (1, 3, 4):
+        paged = []
+        for offset in range(0, 30, size):
+            paged += backend.get_scores("s", offset, size)
+        assert paged == full
+
+    # ranks and pages stay in step with later inserts
+    backend.add_score("s", make_entry("late", 45, 1.0))
+    assert backend.get_rank("s", 45, 1.0) == 1 + sum(1 for e in entries if sort_key(e) < (-45, 1.0))
+    assert backend.count("s") == 31
+    assert backend.get_scores("s", 10, 3) == backend.get_scores("s")[10:13]
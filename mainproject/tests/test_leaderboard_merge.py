@@ -0,0 +1,126 @@
+import io
+import json
+import random
+
+import pytest
+
+import web.leaderboard_merge as merge
+from web.leaderboard import sort_key
+from web.leaderboard_sqlite import SqliteBackend
+
+
+def entry(rng, i):
+    return {"name": f"p{i}", "score": rng.randint(0, 50), "time": rng.randint(0, 20) / 2,
+            "timestamp": 1700000000 + i}
+
+
+def make_boards(n_files=4, n=400, seed=0):
+    """Kiosk files that share a third of their entries, plus the deduplicated truth.
+
+    Some shared submissions reach each kiosk with a different score or time,
+    the way a resubmitted or edited copy would; only the best copy survives.
+    """
+    rng = random.Random(seed)
+    seeds = ["MSH|a", "MSH|b", "MS3|dfs|15x15.3.15.2|z", "MSH|é"]
+    shared = [(rng.choice(seeds), entry(rng, i)) for i in range(n // 3)]
+    boards = []
+    for f in range(n_files):
+        copies = []
+        for i, (s, e) in enumerate(shared):
+            if i % 5 == 0:
+                e = dict(e, score=e["score"] - f, time=e["time"] + f / 2)
+            copies.append((s, e))
+        own = [(rng.choice(seeds), entry(rng, 10000 * (f + 1) + i)) for i in range(n)]
+        board = {}
+        for s, e in copies + own:
+            board.setdefault(s, []).append(e)
+        boards.append(board)
+
+    best = {}
+    for board in boards:
+        for s, entries in board.items():
+            for e in entries:
+                ident = (s, e["name"], e["timestamp"])
+                if ident not in best or sort_key(e) < sort_key(best[ident]):
+                    best[ident] = e
+    truth = {}
+    for (s, _, _), e in best.items():
+        truth.setdefault(s, []).append(e)
+    truth = {s: sorted(es, key=lambda e: (sort_key(e), e["name"], e["timestamp"]))
+             for s, es in sorted(truth.items())}
+    return boards, truth
+
+
+def write_boards(tmp_path, boards):
+    paths = []
+    for i, board in enumerate(boards):
+        path = tmp_path / f"kiosk{i}.json"
+        path.write_text(json.dumps(board, indent=i), encoding="utf-8")
+        paths.append(str(path))
+    return paths
+
+
+@pytest.mark.parametrize("chunk, fan_in", [(merge.CHUNK, merge.FAN_IN), (37, 3), (100, 2)])
+def test_merge_dedupes_and_orders(tmp_path, chunk, fan_in):
+    boards, truth = make_boards()
+    out = str(tmp_path / "merged.json")
+    seeds, entries = merge.merge_files(write_boards(tmp_path, boards), out, chunk=chunk, fan_in=fan_in)
+
+    with open(out, encoding="utf-8") as f:
+        merged = json.load(f)
+    assert merged == truth
+    assert list(merged) == sorted(truth)
+    assert (seeds, entries) == (len(truth), sum(len(es) for es in truth.values()))
+
+
+def test_merge_top(tmp_path):
+    boards, truth = make_boards(n_files=2)
+    out = str(tmp_path / "merged.json")
+    merge.merge_files(write_boards(tmp_path, boards), out, top=5, chunk=50, fan_in=2)
+    with open(out, encoding="utf-8") as f:
+        assert json.load(f) == {s: es[:5] for s, es in truth.items()}
+
+
+def test_copies_with_another_score_or_time_are_one_submission(tmp_path):
+    bob = {"name": "bob", "score": 50, "time": 10.0, "timestamp": 100}
+    boards = [
+        {"s": [bob, {"name": "amy", "score": 50, "time": 10.0, "timestamp": 100}]},
+        {"s": [dict(bob, time=10.5)]},
+        {"s": [dict(bob, score=40), dict(bob, timestamp=101)]},
+    ]
+    out = str(tmp_path / "merged.json")
+    merge.merge_files(write_boards(tmp_path, boards), out, chunk=2, fan_in=2)
+    with open(out, encoding="utf-8") as f:
+        merged = json.load(f)["s"]
+    assert [(e["name"], e["time"], e["timestamp"]) for e in merged] == [
+        ("amy", 10.0, 100), ("bob", 10.0, 100), ("bob", 10.0, 101)]
+
+
+def test_reduce_runs_caps_open_files(tmp_path):
+    runs = [merge._spill([("s", {"name": "x", "score": i, "time": 0, "timestamp": 0})], str(tmp_path))
+            for i in range(10)]
+    runs = merge.reduce_runs(runs, str(tmp_path), fan_in=3)
+    assert len(runs) <= 3
+    assert len(list(tmp_path.iterdir())) == len(runs)
+    assert [e["score"] for _, e in merge.merge_entries(runs)] == list(range(9, -1, -1))
+
+
+def test_iter_entries_across_buffer_edges(monkeypatch):
+    boards, _ = make_boards(n_files=1, n=50)
+    text = json.dumps(boards[0], indent=3)
+    monkeypatch.setattr(merge, "READ_SIZE", 7)
+    got = list(merge.iter_entries(io.StringIO(text)))
+    assert got == [(s, e) for s, es in boards[0].items() for e in es]
+    assert list(merge.iter_entries(io.StringIO(" { } "))) == []
+
+
+def test_import_file(tmp_path):
+    boards, truth = make_boards(n_files=2, n=100)
+    out = str(tmp_path / "merged.json")
+    merge.merge_files(write_boards(tmp_path, boards), out)
+    backend = SqliteBackend(str(tmp_path / "scores.db"))
+    assert merge.import_file(out, backend, batch=64) == sum(len(es) for es in truth.values())
+    for s, es in truth.items():
+        assert backend.count(s) == len(es)
+        assert [sort_key(e) for e in backend.get_scores(s, 0, 10)] == [sort_key(e) for e in es[:10]]
+    backend.close()
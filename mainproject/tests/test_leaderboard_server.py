@@ -0,0 +1,77 @@
+import http.client
+import json
+
+import pytest
+
+from web.leaderboard import make_entry
+from web.leaderboard_http import HttpBackend
+from web.leaderboard_server import MAX_BODY, MAX_PAGE, start_local_server
+from web.leaderboard_sqlite import SqliteBackend
+
+
+@pytest.fixture
+def server(tmp_path):
+    server = start_local_server(SqliteBackend(str(tmp_path / "server.db")))
+    yield server
+    server.shutdown()
+    server.backend.close()
+
+
+def post(server, headers, body=b""):
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=2)
+    conn.putrequest("POST", "/scores")
+    for k, v in headers.items():
+        conn.putheader(k, v)
+    conn.endheaders(body)
+    resp = conn.getresponse()
+    status = resp.status
+    resp.read()
+    conn.close()
+    return status
+
+
+def get(server, path):
+    host, port = server.server_address[:2]
+    conn = http.client.HTTPConnection(host, port, timeout=2)
+    conn.request("GET", path)
+    resp = conn.getresponse()
+    data = json.loads(resp.read())
+    conn.close()
+    return resp.status, data
+
+
+@pytest.mark.parametrize("headers, status", [
+    ({}, 411),
+    ({"Content-Length": "abc"}, 400),
+    ({"Content-Length": "-1"}, 400),
+    ({"Content-Length": str(MAX_BODY + 1)}, 413),
+])
+def test_bad_content_length(server, headers, status):
+    # answered straight away, without waiting on a body that never comes
+    assert post(server, headers) == status
+
+
+def test_retried_post_is_stored_once(server):
+    body = json.dumps({"scores": [{"seed": "s", "sid": "abc", **make_entry("me", 10, 1.0)}]}).encode()
+    headers = {"Content-Length": str(len(body)), "Content-Type": "application/json"}
+    assert post(server, headers, body) == 200
+    assert post(server, headers, body) == 200
+    assert server.backend.count("s") == 1
+
+
+def test_pages_are_capped(server):
+    server.backend.add_scores(("s", make_entry(f"p{i}", i, 1.0)) for i in range(MAX_PAGE + 5))
+    status, data = get(server, f"/scores/s?limit={MAX_PAGE * 10}")
+    assert status == 200
+    assert len(data["rows"]) == MAX_PAGE
+    assert data["total"] == MAX_PAGE + 5
+    assert len(get(server, "/scores/s")[1]["rows"]) == MAX_PAGE
+    assert get(server, "/scores/s?offset=-1")[0] == 400
+    assert get(server, "/scores/s?limit=-1")[0] == 400
+
+    # the client pages through a full read
+    backend = HttpBackend(server.url, cache_ttl=0)
+    assert [e["score"] for e in backend.get_scores("s")] == list(range(MAX_PAGE + 4, -1, -1))
+    assert len(backend.get_scores("s", 3, MAX_PAGE + 1)) == MAX_PAGE + 1
+    backend.close()
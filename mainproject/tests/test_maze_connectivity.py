@@ -0,0 +1,63 @@
+import random
+from collections import deque
+
+import pytest
+
+from src.core.maze import CellType, Maze
+from src.tools.dataset_generator import generate_maze
+
+
+def reachable(maze, a):
+    """Cells reachable from a by plain BFS over floor and linked portals."""
+    if maze.grid[a[0]][a[1]].type == CellType.WALL:
+        return {a}
+    seen = {a}
+    q = deque([a])
+    while q:
+        x, y = q.popleft()
+        nxt = [(x + dx, y + dy) for dx, dy in [(1, 0), (-1, 0), (0, 1), (0, -1)]]
+        ends = maze.portals.get(maze.grid[x][y].portal_id, ()) if maze.is_portal(x, y) else ()
+        if len(ends) == 2:
+            nxt.append(maze.exit_portal(x, y))
+        for p in nxt:
+            if p not in seen and maze.in_bounds(*p) and maze.grid[p[0]][p[1]].type != CellType.WALL:
+                seen.add(p)
+                q.append(p)
+    return seen
+
+
+def random_edit(maze, rng):
+    x, y = rng.randrange(maze.rows), rng.randrange(maze.cols)
+    kind = rng.choice([CellType.EMPTY, CellType.WALL, CellType.WALL, CellType.PORTAL, CellType.START])
+    if kind == CellType.PORTAL:
+        # a pair id with a free end; a third end would make exit_portal ambiguous
+        free = [pid for pid in range(4) if len(maze.portals.get(pid, ())) < 2]
+        if not free or maze.is_portal(x, y):
+            kind = CellType.EMPTY
+        else:
+            maze.set_cell(x, y, kind, rng.choice(free))
+            return kind
+    maze.set_cell(x, y, kind)
+    return kind
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_connected_matches_bfs_under_edits(seed):
+    rng = random.Random(seed)
+    maze = generate_maze(7, 8, 2, 30, seed) if seed % 2 else Maze(6, 6)
+    cells = [(x, y) for x in range(maze.rows) for y in range(maze.cols)]
+    rebuilds = 0
+
+    for step in range(150):
+        random_edit(maze, rng)
+        if maze._conn is None:
+            rebuilds += 1
+        # querying only some steps leaves runs of in-place edits between rebuilds
+        if step % 3 == 0:
+            continue
+        for a in rng.sample(cells, 3):
+            reach = reachable(maze, a)
+            for b in cells:
+                assert maze.connected(a, b) == (b in reach), (step, a, b)
+
+    assert rebuilds > 0
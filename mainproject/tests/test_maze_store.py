@@ -0,0 +1,135 @@
+import os
+
+import pytest
+
+import web.maze_store as maze_store
+from src.tools.dataset_generator import generate_maze
+from src.tools.seed_codec import encode_generated, short_code
+from web.leaderboard import LeaderboardBackend, set_backend
+
+
+class ScoredBackend(LeaderboardBackend):
+    """Only answers count(): mazes in `scored` have leaderboard entries."""
+
+    def __init__(self, scored=()):
+        self.scored = set(scored)
+
+    def count(self, seed):
+        return 1 if seed in self.scored else 0
+
+
+class QuotaStorage:
+    """localStorage stand-in that refuses writes past `quota` maze keys."""
+
+    def __init__(self, quota=None):
+        self.data = {}
+        self.quota = quota
+        self.index_reads = 0
+
+    def getItem(self, key):
+        if key == maze_store.INDEX_KEY:
+            self.index_reads += 1
+        return self.data.get(key)
+
+    def setItem(self, key, value):
+        mazes = [k for k in self.data if k != maze_store.INDEX_KEY]
+        if self.quota is not None and key != maze_store.INDEX_KEY and key not in self.data and len(mazes) >= self.quota:
+            raise RuntimeError("QuotaExceededError")
+        self.data[key] = value
+
+    def removeItem(self, key):
+        self.data.pop(key, None)
+
+    @property
+    def length(self):
+        return len(self.data)
+
+    def key(self, i):
+        return list(self.data)[i]
+
+
+@pytest.fixture
+def scored():
+    backend = ScoredBackend()
+    set_backend(backend)
+    yield backend.scored
+    set_backend(None)
+
+
+@pytest.fixture
+def desktop(tmp_path, monkeypatch, scored):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(maze_store, "MAX_MAZES", 3)
+    return tmp_path / maze_store.STORE_DIR
+
+
+@pytest.fixture
+def web(monkeypatch, scored):
+    storage = QuotaStorage()
+    monkeypatch.setattr(maze_store, "_local_storage", lambda: storage)
+    monkeypatch.setattr(maze_store, "MAX_MAZES", 3)
+    return storage
+
+
+def put_mazes(n, seed=0):
+    return [maze_store.put(generate_maze(9, 9, 2, 15, seed + i), 1) for i in range(n)]
+
+
+def test_round_trip(desktop):
+    code = encode_generated(15, 15, 3, 15, 2, 77)
+    maze, K, mid, full = maze_store.resolve(code)
+    assert full == code
+    again, K2, mid2, _ = maze_store.resolve(short_code(mid))
+    assert (mid2, K2) == (mid, K)
+    assert [[c.type for c in row] for row in again.grid] == [[c.type for c in row] for row in maze.grid]
+    with pytest.raises(ValueError):
+        maze_store.resolve(short_code("nothere"))
+
+
+def test_desktop_evicts_lru_but_keeps_scored(desktop, scored):
+    ids = []
+    for i in range(5):
+        mid = put_mazes(1, seed=i)[0]
+        os.utime(desktop / mid, (1000 + i, 1000 + i))
+        ids.append(mid)
+        if i == 0:
+            scored.add(mid)
+    assert sorted(os.listdir(desktop)) == sorted([ids[0]] + ids[3:])
+
+
+def test_web_evicts_lru_but_keeps_scored(web, scored):
+    first = put_mazes(1)[0]
+    scored.add(first)
+    ids = [first] + put_mazes(4, seed=1)
+    assert sorted(k for k in web.data if k != maze_store.INDEX_KEY) == sorted(
+        maze_store.KEY_PREFIX + mid for mid in [first] + ids[3:])
+
+
+def test_web_quota_drops_the_oldest_unscored(web, scored):
+    web.quota = 2
+    a, b = put_mazes(2)
+    scored.add(a)
+    c = put_mazes(1, seed=5)[0]
+    assert maze_store.get(a) and maze_store.get(c)
+    assert maze_store.get(b) is None
+
+    # only scored mazes left to drop: the new one isn't stored, nothing is lost
+    scored.add(c)
+    d = put_mazes(1, seed=9)[0]
+    assert maze_store.get(d) is None
+    assert maze_store.get(a) and maze_store.get(c)
+
+
+def test_web_loads_the_index_once_per_call(web):
+    put_mazes(3)
+    web.index_reads = 0
+    put_mazes(1, seed=10)
+    assert web.index_reads == 1
+
+
+def test_corrupt_index_is_rebuilt(web):
+    ids = put_mazes(2)
+    web.data[maze_store.INDEX_KEY] = "{not json"
+    mid = put_mazes(1, seed=20)[0]
+    assert maze_store.resolve(short_code(ids[0]))[2] == ids[0]
+    assert set(maze_store._load_index(web)) == set(ids + [mid])
@@ -0,0 +1,117 @@
+import json
+import random
+
+import pytest
+
+from src.core.maze import CellType
+from src.solver.bfs_solver import BFSSolver
+from src.tools.dataset_generator import generate_maze
+from src.tools.replay import (BREAK, DIRS, MOVE, PORTAL, ReplayRecorder, ReplayVerifier,
+                              _boards, compute_score, decode_actions, verify_batch)
+import web.leaderboard
+from web.leaderboard import LeaderboardBackend, make_entry
+from web.leaderboard_sqlite import SqliteBackend
+from web.player import Player
+
+
+def play(maze, K, path):
+    """Walk a solver path with the game's Player; returns it with its replay."""
+    player = Player(maze.start, K)
+    for (x, y), (nx, ny) in zip(path, path[1:]):
+        dx, dy = nx - x, ny - y
+        if abs(dx) + abs(dy) == 1:
+            if maze.grid[nx][ny].type == CellType.WALL:
+                player.break_wall(dx, dy, maze)
+            player.try_move(dx, dy, maze)
+        else:
+            player.use_portal(maze)
+        assert (player.x, player.y) == (nx, ny)
+    return player
+
+
+@pytest.mark.parametrize("n", [0, 1, 127, 128, 1000])
+def test_actions_round_trip(n):
+    rng = random.Random(n)
+    rec = ReplayRecorder()
+    actions = []
+    for _ in range(n):
+        kind = rng.choice([MOVE, PORTAL, BREAK])
+        if kind == PORTAL:
+            rec.portal()
+            actions.append((PORTAL, None))
+        else:
+            d = rng.randrange(4)
+            (rec.move if kind == MOVE else rec.break_wall)(*DIRS[d])
+            actions.append((kind, d))
+    assert len(rec) == n
+    assert decode_actions(rec.encode()) == actions
+
+
+@pytest.mark.parametrize("seed", [3, 11, 26, 42])
+def test_recorded_run_verifies(seed):
+    K = 4
+    maze = generate_maze(15, 15, 3, 15, seed)
+    dist, path = BFSSolver(maze, K).shortest_path_with_path()
+    verifier = ReplayVerifier(maze, K)
+
+    player = play(generate_maze(15, 15, 3, 15, seed), K, path)
+    blob = player.replay.encode()
+    score = round(compute_score(dist, player.steps), 2)
+    assert verifier.steps(blob) == player.steps == dist
+    assert verifier.check({"score": score, "replay": blob}) == (True, dist, score)
+
+
+def test_tampering_is_rejected():
+    K = 2
+    maze = generate_maze(15, 15, 3, 15, 7)
+    dist, path = BFSSolver(maze, K).shortest_path_with_path()
+    blob = play(generate_maze(15, 15, 3, 15, 7), K, path).replay.encode()
+
+    unfinished = play(generate_maze(15, 15, 3, 15, 7), K, path[:-1]).replay.encode()
+    into_wall = ReplayRecorder()
+    x, y = maze.start
+    d = next(d for d in DIRS if maze.in_bounds(x + d[0], y + d[1])
+             and maze.grid[x + d[0]][y + d[1]].type == CellType.WALL)
+    into_wall.move(*d)
+
+    results = verify_batch(maze, K, [
+        {"score": 100.0, "replay": blob},
+        {"score": 100.0},
+        {"score": 150.0, "replay": blob},
+        {"score": 100.0, "replay": unfinished},
+        {"score": 100.0, "replay": into_wall.encode()},
+        {"score": 100.0, "replay": blob[:4]},
+    ])
+    assert results[0] == (True, dist, 100.0)
+    assert results[1] == (False, None, None)
+    assert results[2] == (False, dist, 100.0)
+    assert [ok for ok, _, _ in results[3:]] == [False, False, False]
+
+
+def test_breaks_are_limited_by_K():
+    # this maze needs three breaks
+    maze = generate_maze(15, 15, 3, 15, 11)
+    dist, path = BFSSolver(maze, 3).shortest_path_with_path()
+    blob = play(generate_maze(15, 15, 3, 15, 11), 3, path).replay.encode()
+    assert sum(kind == BREAK for kind, _ in decode_actions(blob)) == 3
+
+    assert ReplayVerifier(maze, 3).steps(blob) == dist
+    assert ReplayVerifier(maze, 2).steps(blob) is None
+
+
+def test_boards_read_json_and_sqlite(tmp_path):
+    entries = [make_entry("a", 90, 3.0, "AQA"), make_entry("b", 50, 8.0)]
+    db = str(tmp_path / "scores.db")
+    backend = SqliteBackend(db)
+    backend.add_scores(("s", e) for e in entries)
+    backend.close()
+    (tmp_path / "scores.json").write_text(json.dumps({"s": entries}))
+
+    assert list(_boards(db)) == [("s", entries)]
+    assert list(_boards(str(tmp_path / "scores.json"))) == [("s", entries)]
+
+
+def test_boards_report_a_backend_that_cant_list(monkeypatch):
+    monkeypatch.setattr(web.leaderboard, "get_backend", LeaderboardBackend)
+    with pytest.raises(SystemExit, match="can't list its seeds"):
+        list(_boards(None))
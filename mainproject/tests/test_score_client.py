@@ -0,0 +1,182 @@
+import threading
+import time
+
+import pytest
+
+import web.score_client as score_client
+from web.leaderboard import LeaderboardBackend, make_entry, set_backend, sort_key
+
+
+class FlakyBackend(LeaderboardBackend):
+    """In-memory backend whose writes and reads fail the next N times they're called."""
+
+    def __init__(self):
+        self.scores = {}
+        self.write_failures = 0
+        self.read_failures = 0
+
+    def add_scores(self, items):
+        items = list(items)
+        if self.write_failures:
+            self.write_failures -= 1
+            raise OSError("write down")
+        for seed, entry in items:
+            self.scores.setdefault(seed, []).append(entry)
+            self.scores[seed].sort(key=sort_key)
+
+    def get_scores(self, seed, offset=0, limit=None):
+        if self.read_failures:
+            self.read_failures -= 1
+            raise OSError("read down")
+        scores = self.scores.get(seed, [])
+        return scores[offset:] if limit is None else scores[offset:offset + limit]
+
+
+@pytest.fixture
+def backend():
+    b = FlakyBackend()
+    set_backend(b)
+    yield b
+    set_backend(None)
+
+
+@pytest.fixture
+def client():
+    c = score_client.ScoreClient()
+    # no worker: the tests run its passes with _work()
+    c._started = True
+    return c
+
+
+def test_failed_submit_is_kept_and_retried(backend, client):
+    backend.add_score("s", make_entry("old", 10, 5.0))
+    mine = make_entry("me", 80, 4.0)
+    backend.write_failures = 2
+    client.submit("s", mine)
+    client.request("s", 5, (80, 4.0))
+
+    assert client._work() is False
+    assert client._retry_in == score_client.RETRY_MIN
+    # the read still ran; the unsaved entry is merged in locally
+    view = client.view("s", 5)
+    assert view["loaded"]
+    assert [e["name"] for e in view["rows"]] == ["me", "old"]
+    assert view["total"] == 2
+
+    assert client._work() is False
+    assert client._retry_in == score_client.RETRY_MIN * 2
+    assert [e["name"] for e in backend.scores["s"]] == ["old"]
+
+    assert client._work() is True
+    assert client._retry_in is None
+    assert [e["name"] for e in backend.scores["s"]] == ["me", "old"]
+    client.request("s", 5, (80, 4.0))
+    client._work()
+    view = client.view("s", 5)
+    assert [e["name"] for e in view["rows"]] == ["me", "old"]
+    assert (view["total"], view["rank"]) == (2, 1)
+
+
+def test_failed_read_is_requeued(backend, client):
+    backend.add_score("s", make_entry("old", 10, 5.0))
+    backend.read_failures = 1
+    client.request("s", 5)
+
+    assert client._work() is False
+    assert not client.view("s", 5)["loaded"]
+    assert client._has_work()
+
+    assert client._work() is True
+    assert client.view("s", 5)["loaded"]
+    assert not client._has_work()
+
+
+def test_requeued_read_keeps_a_newer_request(backend, client):
+    backend.read_failures = 1
+    client.request("s", 5)
+    real_get = backend.get_scores
+
+    def get_scores(seed, offset=0, limit=None):
+        # a newer request arrives while the first read is failing
+        client.request(seed, 8, (1, 1.0))
+        backend.get_scores = real_get
+        return real_get(seed, offset, limit)
+
+    backend.get_scores = get_scores
+    client._work()
+    assert client._requests["s"] == (8, (1, 1.0))
+
+
+def test_backoff_is_capped(backend, client):
+    backend.write_failures = 100
+    client.submit("s", make_entry("me", 1, 1.0))
+    for _ in range(20):
+        client._work()
+    assert client._retry_in == score_client.RETRY_MAX
+    assert len(client._pending) == 1
+
+
+def test_ranked_read_below_the_top_gets_a_window(backend, client):
+    backend.add_scores(("s", make_entry(f"p{i}", 100 - i, 1.0)) for i in range(10))
+    client.request("s", 3, (95, 1.0))
+    client._work()
+    view = client.view("s", 3)
+    assert view["rank"] == 6
+    first, rows = view["around"]
+    assert first == 6 - score_client.AROUND_RADIUS
+    assert [e["score"] for e in rows] == [96, 95, 94]
+
+    client.request("s", 8, (95, 1.0))
+    client._work()
+    assert client.view("s", 8)["around"] is None
+
+
+def test_local_entries_are_dropped_once_read_back(backend, client):
+    client.request("a", 5)
+    client._work()
+    for i in range(50):
+        client.submit(f"b{i % 5}", make_entry("me", i, 1.0))
+    client._work()
+    # "a" was read long ago and never again; that must not pin later submissions
+    assert client._recent == []
+
+    client.submit("a", make_entry("me", 1, 1.0))
+    client._work()
+    # written, but the page for "a" predates it: view() still needs the local copy
+    assert client.view("a", 5)["total"] == 1
+    client.request("a", 5)
+    client._work()
+    assert client._recent == []
+    assert client.view("a", 5)["total"] == 1
+
+
+def test_pages_are_evicted_lru(backend, client):
+    for i in range(score_client.MAX_PAGES):
+        client.request(f"s{i}", 5)
+    client._work()
+    client.view("s0", 5)
+    client.request("new", 5)
+    client._work()
+    assert len(client._pages) == score_client.MAX_PAGES
+    assert "s0" in client._pages and "s1" not in client._pages
+
+
+def test_flush_waits_for_a_running_pass(backend, client):
+    real_add = backend.add_scores
+
+    def slow_add(items):
+        items = list(items)
+        time.sleep(0.05)
+        real_add(items)
+
+    backend.add_scores = slow_add
+    for i in range(20):
+        client.submit("s", make_entry(f"p{i}", i, 1.0))
+    worker = threading.Thread(target=client._work)
+    worker.start()
+    time.sleep(0.01)
+    client.flush()
+    # flush() returned, as at exit: nothing may still be in flight
+    assert sorted(e["name"] for e in backend.scores["s"]) == sorted(f"p{i}" for i in range(20))
+    worker.join()
+    assert len(backend.scores["s"]) == 20
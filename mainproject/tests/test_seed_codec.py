@@ -0,0 +1,81 @@
+import base64
+import zlib
+
+import pytest
+
+from src.core.maze import CellType, Maze
+from src.tools.dataset_generator import generate_maze
+from src.tools.seed_codec import (MAX_SIDE, decode, encode_generated, encode_maze, maze_id,
+                                  parse_generated)
+
+
+def cells(maze):
+    return [[(c.type, c.portal_id) for c in row] for row in maze.grid]
+
+
+def test_ms3_round_trip():
+    code = encode_generated(15, 21, 3, 15, 2, 123456789)
+    assert parse_generated(code) == ("dfs", (15, 21, 3, 15, 2), 123456789)
+
+    maze, K = decode(code)
+    assert K == 2
+    assert cells(maze) == cells(generate_maze(15, 21, 3, 15, 123456789))
+
+
+def test_ms3_same_seed_same_maze():
+    code = encode_generated(15, 15, 3, 15, 1, 42)
+    assert cells(decode(code)[0]) == cells(decode(code)[0])
+
+
+@pytest.mark.parametrize("size", [f"{MAX_SIDE + 1}x15", f"15x{MAX_SIDE + 1}", "2x15"])
+def test_ms3_size_bounds(size):
+    with pytest.raises(ValueError):
+        decode(f"MS3|dfs|{size}.3.15.1|1")
+
+
+@pytest.mark.parametrize("compress", [None, True, False])
+@pytest.mark.parametrize("size", [(3, 3), (15, 15), (17, 40)])
+def test_ms4_round_trip(size, compress):
+    maze = generate_maze(*size, 4, 15, 99)
+    code = encode_maze(maze, 3, compress=compress)
+    assert code.startswith(f"MS4|{size[0]}x{size[1]}|3|")
+
+    back, K = decode(code)
+    assert K == 3
+    assert cells(back) == cells(maze)
+    assert (back.start, back.goal, back.portals) == (maze.start, maze.goal, maze.portals)
+
+
+def test_ms4_keeps_every_cell_type():
+    maze = Maze(4, 5)
+    for i, t in enumerate([CellType.WALL, CellType.START, CellType.GOAL, CellType.PORTAL, CellType.PORTAL]):
+        maze.grid[1][i].type = t
+    maze.grid[1][3].portal_id = maze.grid[1][4].portal_id = 7
+    back, _ = decode(encode_maze(maze, 0, compress=False))
+    assert cells(back) == cells(maze)
+    assert back.portals == {7: ((1, 3), (1, 4))}
+
+
+def test_maze_id_ignores_the_code_format():
+    code = encode_generated(15, 15, 3, 15, 2, 5)
+    maze, K = decode(code)
+    again, _ = decode(encode_maze(maze, K))
+    assert maze_id(maze, K) == maze_id(again, K)
+    assert maze_id(maze, K) != maze_id(maze, K + 1)
+
+
+def test_ms4_rejects_a_corrupt_payload():
+    code = encode_maze(generate_maze(15, 15, 3, 15, 1), 2, compress=False)
+    head, payload = code.rsplit("|", 1)
+    raw = bytearray(base64.urlsafe_b64decode(payload + "=" * (-len(payload) % 4)))
+    raw[3] ^= 0xff
+    with pytest.raises(ValueError):
+        decode(head + "|" + base64.urlsafe_b64encode(bytes(raw)).decode())
+
+
+def test_ms4_rejects_a_zlib_bomb():
+    body = bytes(10_000_000)
+    raw = bytes([1]) + zlib.compress(body, 9) + zlib.crc32(body).to_bytes(4, "big")
+    code = "MS4|15x15|0|" + base64.urlsafe_b64encode(raw).decode().rstrip("=")
+    with pytest.raises(ValueError, match="too long"):
+        decode(code)
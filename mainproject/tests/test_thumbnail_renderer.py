@@ -0,0 +1,102 @@
+import struct
+import zlib
+
+import numpy as np
+import pytest
+
+from src.core.maze import CellType
+from src.tools.dataset_export import maze_to_arrays
+from src.tools.dataset_generator import generate_maze
+from src.tools.thumbnail_renderer import (PORTAL_COLORS, TILE_GOAL, TILE_GRASS, TILE_PORTAL, TILE_START,
+                                          TILE_WALL, build_atlas, compose, render_mazes, write_png)
+
+
+def paeth(a, b, c):
+    p = a + b - c
+    pa, pb, pc = abs(p - a), abs(p - b), abs(p - c)
+    if pa <= pb and pa <= pc:
+        return a
+    return b if pb <= pc else c
+
+
+def read_png(path):
+    """(h, w, 3) uint8 from an 8-bit RGB PNG, parsed by hand so the writer is checked independently."""
+    with open(path, "rb") as f:
+        data = f.read()
+    assert data[:8] == b"\x89PNG\r\n\x1a\n"
+    pos, chunks = 8, []
+    while pos < len(data):
+        length, = struct.unpack(">I", data[pos:pos + 4])
+        body = data[pos + 4:pos + 8 + length]
+        crc, = struct.unpack(">I", data[pos + 8 + length:pos + 12 + length])
+        assert zlib.crc32(body) & 0xffffffff == crc
+        chunks.append((body[:4], body[4:]))
+        pos += 12 + length
+    assert [tag for tag, _ in chunks][0] == b"IHDR" and chunks[-1][0] == b"IEND"
+
+    w, h, depth, color, comp, filt, interlace = struct.unpack(">IIBBBBB", chunks[0][1])
+    assert (depth, color, comp, filt, interlace) == (8, 2, 0, 0, 0)
+    raw = zlib.decompress(b"".join(body for tag, body in chunks if tag == b"IDAT"))
+    stride = w * 3
+    assert len(raw) == h * (stride + 1)
+
+    out = bytearray()
+    prev = bytearray(stride)
+    for y in range(h):
+        kind = raw[y * (stride + 1)]
+        row = bytearray(raw[y * (stride + 1) + 1:(y + 1) * (stride + 1)])
+        for i in range(stride):
+            a = row[i - 3] if i >= 3 else 0
+            c = prev[i - 3] if i >= 3 else 0
+            b = prev[i]
+            pred = [0, a, b, (a + b) // 2, paeth(a, b, c)][kind]
+            row[i] = (row[i] + pred) & 0xff
+        out += row
+        prev = row
+    return np.frombuffer(bytes(out), dtype=np.uint8).reshape(h, w, 3)
+
+
+def expected_tile(cell, atlas):
+    if cell.type == CellType.PORTAL:
+        return atlas[TILE_PORTAL + cell.portal_id % len(PORTAL_COLORS)]
+    return atlas[{CellType.EMPTY: TILE_GRASS, CellType.WALL: TILE_WALL,
+                  CellType.START: TILE_START, CellType.GOAL: TILE_GOAL}[cell.type]]
+
+
+def test_png_decodes_to_the_image(tmp_path):
+    rng = np.random.default_rng(0)
+    img = rng.integers(0, 256, (7, 11, 3), dtype=np.uint8)
+    write_png(tmp_path / "x.png", img)
+    assert np.array_equal(read_png(tmp_path / "x.png"), img)
+
+
+@pytest.mark.parametrize("tile", [1, 4, 6])
+def test_compose_matches_per_cell_tiles(tile):
+    atlas = build_atlas(tile)
+    assert atlas.shape == (TILE_PORTAL + len(PORTAL_COLORS), tile, tile, 3)
+    maze = generate_maze(5, 7, 4, 30, 11)
+    img = compose(*maze_to_arrays(maze), atlas)
+    assert img.shape == (5 * tile, 7 * tile, 3)
+    for i in range(maze.rows):
+        for j in range(maze.cols):
+            got = img[i * tile:(i + 1) * tile, j * tile:(j + 1) * tile]
+            assert np.array_equal(got, expected_tile(maze.grid[i][j], atlas)), (i, j)
+
+
+def test_batch_compose_matches_single():
+    atlas = build_atlas(3)
+    arrays = [maze_to_arrays(generate_maze(6, 6, 2, 20, s)) for s in range(4)]
+    cells = np.stack([c for c, _ in arrays])
+    portals = np.stack([p for _, p in arrays])
+    batch = compose(cells, portals, atlas)
+    for (c, p), img in zip(arrays, batch):
+        assert np.array_equal(img, compose(c, p, atlas))
+
+
+def test_rendered_files_match_compose(tmp_path):
+    mazes = [("a", generate_maze(5, 5, 1, 20, 1)), ("b", generate_maze(5, 5, 2, 20, 2)),
+             ("c", generate_maze(4, 9, 1, 20, 3))]
+    assert render_mazes(str(tmp_path), mazes, tile=4, batch=2, workers=1) == 3
+    atlas = build_atlas(4)
+    for name, maze in mazes:
+        assert np.array_equal(read_png(tmp_path / f"{name}.png"), compose(*maze_to_arrays(maze), atlas))
@@ -0,0 +1,96 @@
+import io
+import os
+import time
+from collections import deque
+
+import pygame
+
+ASSET_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "assets")
+
+_decoded = {}     # (name, alpha) -> Surface, or None when the file is missing
+_images = {}      # (name, size, alpha) -> Surface
+_music = {}       # name -> bytes, or None
+_queue = deque()
+# name or (name, size) -> milliseconds spent loading it
+timings = {}
+
+
+def _timed(key, fn):
+    start = time.perf_counter()
+    value = fn()
+    timings[key] = (time.perf_counter() - start) * 1000
+    return value
+
+
+def _decode(name, alpha):
+    try:
+        surf = pygame.image.load(os.path.join(ASSET_DIR, name))
+    except (FileNotFoundError, pygame.error):
+        return None
+    # converting needs a display; headless tools get the raw surface
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha() if alpha else surf.convert()
+    return surf
+
+
+def load_image(name, size=None, alpha=False, fallback=None):
+    """Decoded image from assets/, scaled to size, cached by (name, size, alpha).
+
+    A missing file gives a surface filled with `fallback` when one is given
+    (and size is set), else None. Either way the disk is only tried once.
+    """
+    key = (name, size, alpha)
+    surf = _images.get(key)
+    if surf is not None:
+        return surf
+
+    # the alpha and opaque conversions of one file are different surfaces
+    source = (name, alpha)
+    if source not in _decoded:
+        _decoded[source] = _timed(name, lambda: _decode(name, alpha))
+    surf = _decoded[source]
+    if surf is None:
+        if fallback is None or size is None:
+            return None
+        surf = pygame.Surface(size)
+        surf.fill(fallback)
+    elif size is not None and surf.get_size() != tuple(size):
+        surf = _timed((name, size), lambda: pygame.transform.scale(_decoded[source], size))
+    _images[key] = surf
+    return surf
+
+
+def load_music(name):
+    """File object over the cached bytes of a music file, or None when it's missing."""
+    if name not in _music:
+        def read():
+            try:
+                with open(os.path.join(ASSET_DIR, name), "rb") as f:
+                    return f.read()
+            except OSError:
+                return None
+        _music[name] = _timed(name, read)
+    data = _music[name]
+    return io.BytesIO(data) if data is not None else None
+
+
+def queue_image(name, size=None, alpha=False):
+    _queue.append(lambda: load_image(name, size, alpha))
+
+
+def queue_music(name):
+    _queue.append(lambda: load_music(name))
+
+
+def preload(budget_ms=4.0):
+    """Run queued loads until budget_ms has passed (at least one); True once the queue is empty."""
+    start = time.perf_counter()
+    while _queue:
+        _queue.popleft()()
+        if (time.perf_counter() - start) * 1000 >= budget_ms:
+            break
+    return not _queue
+
+
+def report():
+    return sorted(timings.items(), key=lambda item: -item[1])
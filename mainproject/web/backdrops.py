@@ -0,0 +1,57 @@
+import pygame
+
+from web.assets import load_image
+
+_backgrounds = {}   # (kind, ...) -> opaque Surface
+_overlays = {}      # (size, color, radius) -> SRCALPHA Surface
+
+
+def overlay(size, color, radius=0):
+    """Shared translucent surface of `size` filled with `color` (RGBA); blit it, don't draw on it.
+
+    radius rounds the corners. A pulsing overlay should ask for one opaque color
+    and set_alpha() before each blit, rather than pooling a surface per alpha.
+    """
+    key = (tuple(size), tuple(color), radius)
+    surf = _overlays.get(key)
+    if surf is None:
+        surf = _overlays[key] = pygame.Surface(size, pygame.SRCALPHA)
+        if radius:
+            pygame.draw.rect(surf, color, surf.get_rect(), border_radius=radius)
+        else:
+            surf.fill(color)
+    return surf
+
+
+def _opaque(surf):
+    return surf.convert() if pygame.display.get_surface() is not None else surf
+
+
+def image_background(name, size, tint=None, fallback=(0, 0, 0)):
+    """Asset image scaled to size with its tint already blended in, built once.
+
+    A missing image is replaced by a `fallback` fill before tinting.
+    """
+    key = ("image", name, tuple(size), tint)
+    surf = _backgrounds.get(key)
+    if surf is None:
+        surf = load_image(name, size, fallback=fallback).copy()
+        if tint is not None:
+            surf.blit(overlay(size, tint), (0, 0))
+        surf = _backgrounds[key] = _opaque(surf)
+    return surf
+
+
+def sky_gradient(size):
+    # the menus' stand-in for bg.png: one shade per row, darkening downwards
+    key = ("sky", tuple(size))
+    surf = _backgrounds.get(key)
+    if surf is None:
+        w, h = size
+        surf = pygame.Surface(size)
+        surf.fill((135, 206, 235))
+        for i in range(h):
+            color = (max(0, 135 - i//10), max(0, 206 - i//15), max(0, 235 - i//20))
+            pygame.draw.line(surf, color, (0, i), (w, i))
+        surf = _backgrounds[key] = _opaque(surf)
+    return surf
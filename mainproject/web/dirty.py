@@ -0,0 +1,15 @@
+import pygame
+
+
+def repaint(screen, rects, paint):
+    """Run a whole-screen paint function clipped to each rect and return the rects.
+
+    Blits and fills outside the clip are rejected by SDL, so a screen can reuse
+    its full draw code to refresh just the regions that changed.
+    """
+    rects = [pygame.Rect(r) for r in rects]
+    for rect in rects:
+        screen.set_clip(rect)
+        paint()
+    screen.set_clip(None)
+    return rects
@@ -1,9 +1,7 @@
 import pygame
-import base64
 import sys
 
 import web.renderer as renderer
-from web.renderer import _sprites
 
 IS_WEB = sys.platform == "emscripten"
 if IS_WEB:
@@ -12,6 +10,10 @@ if IS_WEB:
 from web.state import GameState
 from src.core.maze import Maze, CellType
 from src.solver.bfs_solver import BFSSolver
+from src.tools.seed_codec import encode_maze, short_code
+import web.maze_store as maze_store
+from web.fonts import get_font
+from web.text_cache import render_text
 
 CELL_SIZE = 32  
 GRID_DIM = 15
@@ -34,15 +36,22 @@ TILE_WALL = "WALL"
 TILE_START = "START"
 TILE_GOAL = "GOAL"
 
+TILE_CELL_TYPES = {
+    TILE_EMPTY: CellType.EMPTY,
+    TILE_WALL: CellType.WALL,
+    TILE_START: CellType.START,
+    TILE_GOAL: CellType.GOAL,
+}
+
 class EditorScreen:
     def __init__(self, game):
         self.game = game
         
         # Fonts
-        self.font_ui = pygame.font.SysFont("Segoe UI", 14)
-        self.font_bold = pygame.font.SysFont("Segoe UI", 14, bold=True)
-        self.font_big = pygame.font.SysFont("Segoe UI", 24, bold=True)
-        self.font_mono = pygame.font.SysFont("Consolas", 12)
+        self.font_ui = get_font("Segoe UI", 14)
+        self.font_bold = get_font("Segoe UI", 14, bold=True)
+        self.font_big = get_font("Segoe UI", 24, bold=True)
+        self.font_mono = get_font("Consolas", 12)
 
         renderer.load_sprites()
         
@@ -67,6 +76,8 @@ class EditorScreen:
         # UI State
         self.grid = [[TILE_EMPTY for _ in range(self.GRID_DIM)]
                      for _ in range(self.GRID_DIM)]
+        # live copy of the grid (rows = gy) so publishing doesn't rebuild it
+        self.maze = Maze(self.GRID_DIM, self.GRID_DIM)
         
         self.selected = TILE_WALL
         self.selected_portal_id = None
@@ -74,10 +85,21 @@ class EditorScreen:
         self.message = "Editor Ready."
         self.message_type = "neutral" 
         self.seed = None
+        self.maze_id = None
         self.k_value = 3
         
         self.buttons = {} 
 
+        # static tiles live on grid_surf and are redrawn per cell as they change;
+        # portals animate, so they're blitted on top every frame
+        self.grid_surf = pygame.Surface((self.grid_pixel_w, self.grid_pixel_h))
+        self.portal_cells = {}
+        for i in range(self.GRID_DIM):
+            for j in range(self.GRID_DIM):
+                self._draw_cell(i, j)
+        # the panel is re-rendered only when what it shows changes
+        self.panel_state = None
+
     def update(self):
         renderer.update_animation()
 
@@ -137,17 +159,25 @@ class EditorScreen:
             if self.count_portal(self.selected_portal_id) >= 2:
                 self.set_message(f"Portal {self.selected_portal_id} max (2)", "error")
                 return
-            self.grid[gx][gy] = ("PORTAL", self.selected_portal_id)
+            self.set_tile(gx, gy, ("PORTAL", self.selected_portal_id))
         else:
-            self.grid[gx][gy] = self.selected
+            self.set_tile(gx, gy, self.selected)
         
         self.set_message("Placed object.", "neutral")
 
+    def set_tile(self, gx, gy, tile):
+        self.grid[gx][gy] = tile
+        if isinstance(tile, tuple):
+            self.maze.set_cell(gy, gx, CellType.PORTAL, tile[1])
+        else:
+            self.maze.set_cell(gy, gx, TILE_CELL_TYPES[tile])
+        self._draw_cell(gx, gy)
+
     def clear_tile_type(self, tile_type):
         for i in range(self.GRID_DIM):
             for j in range(self.GRID_DIM):
                 if self.grid[i][j] == tile_type:
-                    self.grid[i][j] = TILE_EMPTY
+                    self.set_tile(i, j, TILE_EMPTY)
 
     def count_portal(self, pid):
         count = 0
@@ -178,57 +208,13 @@ class EditorScreen:
                 self.set_message(f"Error: Portal {pid} needs 2 ends", "error")
                 return
 
-        maze = Maze(self.GRID_DIM, self.GRID_DIM)
-        char_grid = []
-        portal_map = {}
-
-        for j in range(self.GRID_DIM):
-            for i in range(self.GRID_DIM):
-                cell_data = self.grid[i][j]
-                cell = maze.grid[i][j]
-                char = "."
-                
-                if cell_data == TILE_WALL:
-                    cell.type = CellType.WALL
-                    char = "#"
-                elif cell_data == TILE_START:
-                    cell.type = CellType.START
-                    maze.start = (i, j)
-                    char = "S"
-                elif cell_data == TILE_GOAL:
-                    cell.type = CellType.GOAL
-                    maze.goal = (i, j)
-                    char = "G"
-                elif isinstance(cell_data, tuple):
-                    pid = cell_data[1]
-                    cell.type = CellType.PORTAL
-                    cell.portal_id = pid
-                    portal_map.setdefault(pid, []).append((i, j))
-                    char = chr(ord('a') + pid)
-                
-                char_grid.append(char)
-        
-        for pid, coords in portal_map.items():
-            maze.portals[pid] = tuple(coords)
-
-        solver = BFSSolver(maze, self.k_value)
-        if solver.shortest_path() == -1:
+        solver = BFSSolver(self.maze, self.k_value)
+        if not solver.is_solvable():
             self.set_message(f"Unsolvable with K={self.k_value}!", "error")
             return
         
-        rle = []
-        count = 1
-        for k in range(1, len(char_grid)):
-            if char_grid[k] == char_grid[k-1]:
-                count += 1
-            else:
-                rle.append(f"{count}{char_grid[k-1]}")
-                count = 1
-        rle.append(f"{count}{char_grid[-1]}")
-        
-        payload = "".join(rle)
-        encoded = base64.urlsafe_b64encode(payload.encode()).decode()
-        self.seed = f"MS2|{self.GRID_DIM}x{self.GRID_DIM}|{self.k_value}|{encoded}"
+        self.seed = encode_maze(self.maze, self.k_value)
+        self.maze_id = maze_store.put(self.maze, self.k_value, self.seed)
         
         self.set_message("Seed Generated!", "success")
         
@@ -239,39 +225,62 @@ class EditorScreen:
                 pass
 
     def _get_icon(self, key, size):
-        s = _sprites.get(key)
-        if s: return pygame.transform.scale(s, (size, size))
-        return pygame.Surface((size, size))
+        # prescaled once per size by the renderer
+        return renderer.sprite(key, size)
 
-    def draw(self):
-        self.game.screen.fill(COL_BG)
-        self.buttons = {} 
+    def _draw_cell(self, i, j):
+        x, y = i * CELL_SIZE, j * CELL_SIZE
+        self.grid_surf.blit(self._get_icon('grass', CELL_SIZE), (x, y))
 
-        grid_rect = pygame.Rect(self.grid_origin_x, self.grid_origin_y, self.grid_pixel_w, self.grid_pixel_h)
-        pygame.draw.rect(self.game.screen, (0, 0, 0), grid_rect.move(2, 2)) # Shadow
+        cell = self.grid[i][j]
+        self.portal_cells.pop((i, j), None)
 
-        for i in range(self.GRID_DIM):
-            for j in range(self.GRID_DIM):
-                x = self.grid_origin_x + i * CELL_SIZE
-                y = self.grid_origin_y + j * CELL_SIZE
-                
-                self.game.screen.blit(self._get_icon('grass', CELL_SIZE), (x, y))
-
-                cell = self.grid[i][j]
-                
-                if cell == TILE_WALL:
-                    self.game.screen.blit(self._get_icon('wall', CELL_SIZE), (x, y))
-                elif cell == TILE_START:
-                    self.game.screen.blit(self._get_icon('cat', CELL_SIZE), (x, y))
-                elif cell == TILE_GOAL:
-                    self.game.screen.blit(self._get_icon('fish', CELL_SIZE), (x, y))
-                elif isinstance(cell, tuple):
-                    p_img = renderer._generate_portal(cell[1], renderer._animation_frame)
-                    p_img = pygame.transform.scale(p_img, (CELL_SIZE, CELL_SIZE))
-                    self.game.screen.blit(p_img, (x, y))
-                
-                pygame.draw.rect(self.game.screen, (0, 0, 0, 20), (x, y, CELL_SIZE, CELL_SIZE), 1)
+        if cell == TILE_WALL:
+            self.grid_surf.blit(self._get_icon('wall', CELL_SIZE), (x, y))
+        elif cell == TILE_START:
+            self.grid_surf.blit(self._get_icon('cat', CELL_SIZE), (x, y))
+        elif cell == TILE_GOAL:
+            self.grid_surf.blit(self._get_icon('fish', CELL_SIZE), (x, y))
+        elif isinstance(cell, tuple):
+            self.portal_cells[(i, j)] = cell[1]
+
+        pygame.draw.rect(self.grid_surf, (0, 0, 0, 20), (x, y, CELL_SIZE, CELL_SIZE), 1)
 
+    def _hovered_button(self):
+        pos = pygame.mouse.get_pos()
+        for key, rect in self.buttons.items():
+            if rect.collidepoint(pos):
+                return key
+        return None
+
+    def draw(self):
+        screen = self.game.screen
+        grid_rect = pygame.Rect(self.grid_origin_x, self.grid_origin_y, self.grid_pixel_w, self.grid_pixel_h)
+        full = self.game.full_redraw
+        if full:
+            screen.fill(COL_BG)
+            pygame.draw.rect(screen, (0, 0, 0), grid_rect.move(2, 2)) # Shadow
+
+        screen.blit(self.grid_surf, grid_rect)
+        for (i, j), pid in self.portal_cells.items():
+            x = self.grid_origin_x + i * CELL_SIZE
+            y = self.grid_origin_y + j * CELL_SIZE
+            screen.blit(renderer.portal_surface(pid, size=CELL_SIZE), (x, y))
+            pygame.draw.rect(screen, (0, 0, 0, 20), (x, y, CELL_SIZE, CELL_SIZE), 1)
+        rects = [grid_rect]
+
+        state = (self.selected, self.selected_portal_id, self._hovered_button(), self.k_value,
+                 self.message, self.message_type, self.seed, self.maze_id)
+        if full or state != self.panel_state:
+            self.panel_state = state
+            self._draw_panel()
+            rects.append(self.panel_rect)
+        if full:
+            return None
+        return rects
+
+    def _draw_panel(self):
+        self.buttons = {} 
         px, py = self.panel_rect.topleft
         pw, ph = self.panel_rect.size
         
@@ -297,18 +306,18 @@ class EditorScreen:
             pygame.draw.rect(self.game.screen, COL_BORDER, rect, 1, border_radius=6)
             
             if surf:
-                self.game.screen.blit(pygame.transform.scale(surf, (28,28)), (x+6, y+6))
+                self.game.screen.blit(surf, (x+6, y+6))
             elif icon_key:
                 self.game.screen.blit(self._get_icon(icon_key, 28), (x+6, y+6))
             
             if label:
-                lbl = self.font_ui.render(label, True, COL_TEXT)
+                lbl = render_text(self.font_ui, label, COL_TEXT)
                 self.game.screen.blit(lbl, (x + 2, y + 42))
 
         cx = px + 20
         cy = py + 20
         
-        lbl = self.font_bold.render("TERRAIN", True, COL_SUBTEXT)
+        lbl = render_text(self.font_bold, "TERRAIN", COL_SUBTEXT)
         self.game.screen.blit(lbl, (cx, cy))
         cy += 25
         
@@ -319,13 +328,13 @@ class EditorScreen:
         cy = py + 20
         pygame.draw.line(self.game.screen, COL_BORDER, (cx-15, cy), (cx-15, py+ph-20))
         
-        lbl = self.font_bold.render("PORTALS", True, COL_SUBTEXT)
+        lbl = render_text(self.font_bold, "PORTALS", COL_SUBTEXT)
         self.game.screen.blit(lbl, (cx, cy))
         cy += 25
         
         start_x = cx
         for pid in range(6):
-            p_surf = renderer._generate_portal(pid, 0)
+            p_surf = renderer.portal_surface(pid, 0, size=28)
             draw_btn(cx, cy, f"TOOL_PORTAL_{pid}", surf=p_surf)
             cx += 45
             if pid == 2:
@@ -336,7 +345,7 @@ class EditorScreen:
         cy = py + 20
         pygame.draw.line(self.game.screen, COL_BORDER, (cx-15, cy), (cx-15, py+ph-20))
 
-        lbl = self.font_bold.render("ACTORS", True, COL_SUBTEXT)
+        lbl = render_text(self.font_bold, "ACTORS", COL_SUBTEXT)
         self.game.screen.blit(lbl, (cx, cy))
         cy += 25
         
@@ -347,25 +356,25 @@ class EditorScreen:
         cy = py + 20
         pygame.draw.line(self.game.screen, COL_BORDER, (cx-15, cy), (cx-15, py+ph-20))
 
-        lbl = self.font_bold.render("BREAKS (K)", True, COL_SUBTEXT)
+        lbl = render_text(self.font_bold, "BREAKS (K)", COL_SUBTEXT)
         self.game.screen.blit(lbl, (cx, cy))
         cy += 35
  
         m_rect = pygame.Rect(cx, cy, 30, 30)
         self.buttons["BTN_MINUS"] = m_rect
         pygame.draw.rect(self.game.screen, (230, 230, 235), m_rect, border_radius=4)
-        m_txt = self.font_bold.render("-", True, COL_TEXT)
+        m_txt = render_text(self.font_bold, "-", COL_TEXT)
         self.game.screen.blit(m_txt, m_txt.get_rect(center=m_rect.center))
         
         v_rect = pygame.Rect(cx + 35, cy, 40, 30)
         pygame.draw.rect(self.game.screen, (255, 255, 255), v_rect, border_radius=4)
-        v_txt = self.font_bold.render(str(self.k_value), True, COL_ACCENT)
+        v_txt = render_text(self.font_bold, str(self.k_value), COL_ACCENT)
         self.game.screen.blit(v_txt, v_txt.get_rect(center=v_rect.center))
         
         p_rect = pygame.Rect(cx + 80, cy, 30, 30)
         self.buttons["BTN_PLUS"] = p_rect
         pygame.draw.rect(self.game.screen, (230, 230, 235), p_rect, border_radius=4)
-        p_txt = self.font_bold.render("+", True, COL_TEXT)
+        p_txt = render_text(self.font_bold, "+", COL_TEXT)
         self.game.screen.blit(p_txt, p_txt.get_rect(center=p_rect.center))
 
         cx += 140
@@ -379,7 +388,7 @@ class EditorScreen:
         if btn_rect.collidepoint(pygame.mouse.get_pos()): col_btn = (70, 140, 255)
         pygame.draw.rect(self.game.screen, col_btn, btn_rect, border_radius=6)
         
-        l_pub = self.font_bold.render("GENERATE", True, (255, 255, 255))
+        l_pub = render_text(self.font_bold, "GENERATE", (255, 255, 255))
         self.game.screen.blit(l_pub, l_pub.get_rect(center=btn_rect.center))
         
         cy += 50
@@ -387,9 +396,11 @@ class EditorScreen:
         if self.message_type == "error": msg_col = COL_ERROR
         elif self.message_type == "success": msg_col = COL_SUCCESS
         
-        msg_surf = self.font_ui.render(self.message, True, msg_col)
+        msg_surf = render_text(self.font_ui, self.message, msg_col)
         self.game.screen.blit(msg_surf, (cx, cy))
         
         if self.seed:
-            s_surf = self.font_mono.render("Seed Copied!", True, (150, 150, 150))
-            self.game.screen.blit(s_surf, (cx, cy + 20))
\ No newline at end of file
+            s_surf = render_text(self.font_mono, "Seed Copied!", (150, 150, 150))
+            self.game.screen.blit(s_surf, (cx, cy + 20))
+            id_surf = render_text(self.font_mono, short_code(self.maze_id), (150, 150, 150))
+            self.game.screen.blit(id_surf, (cx, cy + 36))
\ No newline at end of file
@@ -0,0 +1,35 @@
+import pygame
+
+# (family, size, bold) of every font the screens use; loaded ahead during the welcome screen
+PRELOAD = [
+    ("Segoe UI", 32, True),
+    ("Segoe UI", 12, True),
+    ("Segoe UI", 20, True),
+    ("Segoe UI", 16, False),
+    ("Consolas", 14, False),
+    ("Segoe UI", 14, False),
+    ("Segoe UI", 14, True),
+    ("Segoe UI", 24, True),
+    ("Consolas", 12, False),
+    ("Arial", 26, False),
+    ("Arial", 16, True),
+]
+
+_fonts = {}
+
+
+def get_font(family, size, bold=False):
+    """Shared Font for (family, size, bold); SysFont only runs the first time."""
+    key = (family, size, bold)
+    font = _fonts.get(key)
+    if font is None:
+        font = _fonts[key] = pygame.font.SysFont(family, size, bold=bold)
+    return font
+
+
+def preload(limit=None):
+    """Load up to `limit` fonts from PRELOAD that aren't loaded yet; True once all are."""
+    pending = [key for key in PRELOAD if key not in _fonts]
+    for key in pending[:limit]:
+        get_font(*key)
+    return limit is None or len(pending) <= limit
@@ -1,10 +1,21 @@
 import pygame
-import os
+import web.assets as assets
 from web.editor import EditorScreen
 from web.load_seed import SeedLoadScreen
 from web.state import GameState
+from web.renderer import CELL
 from web.screens import WelcomeScreen, NameScreen, ModeScreen, PlayScreen
 
+MUSIC = {
+    GameState.WELCOME: "menu.ogg",
+    GameState.NAME: "menu.ogg",
+    GameState.MODE: "menu.ogg",
+    GameState.LOAD: "menu.ogg",
+    GameState.PLAY: "play.ogg",
+    GameState.EDITOR: "editor.ogg",
+}
+IDLE_STATES = (GameState.WELCOME, GameState.NAME, GameState.MODE, GameState.LOAD)
+
 class Game:
     def __init__(self, screen):
         
@@ -15,6 +26,8 @@ class Game:
 
 
         self.current_music = None
+        # the next frame repaints and presents the whole display
+        self.full_redraw = True
 
         self.screens = {
             GameState.WELCOME: WelcomeScreen(self),
@@ -23,27 +36,27 @@ class Game:
         }
 
         self.current = self.screens[self.state]
+
+        # menus are idle most frames; they decode what play and the editor need next
+        w, h = screen.get_size()
+        for name in ("grass.png", "wall.png", "cat.png", "fish.png"):
+            assets.queue_image(name, (CELL, CELL), alpha=True)
+        assets.queue_image("playscreen_bg.png", (w, h))
+        for name in dict.fromkeys(MUSIC.values()):
+            assets.queue_music(name)
+        self.assets_ready = False
         
         self.update_music()
 
     def update_music(self):
 
-        target_music = None
-        
-
-        if self.state in [GameState.WELCOME, GameState.NAME, GameState.MODE, GameState.LOAD]:
-            target_music = "menu.ogg"
-        elif self.state == GameState.PLAY:
-            target_music = "play.ogg"
-        elif self.state == GameState.EDITOR:
-            target_music = "editor.ogg"
-
+        target_music = MUSIC.get(self.state)
 
         if target_music and target_music != self.current_music:
-            path = os.path.join("assets", target_music)
-            if os.path.exists(path):
+            data = assets.load_music(target_music)
+            if data is not None:
                 try:
-                    pygame.mixer.music.load(path)
+                    pygame.mixer.music.load(data, target_music)
                     pygame.mixer.music.set_volume(0.4) 
                     pygame.mixer.music.play(-1)        
                     self.current_music = target_music
@@ -54,6 +67,10 @@ class Game:
 
     def switch(self, new_state, **kwargs):
         self.state = new_state
+        # screens holding on to shared objects (maze listeners) let go of them here
+        close = getattr(self.current, "close", None)
+        if close:
+            close()
 
         if new_state == GameState.PLAY:
             self.current = PlayScreen(self, **kwargs)
@@ -67,6 +84,7 @@ class Game:
         else:
             self.current = self.screens[new_state]
 
+        self.full_redraw = True
         self.update_music()
 
     def handle_events(self):
@@ -74,6 +92,17 @@ class Game:
 
     def update(self):
         self.current.update()
+        if not self.assets_ready and self.state in IDLE_STATES:
+            self.assets_ready = assets.preload()
 
     def draw(self):
-        self.current.draw()
\ No newline at end of file
+        """Draw the current screen; returns the rects to present, None for the whole display.
+
+        Screens return the rects they changed ([] when nothing did) or None.
+        While full_redraw is set they must repaint everything.
+        """
+        rects = self.current.draw()
+        if self.full_redraw:
+            self.full_redraw = False
+            return None
+        return rects
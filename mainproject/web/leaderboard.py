@@ -1,7 +1,51 @@
+import bisect
 import json
+import os
 import time
 
 STORAGE_KEY = "maze_leaderboard"
+JSON_FILE = "leaderboard.json"
+DB_FILE = "leaderboard.db"
+JOURNAL_BASE = "leaderboard"
+# desktop backend override: "sqlite" (default), "journal", "json" or a server URL
+BACKEND_ENV = "MAZE_LEADERBOARD"
+
+
+class LeaderboardBackend:
+    """Storage for score entries grouped by seed, each seed sorted by (-score, time)."""
+
+    def add_scores(self, items):
+        # items: iterable of (seed, entry)
+        raise NotImplementedError
+
+    def get_scores(self, seed, offset=0, limit=None):
+        raise NotImplementedError
+
+    def add_score(self, seed, entry):
+        self.add_scores([(seed, entry)])
+
+    def seeds(self):
+        # only needed by offline tools; backends that can enumerate override it
+        raise NotImplementedError(f"{type(self).__name__} can't list its seeds")
+
+    # generic versions that read the whole list; indexed backends override them
+    def count(self, seed):
+        return len(self.get_scores(seed))
+
+    def get_rank(self, seed, score, time_taken):
+        """1-based position a (score, time) result holds; ties share the better rank."""
+        key = (-score, time_taken)
+        return 1 + sum(1 for e in self.get_scores(seed) if sort_key(e) < key)
+
+    def get_around(self, seed, score, time_taken, radius=3):
+        """(rank of first row, rows) for a window of entries centred on a result."""
+        rank = self.get_rank(seed, score, time_taken)
+        offset = max(0, rank - 1 - radius)
+        return offset + 1, self.get_scores(seed, offset, 2 * radius + 1)
+
+    def close(self):
+        pass
+
 
 def load_leaderboard():
     try:
@@ -10,7 +54,7 @@ def load_leaderboard():
         return json.loads(raw) if raw else {}
     except:
         try:
-            with open("leaderboard.json", "r") as f:
+            with open(JSON_FILE, "r") as f:
                 return json.load(f)
         except:
             return {}
@@ -21,29 +65,121 @@ def save_leaderboard(data):
         js.window.localStorage.setItem(STORAGE_KEY, json.dumps(data))
     except ImportError:
         try:
-            with open("leaderboard.json", "w") as f:
+            with open(JSON_FILE, "w") as f:
                 json.dump(data, f)
         except Exception as e:
             print(f"Save failed: {e}")
 
-def add_score(seed, name, score, time_taken):
-    data = load_leaderboard()
 
+def sort_key(entry):
+    return (-entry["score"], entry["time"])
+
+
+class SeedIndex:
+    """Entries for one seed kept sorted by (-score, time) with bisect insertion.
+
+    total counts every insert, including entries a backend later trims off.
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.entries = []
+        self.total = 0
+
+    @classmethod
+    def from_sorted(cls, entries, total=None):
+        idx = cls()
+        idx.entries = entries
+        idx.keys = [sort_key(e) for e in entries]
+        idx.total = len(entries) if total is None else total
+        return idx
+
+    def insert(self, entry):
+        key = sort_key(entry)
+        # insert after equal keys so ties keep submission order, like list.sort
+        i = bisect.bisect_right(self.keys, key)
+        self.keys.insert(i, key)
+        self.entries.insert(i, entry)
+        self.total += 1
+
+
+class JsonBackend(LeaderboardBackend):
+    # whole-blob storage: localStorage on web, leaderboard.json otherwise
+    def add_scores(self, items):
+        data = load_leaderboard()
+        touched = set()
+        for seed, entry in items:
+            data.setdefault(seed, []).append(entry)
+            touched.add(seed)
+        for seed in touched:
+            data[seed].sort(key=sort_key)
+        save_leaderboard(data)
+
+    def seeds(self):
+        return list(load_leaderboard())
+
+    def get_scores(self, seed, offset=0, limit=None):
+        scores = load_leaderboard().get(seed, [])
+        return scores[offset:] if limit is None else scores[offset:offset + limit]
+
+
+_backend = None
+
+def _default_backend():
+    try:
+        import js
+        from web.leaderboard_shards import ShardedBackend
+        return ShardedBackend(js.window.localStorage)
+    except ImportError:
+        pass
+
+    choice = os.environ.get(BACKEND_ENV, "sqlite")
+    if choice == "json":
+        return JsonBackend()
+    if choice.startswith("http://"):
+        from web.leaderboard_http import HttpBackend
+        return HttpBackend(choice)
+    if choice == "journal":
+        from web.leaderboard_journal import JournalBackend
+        return JournalBackend(JOURNAL_BASE)
+    try:
+        from web.leaderboard_sqlite import SqliteBackend
+        return SqliteBackend(DB_FILE, import_json=JSON_FILE)
+    except ImportError:
+        return JsonBackend()
+
+def get_backend():
+    global _backend
+    if _backend is None:
+        _backend = _default_backend()
+    return _backend
+
+def set_backend(backend):
+    global _backend
+    if _backend is not None and _backend is not backend:
+        _backend.close()
+    _backend = backend
+
+
+def make_entry(name, score, time_taken, replay=None):
     entry = {
         "name": name,
         "score": round(score, 2),
         "time": round(time_taken, 2),
         "timestamp": int(time.time())
     }
+    if replay is not None:
+        entry["replay"] = replay
+    return entry
 
-    data.setdefault(seed, []).append(entry)
+def get_scores(seed, offset=0, limit=None):
+    return get_backend().get_scores(seed, offset, limit)
 
-    data[seed].sort(
-        key=lambda x: (-x["score"], x["time"])
-    )
+def get_rank(seed, score, time_taken):
+    return get_backend().get_rank(seed, round(score, 2), round(time_taken, 2))
 
-    save_leaderboard(data)
+def get_scores_around(seed, score, time_taken, radius=3):
+    return get_backend().get_around(seed, round(score, 2), round(time_taken, 2), radius)
 
-def get_scores(seed):
-    data = load_leaderboard()
-    return data.get(seed, [])
+def count_scores(seed):
+    return get_backend().count(seed)
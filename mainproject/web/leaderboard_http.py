@@ -0,0 +1,133 @@
+import http.client
+import json
+import threading
+import time
+import uuid
+from urllib.parse import urlsplit, urlencode, quote
+
+from web.leaderboard import LeaderboardBackend
+
+RETRIES = 4
+BACKOFF = 0.05
+CACHE_TTL = 2.0
+# scores sent per POST; add_scores splits bigger batches
+BATCH_SIZE = 2000
+# rows asked for per GET; the server caps pages at its MAX_PAGE
+PAGE_SIZE = 1000
+
+
+class HttpBackend(LeaderboardBackend):
+    """Client for web/leaderboard_server.py.
+
+    Keeps one keep-alive connection per thread, retries failed requests with
+    exponential backoff (submissions carry ids so the server drops replays), and caches reads for CACHE_TTL seconds (a seed's cache
+    is dropped whenever this client submits to it). Calls are blocking; the
+    game reaches it through ScoreClient, which runs them off the frame.
+    """
+
+    def __init__(self, url, timeout=5.0, retries=RETRIES, backoff=BACKOFF, cache_ttl=CACHE_TTL):
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+
+        self._local = threading.local()
+        self._conns = []
+        self._lock = threading.Lock()
+        self._cache = {}     # (seed, path) -> (expires, payload)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            self._local.conn = conn
+            with self._lock:
+                self._conns.append(conn)
+        return conn
+
+    def _request(self, method, path, payload=None):
+        body = None if payload is None else json.dumps(payload)
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        for attempt in range(self.retries + 1):
+            conn = self._conn()
+            try:
+                conn.request(method, self.prefix + path, body, headers)
+                resp = conn.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException) as e:
+                # stale keep-alive or server restart: reconnect and try again
+                conn.close()
+                if attempt == self.retries:
+                    raise ConnectionError(f"Leaderboard unreachable: {e}") from e
+                time.sleep(self.backoff * (2 ** attempt))
+                continue
+            if resp.status >= 500 and attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+                continue
+            if resp.status != 200:
+                raise ValueError(f"Leaderboard error {resp.status}: {data[:200]!r}")
+            return json.loads(data)
+
+    def _get(self, seed, route, query):
+        path = f"/{route}/{quote(seed, safe='')}?{urlencode(query)}"
+        key = (seed, path)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._cache.get(key)
+        if hit and hit[0] > now:
+            return hit[1]
+        payload = self._request("GET", path)
+        with self._lock:
+            self._cache[key] = (now + self.cache_ttl, payload)
+        return payload
+
+    def add_scores(self, items):
+        # the sid is fixed before the first attempt, so a retried POST the server already
+        # committed is recognised and skipped instead of stored twice
+        records = [{"seed": seed, "sid": uuid.uuid4().hex, **entry} for seed, entry in items]
+        for i in range(0, len(records), BATCH_SIZE):
+            self._request("POST", "/scores", {"scores": records[i:i + BATCH_SIZE]})
+        seeds = {rec["seed"] for rec in records}
+        with self._lock:
+            self._cache = {k: v for k, v in self._cache.items() if k[0] not in seeds}
+
+    def _page(self, seed, offset, limit):
+        query = {"offset": offset}
+        if limit is not None:
+            query["limit"] = limit
+        return self._get(seed, "scores", query)
+
+    def get_scores(self, seed, offset=0, limit=None):
+        rows = []
+        while limit is None or len(rows) < limit:
+            want = PAGE_SIZE if limit is None else min(PAGE_SIZE, limit - len(rows))
+            page = self._page(seed, offset + len(rows), want)["rows"]
+            rows += page
+            if len(page) < want:
+                break
+        return rows
+
+    def seeds(self):
+        return self._request("GET", "/seeds")["seeds"]
+
+    def count(self, seed):
+        # every scores/rank payload carries the total, so reuse a fresh one if there is any
+        now = time.monotonic()
+        with self._lock:
+            for (cached_seed, _), (expires, payload) in self._cache.items():
+                if cached_seed == seed and expires > now:
+                    return payload["total"]
+        return self._page(seed, 0, 1)["total"]
+
+    def get_rank(self, seed, score, time_taken):
+        return self._get(seed, "rank", {"score": score, "time": time_taken})["rank"]
+
+    def close(self):
+        with self._lock:
+            conns, self._conns = self._conns, []
+        for conn in conns:
+            conn.close()
@@ -0,0 +1,207 @@
+import bisect
+import glob
+import json
+import os
+import threading
+import time
+
+from web.leaderboard import LeaderboardBackend, SeedIndex
+
+
+def _trim_torn_tail(path):
+    # a crash mid-append leaves a partial last line; cut it off, or the next
+    # append would be glued onto it and lost with it on the following replay
+    try:
+        with open(path, "rb+") as f:
+            if f.seek(0, os.SEEK_END) == 0:
+                return
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+    except FileNotFoundError:
+        pass
+
+
+class JournalBackend(LeaderboardBackend):
+    """Crash-safe append-only score log with an in-memory sorted index.
+
+    Every submission is one JSON line appended to <base>.journal.<gen>; fsyncs
+    are batched. Startup loads <base>.snapshot.json and replays the journals
+    from its generation on. Once a journal passes compact_every entries it is
+    folded into a new snapshot on a background thread.
+    """
+
+    def __init__(self, base, fsync_every=32, fsync_interval=1.0, compact_every=10000):
+        self.base = base
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self.compact_every = compact_every
+
+        self.index = {}
+        self._lock = threading.Lock()
+        self._compacting = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+        self.generation = self._load()
+        path = self._journal_path(self.generation)
+        _trim_torn_tail(path)
+        self._journal = open(path, "a", encoding="utf-8")
+
+    def _journal_path(self, gen):
+        return f"{self.base}.journal.{gen}"
+
+    def _snapshot_path(self):
+        return f"{self.base}.snapshot.json"
+
+    def _insert(self, seed, entry):
+        seed_index = self.index.get(seed)
+        if seed_index is None:
+            seed_index = self.index[seed] = SeedIndex()
+        seed_index.insert(entry)
+
+    def _journals(self):
+        found = []
+        for path in glob.glob(glob.escape(self.base) + ".journal.*"):
+            try:
+                found.append((int(path.rsplit(".", 1)[1]), path))
+            except ValueError:
+                continue
+        return sorted(found)
+
+    def _load(self):
+        gen = 0
+        try:
+            with open(self._snapshot_path(), "r", encoding="utf-8") as f:
+                snap = json.load(f)
+            gen = snap["generation"]
+            for seed, entries in snap["scores"].items():
+                self.index[seed] = SeedIndex.from_sorted(entries)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self._entries_since_compact = 0
+        for j_gen, path in self._journals():
+            if j_gen < gen:
+                # already folded into the snapshot; the old process died before deleting it
+                os.remove(path)
+                continue
+            self._entries_since_compact += self._replay(path)
+            gen = max(gen, j_gen)
+        return gen
+
+    def _replay(self, path):
+        count = 0
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                    seed = rec.pop("seed")
+                except (ValueError, KeyError):
+                    # torn final line from a crash mid-append
+                    continue
+                self._insert(seed, rec)
+                count += 1
+        return count
+
+    def add_scores(self, items):
+        lines = []
+        with self._lock:
+            for seed, entry in items:
+                self._insert(seed, entry)
+                lines.append(json.dumps({"seed": seed, **entry}) + "\n")
+            self._journal.write("".join(lines))
+            self._journal.flush()
+
+            self._unsynced += len(lines)
+            now = time.monotonic()
+            if self._unsynced >= self.fsync_every or now - self._last_sync >= self.fsync_interval:
+                self._sync(now)
+
+            self._entries_since_compact += len(lines)
+            if self._entries_since_compact >= self.compact_every and self._compacting is None:
+                self._start_compaction()
+
+    def _sync(self, now=None):
+        os.fsync(self._journal.fileno())
+        self._unsynced = 0
+        self._last_sync = now if now is not None else time.monotonic()
+
+    def get_scores(self, seed, offset=0, limit=None):
+        with self._lock:
+            seed_index = self.index.get(seed)
+            if seed_index is None:
+                return []
+            end = None if limit is None else offset + limit
+            return seed_index.entries[offset:end]
+
+    def seeds(self):
+        with self._lock:
+            return list(self.index)
+
+    def count(self, seed):
+        with self._lock:
+            seed_index = self.index.get(seed)
+            return len(seed_index.keys) if seed_index else 0
+
+    def get_rank(self, seed, score, time_taken):
+        # the sorted key list doubles as an order-statistic index: rank is one bisect
+        with self._lock:
+            seed_index = self.index.get(seed)
+            if seed_index is None:
+                return 1
+            return 1 + bisect.bisect_left(seed_index.keys, (-score, time_taken))
+
+    def _start_compaction(self):
+        # called with the lock held: switch writers to a fresh journal, then
+        # snapshot a copy of the index without blocking further submissions
+        self._sync()
+        self._journal.close()
+        self.generation += 1
+        self._journal = open(self._journal_path(self.generation), "a", encoding="utf-8")
+        self._entries_since_compact = 0
+
+        scores = {seed: list(idx.entries) for seed, idx in self.index.items()}
+        worker = threading.Thread(target=self._write_snapshot, args=(scores, self.generation), daemon=True)
+        self._compacting = worker
+        worker.start()
+        return worker
+
+    def _write_snapshot(self, scores, gen):
+        tmp = self._snapshot_path() + ".tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"generation": gen, "scores": scores}, f)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self._snapshot_path())
+            for j_gen, path in self._journals():
+                if j_gen < gen:
+                    os.remove(path)
+        except OSError as e:
+            print(f"Compaction failed: {e}")
+        finally:
+            self._compacting = None
+
+    def compact(self):
+        # a background compaction already running only covers what came before it
+        while True:
+            with self._lock:
+                worker = self._compacting
+                if worker is None:
+                    worker = self._start_compaction()
+                    break
+            worker.join()
+        worker.join()
+
+    def close(self):
+        with self._lock:
+            worker = self._compacting
+        if worker is not None:
+            worker.join()
+        with self._lock:
+            if not self._journal.closed:
+                self._sync()
+                self._journal.close()
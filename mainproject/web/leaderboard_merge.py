@@ -0,0 +1,267 @@
+import argparse
+import heapq
+import json
+import os
+import tempfile
+
+READ_SIZE = 1 << 16
+# records sorted in memory before spilling a run to disk
+CHUNK = 50000
+# run files open at once; more runs are merged in several passes
+FAN_IN = 64
+
+_decoder = json.JSONDecoder()
+
+
+def _skip_ws(buf, pos):
+    while pos < len(buf) and buf[pos] in " \t\r\n":
+        pos += 1
+    return pos
+
+
+def iter_entries(f):
+    """Stream (seed, entry) from a leaderboard.json file object without loading it whole.
+
+    Only one seed key or one entry has to fit in the buffer at a time.
+    """
+    buf = ""
+    pos = 0
+    eof = False
+
+    def fill():
+        nonlocal buf, pos, eof
+        chunk = f.read(READ_SIZE)
+        if not chunk:
+            eof = True
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def peek():
+        nonlocal pos
+        while True:
+            pos = _skip_ws(buf, pos)
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                raise ValueError("Unexpected end of leaderboard file")
+            fill()
+
+    def expect(ch):
+        nonlocal pos
+        if peek() != ch:
+            raise ValueError(f"Expected {ch!r} at {buf[pos:pos + 20]!r}")
+        pos += 1
+
+    def value():
+        nonlocal pos
+        peek()
+        while True:
+            try:
+                obj, end = _decoder.raw_decode(buf, pos)
+                # a number or string cut off by the buffer edge may still parse; make sure it can't grow
+                if end < len(buf) or eof:
+                    pos = end
+                    return obj
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+            fill()
+
+    expect("{")
+    if peek() == "}":
+        return
+    while True:
+        seed = value()
+        expect(":")
+        expect("[")
+        if peek() != "]":
+            while True:
+                yield seed, value()
+                if peek() == "]":
+                    break
+                expect(",")
+        expect("]")
+        if peek() == "}":
+            return
+        expect(",")
+
+
+def _record_key(rec):
+    # leaderboard order
+    seed, entry = rec
+    return (seed, -entry["score"], entry["time"], entry["name"], entry["timestamp"])
+
+
+def _submission_key(rec):
+    # copies of one submission side by side, the best score and time first
+    seed, entry = rec
+    return (seed, entry["name"], entry["timestamp"], -entry["score"], entry["time"])
+
+
+def _write_run(records, tmp_dir):
+    fd, path = tempfile.mkstemp(suffix=".run", dir=tmp_dir)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        for seed, entry in records:
+            f.write(json.dumps([seed, entry]) + "\n")
+    return path
+
+
+def _spill(records, tmp_dir, key=_record_key):
+    records.sort(key=key)
+    return _write_run(records, tmp_dir)
+
+
+def _read_run(path):
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            seed, entry = json.loads(line)
+            yield seed, entry
+
+
+def spill_runs(records, tmp_dir, chunk=CHUNK, key=_record_key):
+    """Cut a stream of (seed, entry) into run files of at most `chunk` records sorted by key."""
+    runs = []
+    batch = []
+    for rec in records:
+        batch.append(rec)
+        if len(batch) >= chunk:
+            runs.append(_spill(batch, tmp_dir, key))
+            batch = []
+    if batch:
+        runs.append(_spill(batch, tmp_dir, key))
+    return runs
+
+
+def _read_sources(paths):
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            yield from iter_entries(f)
+
+
+def sorted_runs(paths, tmp_dir, chunk=CHUNK, key=_record_key):
+    """Split all sources into sorted run files of at most `chunk` records."""
+    return spill_runs(_read_sources(paths), tmp_dir, chunk, key)
+
+
+def _merge_runs(runs, key=_record_key):
+    return heapq.merge(*(_read_run(p) for p in runs), key=key)
+
+
+def reduce_runs(runs, tmp_dir, fan_in=FAN_IN, key=_record_key):
+    """Merge runs in groups of fan_in until at most fan_in are left, deleting the inputs."""
+    while len(runs) > fan_in:
+        merged = []
+        for i in range(0, len(runs), fan_in):
+            group = runs[i:i + fan_in]
+            merged.append(_write_run(_merge_runs(group, key), tmp_dir))
+            for path in group:
+                os.remove(path)
+        runs = merged
+    return runs
+
+
+def unique_submissions(runs):
+    """One (seed, entry) per (seed, name, timestamp) from runs sorted by _submission_key.
+
+    Copies of a submission are adjacent, so each record is only compared with
+    the previous one; the copy with the best score and time is kept.
+    """
+    prev = None
+    for seed, entry in _merge_runs(runs, _submission_key):
+        ident = (seed, entry["name"], entry["timestamp"])
+        if ident != prev:
+            prev = ident
+            yield seed, entry
+
+
+def merge_entries(runs, top=None):
+    """k-way merge of runs sorted by _record_key into leaderboard order, at most top per seed.
+
+    Opens every run at once; see reduce_runs.
+    """
+    seed_now = None
+    kept = 0
+    for seed, entry in _merge_runs(runs):
+        if seed != seed_now:
+            seed_now = seed
+            kept = 0
+        if top is not None and kept >= top:
+            continue
+        kept += 1
+        yield seed, entry
+
+
+def write_leaderboard(records, out):
+    """Write (seed, entry) grouped by seed as a leaderboard.json, one entry at a time."""
+    tmp = out + ".tmp"
+    seeds = entries = 0
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write("{")
+        seed_now = None
+        for seed, entry in records:
+            if seed != seed_now:
+                f.write("]," if seed_now is not None else "")
+                f.write(f"\n{json.dumps(seed)}: [")
+                seed_now = seed
+                seeds += 1
+            else:
+                f.write(", ")
+            f.write(json.dumps(entry))
+            entries += 1
+        f.write("]\n}\n" if seed_now is not None else "}\n")
+    os.replace(tmp, out)
+    return seeds, entries
+
+
+def merge_files(paths, out, top=None, chunk=CHUNK, fan_in=FAN_IN):
+    """Merge leaderboard.json files into one compacted file; returns (seeds, entries)."""
+    with tempfile.TemporaryDirectory(prefix="lb_merge_") as tmp_dir:
+        # pass 1 groups the copies of each submission and keeps one;
+        # pass 2 re-sorts the survivors into leaderboard order
+        runs = reduce_runs(sorted_runs(paths, tmp_dir, chunk, _submission_key), tmp_dir, fan_in, _submission_key)
+        unique = spill_runs(unique_submissions(runs), tmp_dir, chunk)
+        for path in runs:
+            os.remove(path)
+        runs = reduce_runs(unique, tmp_dir, fan_in)
+        return write_leaderboard(merge_entries(runs, top), out)
+
+
+def import_file(path, backend, batch=1000):
+    # stream a leaderboard.json into any LeaderboardBackend
+    count = 0
+    items = []
+    with open(path, "r", encoding="utf-8") as f:
+        for item in iter_entries(f):
+            items.append(item)
+            if len(items) >= batch:
+                backend.add_scores(items)
+                count += len(items)
+                items = []
+    if items:
+        backend.add_scores(items)
+        count += len(items)
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge leaderboard.json files into one global ranking")
+    parser.add_argument("out", help="merged leaderboard.json to write")
+    parser.add_argument("sources", nargs="+", help="leaderboard.json files from each kiosk")
+    parser.add_argument("--top", type=int, default=None, help="keep only the best N per seed")
+    parser.add_argument("--chunk", type=int, default=CHUNK, help="records per sorted run")
+    parser.add_argument("--fan-in", type=int, default=FAN_IN, help="run files merged at once")
+    parser.add_argument("--import-db", metavar="PATH", help="also load the result into a SQLite leaderboard")
+    args = parser.parse_args()
+
+    seeds, entries = merge_files(args.sources, args.out, args.top, args.chunk, args.fan_in)
+    print(f"Merged {len(args.sources)} files into {args.out}: {entries} scores over {seeds} seeds")
+
+    if args.import_db:
+        from web.leaderboard_sqlite import SqliteBackend
+        backend = SqliteBackend(args.import_db)
+        print(f"Imported {import_file(args.out, backend)} scores into {args.import_db}")
+        backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+import argparse
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs, unquote
+
+from web.leaderboard import DB_FILE
+
+# largest POST body accepted, a few thousand entries
+MAX_BODY = 1 << 20
+MAX_REPLAY = 4096
+# most rows one GET returns; clients page through anything longer
+MAX_PAGE = 1000
+# submission ids remembered for dropping retried POSTs; retries land within seconds
+RECENT_IDS = 100000
+
+
+class LeaderboardHandler(BaseHTTPRequestHandler):
+    """JSON API over a LeaderboardBackend.
+
+    POST /scores            {"scores": [{"seed": ..., "sid", "name", "score", "time", "timestamp"}, ...]}
+    GET  /scores/<seed>     ?offset=&limit=  -> {"rows": [...], "total": n}, at most MAX_PAGE rows
+    GET  /rank/<seed>       ?score=&time=    -> {"rank": r, "total": n}
+    GET  /seeds                              -> {"seeds": [...]}
+    """
+
+    # HTTP/1.1 so clients can keep one connection open across requests
+    protocol_version = "HTTP/1.1"
+    # headers and body go out as separate writes; don't let Nagle hold the body back
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_OPTIONS(self):
+        self.send_response(204)
+        self.send_header("Access-Control-Allow-Origin", "*")
+        self.send_header("Access-Control-Allow-Methods", "GET, POST")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/scores":
+            return self._send(404, {"error": "not found"})
+        # any bad length leaves the body unread, so the connection can't be reused
+        raw_length = self.headers.get("Content-Length")
+        if raw_length is None:
+            self.close_connection = True
+            return self._send(411, {"error": "length required"})
+        try:
+            length = int(raw_length)
+        except ValueError:
+            length = -1
+        if length < 0:
+            self.close_connection = True
+            return self._send(400, {"error": "bad length"})
+        if length > MAX_BODY:
+            self.close_connection = True
+            return self._send(413, {"error": "body too large"})
+        try:
+            items = []
+            for rec in json.loads(self.rfile.read(length))["scores"]:
+                entry = {"name": str(rec["name"])[:32], "score": float(rec["score"]),
+                         "time": float(rec["time"]), "timestamp": int(rec["timestamp"])}
+                if rec.get("replay"):
+                    entry["replay"] = str(rec["replay"])
+                    if len(entry["replay"]) > MAX_REPLAY:
+                        raise ValueError("replay too long")
+                items.append((str(rec["seed"]), entry, str(rec.get("sid") or "")))
+        except (ValueError, KeyError, TypeError):
+            return self._send(400, {"error": "bad scores"})
+        self._send(200, {"added": self.server.add_once(items)})
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == "/seeds":
+            try:
+                return self._send(200, {"seeds": self.server.backend.seeds()})
+            except NotImplementedError as e:
+                return self._send(501, {"error": str(e)})
+        parts = url.path.strip("/").split("/")
+        if len(parts) != 2:
+            return self._send(404, {"error": "not found"})
+        route, seed = parts[0], unquote(parts[1])
+        query = {k: v[0] for k, v in parse_qs(url.query).items()}
+        backend = self.server.backend
+        try:
+            if route == "scores":
+                offset = int(query.get("offset", 0))
+                limit = int(query.get("limit", MAX_PAGE))
+                if offset < 0 or limit < 0:
+                    raise ValueError("negative offset or limit")
+                limit = min(limit, MAX_PAGE)
+                return self._send(200, {"rows": backend.get_scores(seed, offset, limit),
+                                        "total": backend.count(seed)})
+            if route == "rank":
+                rank = backend.get_rank(seed, float(query["score"]), float(query["time"]))
+                return self._send(200, {"rank": rank, "total": backend.count(seed)})
+        except (ValueError, KeyError):
+            return self._send(400, {"error": "bad query"})
+        self._send(404, {"error": "not found"})
+
+
+class LeaderboardServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, backend):
+        super().__init__(address, LeaderboardHandler)
+        self.backend = backend
+        self._recent = OrderedDict()
+        self._recent_lock = threading.Lock()
+
+    def add_once(self, items):
+        """Store (seed, entry, sid) items whose sid wasn't seen recently; returns how many were new.
+
+        Items without a sid are always stored.
+        """
+        with self._recent_lock:
+            fresh = [(seed, entry) for seed, entry, sid in items if not sid or sid not in self._recent]
+            self.backend.add_scores(fresh)
+            for _, _, sid in items:
+                if sid:
+                    self._recent[sid] = None
+                    self._recent.move_to_end(sid)
+            while len(self._recent) > RECENT_IDS:
+                self._recent.popitem(last=False)
+        return len(fresh)
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start_local_server(backend=None, host="127.0.0.1", port=0):
+    """In-process stand-in: serve on a free port from a background thread.
+
+    Without a backend the scores go to a throwaway SQLite file.
+    """
+    if backend is None:
+        from web.leaderboard_sqlite import SqliteBackend
+        backend = SqliteBackend(os.path.join(tempfile.mkdtemp(prefix="leaderboard_"), DB_FILE))
+    server = LeaderboardServer((host, port), backend)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def load_test(url, total=20000, clients=8, batch=50):
+    """Submit total scores from `clients` threads, `batch` per request; returns submissions/sec."""
+    from web.leaderboard import make_entry
+    from web.leaderboard_http import HttpBackend
+
+    def worker(n, c):
+        backend = HttpBackend(url, cache_ttl=0)
+        items = [(f"load{c % 4}", make_entry(f"bot{c}", i % 100, i / 10)) for i in range(n)]
+        for i in range(0, n, batch):
+            backend.add_scores(items[i:i + batch])
+        backend.get_scores(f"load{c % 4}", 0, 8)
+        backend.close()
+
+    per = total // clients
+    threads = [threading.Thread(target=worker, args=(per, c)) for c in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return per * clients / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the leaderboard over HTTP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--db", default=DB_FILE)
+    parser.add_argument("--bench", type=int, metavar="N",
+                        help="load-test a throwaway in-process server with N submissions and exit")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=50)
+    args = parser.parse_args()
+
+    if args.bench:
+        server = start_local_server()
+        rate = load_test(server.url, args.bench, args.clients, args.batch)
+        print(f"{args.bench} submissions, {args.clients} clients, batch {args.batch}: {rate:.0f}/s")
+        server.shutdown()
+        return
+
+    from web.leaderboard_sqlite import SqliteBackend
+    server = LeaderboardServer((args.host, args.port), SqliteBackend(args.db))
+    print(f"Leaderboard on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.backend.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+import bisect
+import hashlib
+import json
+
+from web.leaderboard import LeaderboardBackend, SeedIndex, STORAGE_KEY
+
+KEY_PREFIX = STORAGE_KEY + ":"
+MANIFEST_KEY = KEY_PREFIX + "manifest"
+LAYOUT_VERSION = 1
+# entries kept per seed; anything that falls below it can never show on the board
+TOP_N = 100
+
+
+def shard_key(seed):
+    return KEY_PREFIX + hashlib.sha1(seed.encode()).hexdigest()[:12]
+
+
+class ShardedBackend(LeaderboardBackend):
+    """One localStorage key per seed hash instead of a single blob.
+
+    A shard holds {seed: {"total": n, "entries": [...]}}, the total being
+    every score the seed ever had, so count() needs no scan. The manifest
+    only records the layout version. Shards are parsed on first use and
+    kept in memory; a submission re-serializes only the shards it touched.
+    """
+
+    def __init__(self, storage=None, top_n=TOP_N):
+        if storage is None:
+            import js
+            storage = js.window.localStorage
+        self.storage = storage
+        self.top_n = top_n
+        self._shards = {}   # shard key -> {seed: SeedIndex}
+
+        raw = storage.getItem(MANIFEST_KEY)
+        manifest = json.loads(raw) if raw else {}
+        if manifest.get("version") != LAYOUT_VERSION:
+            self._migrate()
+            storage.setItem(MANIFEST_KEY, json.dumps({"version": LAYOUT_VERSION}))
+
+    def _migrate(self):
+        # original layout: every seed's scores in one STORAGE_KEY blob
+        raw = self.storage.getItem(STORAGE_KEY)
+        old = json.loads(raw) if raw else {}
+        self.add_scores([(seed, entry) for seed, entries in old.items() for entry in entries])
+        if raw:
+            self.storage.removeItem(STORAGE_KEY)
+
+    def _shard(self, key):
+        shard = self._shards.get(key)
+        if shard is None:
+            raw = self.storage.getItem(key)
+            shard = {seed: SeedIndex.from_sorted(rec["entries"], rec["total"])
+                     for seed, rec in (json.loads(raw) if raw else {}).items()}
+            self._shards[key] = shard
+        return shard
+
+    def _save(self, key):
+        data = {seed: {"total": idx.total, "entries": idx.entries} for seed, idx in self._shards[key].items()}
+        self.storage.setItem(key, json.dumps(data))
+
+    def _index(self, seed):
+        return self._shard(shard_key(seed)).get(seed)
+
+    def add_scores(self, items):
+        touched = set()
+        for seed, entry in items:
+            key = shard_key(seed)
+            shard = self._shard(key)
+            idx = shard.get(seed)
+            if idx is None:
+                idx = shard[seed] = SeedIndex()
+            idx.insert(entry)
+            if len(idx.entries) > self.top_n:
+                del idx.entries[self.top_n:]
+                del idx.keys[self.top_n:]
+            touched.add(key)
+        for key in touched:
+            self._save(key)
+
+    def seeds(self):
+        # shards aren't listed anywhere; walk the storage keys (offline tools only)
+        keys = [self.storage.key(i) for i in range(self.storage.length)]
+        out = []
+        for key in keys:
+            if key.startswith(KEY_PREFIX) and key != MANIFEST_KEY:
+                out.extend(self._shard(key))
+        return out
+
+    def get_scores(self, seed, offset=0, limit=None):
+        idx = self._index(seed)
+        if idx is None:
+            return []
+        end = None if limit is None else offset + limit
+        return idx.entries[offset:end]
+
+    def count(self, seed):
+        idx = self._index(seed)
+        return idx.total if idx else 0
+
+    def get_rank(self, seed, score, time_taken):
+        # exact within the kept top N; past it, the first rank below the board
+        idx = self._index(seed)
+        if idx is None:
+            return 1
+        return 1 + bisect.bisect_left(idx.keys, (-score, time_taken))
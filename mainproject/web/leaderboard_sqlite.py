@@ -0,0 +1,169 @@
+import bisect
+import json
+import os
+import sqlite3
+import queue
+import threading
+from contextlib import contextmanager
+
+from web.leaderboard import LeaderboardBackend
+
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS scores (
+        id INTEGER PRIMARY KEY,
+        seed TEXT NOT NULL,
+        name TEXT NOT NULL,
+        score REAL NOT NULL,
+        time REAL NOT NULL,
+        timestamp INTEGER NOT NULL,
+        replay TEXT
+    )""",
+    # covers the WHERE and ORDER BY of every read, so top-N is an index range scan
+    "CREATE INDEX IF NOT EXISTS idx_scores_rank ON scores (seed, score DESC, time ASC)",
+]
+
+# constant SQL text so sqlite3's per-connection statement cache reuses the prepared statements
+SQL_INSERT = "INSERT INTO scores (seed, name, score, time, timestamp, replay) VALUES (?, ?, ?, ?, ?, ?)"
+# ties fall back to id, which the index already orders by, so pages never overlap
+SQL_PAGE = ("SELECT name, score, time, timestamp, replay FROM scores WHERE seed = ? "
+            "ORDER BY score DESC, time ASC, id ASC LIMIT ? OFFSET ?")
+# keyset page: an index seek to the first row at or after a (score, time), then a short range scan
+SQL_PAGE_FROM = ("SELECT name, score, time, timestamp, replay FROM scores WHERE seed = ? "
+                 "AND score <= ? AND (score < ? OR time >= ?) "
+                 "ORDER BY score DESC, time ASC, id ASC LIMIT ? OFFSET ?")
+SQL_KEYS = "SELECT score, time FROM scores WHERE seed = ? ORDER BY score DESC, time ASC"
+SQL_COUNT_ALL = "SELECT COUNT(*) FROM scores"
+SQL_SEEDS = "SELECT DISTINCT seed FROM scores"
+# connections shared by all threads; callers beyond this wait for a free one
+POOL_SIZE = 4
+
+
+class SqliteBackend(LeaderboardBackend):
+    """Scores in SQLite, plus an in-memory rank index per seed.
+
+    The index is the seed's (-score, time) keys in order, loaded by one
+    index-only scan the first time the seed is ranked or paged and kept up to
+    date by add_scores. Ranks and counts are a bisect, and a page at any
+    offset is a keyset seek instead of an OFFSET walk. It assumes this backend
+    is the only writer while it's open.
+    """
+
+    def __init__(self, path, import_json=None, pool_size=POOL_SIZE):
+        self.path = path
+        self._keys = {}     # seed -> sorted [(-score, time)]
+        self._keys_lock = threading.Lock()
+        # long-lived connections handed out per call instead of connect() per call;
+        # bounded, so a threaded server doesn't open one per client thread
+        self._pool = queue.LifoQueue()
+        self._all = []
+        self._lock = threading.Lock()
+        self.pool_size = pool_size
+
+        with self._conn() as conn:
+            with conn:
+                for stmt in SCHEMA:
+                    conn.execute(stmt)
+                # databases from before replays were recorded
+                if "replay" not in [row[1] for row in conn.execute("PRAGMA table_info(scores)")]:
+                    conn.execute("ALTER TABLE scores ADD COLUMN replay TEXT")
+            empty = conn.execute(SQL_COUNT_ALL).fetchone()[0] == 0
+
+        if import_json and os.path.exists(import_json) and empty:
+            self._import_json(import_json)
+
+    @contextmanager
+    def _conn(self):
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                grow = len(self._all) < self.pool_size
+                if grow:
+                    conn = sqlite3.connect(self.path, cached_statements=64, check_same_thread=False)
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.execute("PRAGMA synchronous=NORMAL")
+                    self._all.append(conn)
+            if not grow:
+                conn = self._pool.get()
+        try:
+            yield conn
+        finally:
+            self._pool.put(conn)
+
+    def _import_json(self, path):
+        try:
+            with open(path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Leaderboard import failed: {e}")
+            return
+        self.add_scores((seed, entry) for seed, entries in data.items() for entry in entries)
+
+    def add_scores(self, items):
+        rows = [(seed, e["name"], e["score"], e["time"], e["timestamp"], e.get("replay")) for seed, e in items]
+        # commit and index update under one lock, so a concurrent load sees both or neither
+        with self._keys_lock:
+            with self._conn() as conn:
+                with conn:
+                    conn.executemany(SQL_INSERT, rows)
+            for seed, _, score, t, _, _ in rows:
+                keys = self._keys.get(seed)
+                if keys is not None:
+                    bisect.insort(keys, (-score, t))
+
+    def _index(self, seed):
+        with self._keys_lock:
+            keys = self._keys.get(seed)
+            if keys is None:
+                with self._conn() as conn:
+                    keys = [(-score, t) for score, t in conn.execute(SQL_KEYS, (seed,))]
+                self._keys[seed] = keys
+            return keys
+
+    def get_scores(self, seed, offset=0, limit=None):
+        # LIMIT -1 means no limit in SQLite
+        limit = -1 if limit is None else limit
+        if offset == 0:
+            query, args = SQL_PAGE, (seed, limit, 0)
+        else:
+            keys = self._index(seed)
+            with self._keys_lock:
+                if offset >= len(keys):
+                    return []
+                key = keys[offset]
+                # rows that tie with the first one but come before the page
+                skip = offset - bisect.bisect_left(keys, key)
+            score, t = -key[0], key[1]
+            query, args = SQL_PAGE_FROM, (seed, score, score, t, limit, skip)
+        with self._conn() as conn:
+            rows = conn.execute(query, args).fetchall()
+        out = []
+        for n, s, t, ts, replay in rows:
+            entry = {"name": n, "score": s, "time": t, "timestamp": ts}
+            if replay is not None:
+                entry["replay"] = replay
+            out.append(entry)
+        return out
+
+    def seeds(self):
+        with self._conn() as conn:
+            return [row[0] for row in conn.execute(SQL_SEEDS)]
+
+    def count(self, seed):
+        keys = self._index(seed)
+        with self._keys_lock:
+            return len(keys)
+
+    def get_rank(self, seed, score, time_taken):
+        keys = self._index(seed)
+        with self._keys_lock:
+            return 1 + bisect.bisect_left(keys, (-score, time_taken))
+
+    def close(self):
+        with self._lock:
+            conns, self._all = self._all, []
+        for conn in conns:
+            conn.close()
+        self._pool = queue.LifoQueue()
+        with self._keys_lock:
+            self._keys = {}
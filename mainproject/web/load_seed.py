@@ -1,6 +1,4 @@
 import pygame
-import base64
-import re
 import sys
 
 
@@ -8,17 +6,21 @@ IS_WEB = sys.platform == "emscripten"
 if IS_WEB:
     from platform import window
 
+from web.dirty import repaint
+from web.fonts import get_font
+from web.text_cache import render_text
 from web.state import GameState
-from src.core.maze import Maze, CellType
+import web.maze_store as maze_store
 
 class SeedLoadScreen:
     def __init__(self, game):
         self.game = game
-        self.font = pygame.font.SysFont("Arial", 26)
+        self.font = get_font("Arial", 26)
         self.seed_text = ""
         self.cursor_visible = True
         self.cursor_timer = 0
         self.message = ""
+        self.painted = None
 
     def handle_events(self):
         for e in pygame.event.get():
@@ -56,70 +58,15 @@ class SeedLoadScreen:
                 if e.unicode.isprintable() and not (e.mod & pygame.KMOD_CTRL):
                     self.seed_text += e.unicode
 
-    def rle_decode(self, s):
-        result = []
-        for count, char in re.findall(r"(\d+)(.)", s):
-            result.extend(char * int(count))
-        return result
-
     def try_load(self):
         self.message = "Loading..."
         try:
             raw = self.seed_text.strip()
             if not raw: return
-            parts = raw.split("|")
-
-            version = parts[0]
-            k_val = 0
-            
-            if version == "MS2":
-                if len(parts) != 4: raise ValueError("Invalid MS2 format")
-                size_str = parts[1]
-                k_val = int(parts[2])
-                payload = parts[3]
-            elif version == "MS1":
-                if len(parts) != 3: raise ValueError("Invalid MS1 format")
-                size_str = parts[1]
-                k_val = 3
-                payload = parts[2]
-            else:
-                raise ValueError("Unknown Version")
-
-            W, H = map(int, size_str.split("x"))
-            pad = len(payload) % 4
-            if pad: payload += '=' * (4 - pad)
-            decoded = base64.urlsafe_b64decode(payload).decode()
-            flat = self.rle_decode(decoded)
-            
-            if len(flat) != W * H:
-                raise ValueError(f"Size mismatch: {len(flat)} vs {W*H}")
-
-            maze = Maze(W, H)
-            portal_map = {}
-            idx = 0
-            for j in range(H):
-                for i in range(W):
-                    ch = flat[idx]
-                    idx += 1
-                    cell = maze.grid[j][i] 
-                    if ch == "#": cell.type = CellType.WALL
-                    elif ch == ".": cell.type = CellType.EMPTY
-                    elif ch == "S": 
-                        cell.type = CellType.START
-                        maze.start = (j, i)
-                    elif ch == "G": 
-                        cell.type = CellType.GOAL
-                        maze.goal = (j, i)
-                    elif "a" <= ch <= "j":
-                        pid = ord(ch) - ord("a")
-                        cell.type = CellType.PORTAL
-                        cell.portal_id = pid
-                        portal_map.setdefault(pid, []).append((j, i))
-
-            for pid, pts in portal_map.items():
-                if len(pts) == 2: maze.portals[pid] = (pts[0], pts[1])
-
-            self.game.switch(GameState.PLAY, custom_maze=maze, fixed_k=k_val)
+
+            # short codes resolve through the store; full seeds are stored on the way in
+            maze, k_val, _, code = maze_store.resolve(raw)
+            self.game.switch(GameState.PLAY, custom_maze=maze, fixed_k=k_val, seed_code=code)
 
         except Exception as e:
             print(f"Load Error: {e}")
@@ -132,8 +79,21 @@ class SeedLoadScreen:
             self.cursor_timer = 0
 
     def draw(self):
+        # the input line and the message below it are all that change
+        state = (self.seed_text, self.cursor_visible, self.message)
+        if self.game.full_redraw:
+            self.painted = state
+            self._paint()
+            return None
+        if state == self.painted:
+            return []
+        self.painted = state
+        w = self.game.screen.get_width()
+        return repaint(self.game.screen, [(0, 248, w, 104)], self._paint)
+
+    def _paint(self):
         self.game.screen.fill((20, 20, 20))
-        t = self.font.render("Paste Seed (Ctrl+V):", True, (255, 255, 255))
+        t = render_text(self.font, "Paste Seed (Ctrl+V):", (255, 255, 255))
         self.game.screen.blit(t, (150, 200))
 
         pygame.draw.rect(self.game.screen, (255, 255, 255), (120, 250, 560, 40), 2)
@@ -142,8 +102,8 @@ class SeedLoadScreen:
         self.game.screen.blit(txt, (130, 258))
 
         if self.message:
-            m = self.font.render(self.message, True, (255, 100, 100))
+            m = render_text(self.font, self.message, (255, 100, 100))
             self.game.screen.blit(m, (150, 310))
 
-        h = self.font.render("ENTER to Load, ESC to Return", True, (150, 150, 150))
+        h = render_text(self.font, "ENTER to Load, ESC to Return", (150, 150, 150))
         self.game.screen.blit(h, (150, 360))
\ No newline at end of file
@@ -17,8 +17,11 @@ async def main():
     while True:
         game.handle_events()
         game.update()
-        game.draw()
-        pygame.display.flip()
+        rects = game.draw()
+        if rects is None:
+            pygame.display.flip()
+        elif rects:
+            pygame.display.update(rects)
         clock.tick(60)
         await asyncio.sleep(0)
 
@@ -0,0 +1,190 @@
+import json
+import os
+import time
+
+from src.tools.seed_codec import SHORT_VERSION, GEN_VERSION, decode, encode_maze, maze_id, short_code
+
+STORE_DIR = "maze_store"
+KEY_PREFIX = "maze_store:"
+# web: {id: last use} for every stored maze, so eviction never scans localStorage
+INDEX_KEY = KEY_PREFIX + "index"
+# mazes kept; the least recently played go first, and sooner if localStorage runs out of quota.
+# mazes that still have leaderboard scores are never dropped, since their MSH codes must resolve
+MAX_MAZES = 200
+
+
+def _local_storage():
+    try:
+        import js
+        return js.window.localStorage
+    except ImportError:
+        return None
+
+
+def _load_index(storage):
+    raw = storage.getItem(INDEX_KEY)
+    if raw:
+        try:
+            index = json.loads(raw)
+            if isinstance(index, dict):
+                return index
+        except ValueError:
+            pass
+        print("Store index corrupt, rebuilding")
+    # stores written before the index existed (or with a broken one): adopt their keys as oldest
+    keys = [storage.key(i) for i in range(storage.length)]
+    return {k[len(KEY_PREFIX):]: 0 for k in keys if k.startswith(KEY_PREFIX) and k != INDEX_KEY}
+
+
+def _open():
+    """(localStorage, its index) on web, (None, None) on desktop; one index load per call."""
+    storage = _local_storage()
+    return storage, (_load_index(storage) if storage is not None else None)
+
+
+def _save(storage, index):
+    if storage is None:
+        return
+    try:
+        storage.setItem(INDEX_KEY, json.dumps(index))
+    except Exception as e:
+        print(f"Store index failed: {e}")
+
+
+def _last_used(index):
+    """{id: last use time} of everything stored."""
+    if index is not None:
+        return index
+    try:
+        names = os.listdir(STORE_DIR)
+    except OSError:
+        return {}
+    out = {}
+    for name in names:
+        try:
+            out[name] = os.path.getmtime(os.path.join(STORE_DIR, name))
+        except OSError:
+            pass
+    return out
+
+
+def _touch(index, mid):
+    if index is not None:
+        index[mid] = time.time()
+        return
+    try:
+        os.utime(os.path.join(STORE_DIR, mid))
+    except OSError:
+        pass
+
+
+def _remove(storage, index, mid):
+    if storage is not None:
+        storage.removeItem(KEY_PREFIX + mid)
+        index.pop(mid, None)
+        return
+    try:
+        os.remove(os.path.join(STORE_DIR, mid))
+    except OSError:
+        pass
+
+
+def _has_scores(mid):
+    # leaderboards are keyed by maze id; when the backend can't answer, keep the maze
+    from web.leaderboard import get_backend
+    try:
+        return get_backend().count(mid) > 0
+    except Exception:
+        return True
+
+
+def _evict(storage, index, keep, limit=None):
+    """Drop least recently used mazes (never `keep`, never one with scores) until at most
+    `limit` remain; returns how many went."""
+    limit = MAX_MAZES if limit is None else limit
+    used = _last_used(index)
+    excess = len(used) - limit
+    removed = 0
+    for _, mid in sorted((t, mid) for mid, t in used.items() if mid != keep):
+        if removed >= excess:
+            break
+        if _has_scores(mid):
+            continue
+        _remove(storage, index, mid)
+        removed += 1
+    return removed
+
+
+def _read(storage, mid):
+    if storage is not None:
+        return storage.getItem(KEY_PREFIX + mid)
+    try:
+        with open(os.path.join(STORE_DIR, mid), "r") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def _write(storage, index, mid, code):
+    if storage is not None:
+        while True:
+            try:
+                storage.setItem(KEY_PREFIX + mid, code)
+                break
+            except Exception as e:
+                # quota exceeded: make room by dropping the oldest maze and try again
+                if not _evict(storage, index, mid, len(index) - 1):
+                    print(f"Store failed: {e}")
+                    return
+        _touch(index, mid)
+    else:
+        try:
+            os.makedirs(STORE_DIR, exist_ok=True)
+            with open(os.path.join(STORE_DIR, mid), "w") as f:
+                f.write(code)
+        except OSError as e:
+            print(f"Store failed: {e}")
+            return
+    _evict(storage, index, mid)
+
+
+def put(maze, K, code=None):
+    """Store the maze under its content hash and return the id.
+
+    code is kept when given (an MS3 code is far shorter than the grid), otherwise
+    the maze is encoded as MS4. Publishing the same grid twice writes nothing new,
+    it only marks the maze as recently used.
+    """
+    storage, index = _open()
+    mid = maze_id(maze, K)
+    if _read(storage, mid) is None:
+        _write(storage, index, mid, code or encode_maze(maze, K))
+    else:
+        _touch(index, mid)
+    _save(storage, index)
+    return mid
+
+
+def get(mid):
+    return _read(_local_storage(), mid)
+
+
+def resolve(text):
+    """(maze, K, id, full code) for a short code or any full seed; full seeds get stored."""
+    text = text.strip()
+    parts = text.split("|")
+    if parts[0] == SHORT_VERSION:
+        if len(parts) != 2: raise ValueError("Invalid short code")
+        storage, index = _open()
+        code = _read(storage, parts[1])
+        if code is None:
+            raise ValueError(f"Unknown maze {parts[1]}")
+        maze, K = decode(code)
+        _touch(index, parts[1])
+        _save(storage, index)
+        return maze, K, parts[1], code
+
+    maze, K = decode(text)
+    code = text if parts[0] == GEN_VERSION else None
+    mid = put(maze, K, code)
+    return maze, K, mid, _read(_local_storage(), mid) or text
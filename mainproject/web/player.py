@@ -1,4 +1,5 @@
 from src.core.maze import CellType
+from src.tools.replay import ReplayRecorder
 
 
 class Player:
@@ -10,6 +11,8 @@ class Player:
 
 
         self.path = [(self.x, self.y)]
+        # only actions that took effect, so a replay is also a legality proof
+        self.replay = ReplayRecorder()
 
 
     def try_move(self, dx, dy, maze):
@@ -25,6 +28,7 @@ class Player:
         self.x, self.y = nx, ny
         self.steps += 1
         self.path.append((self.x, self.y))  
+        self.replay.move(dx, dy)
 
 
     def break_wall(self, dx, dy, maze):
@@ -36,12 +40,14 @@ class Player:
             return
 
         if maze.grid[nx][ny].type == CellType.WALL:
-            maze.grid[nx][ny].type = CellType.EMPTY
+            maze.set_cell(nx, ny, CellType.EMPTY)
             self.breaks_left -= 1
+            self.replay.break_wall(dx, dy)
 
 
     def use_portal(self, maze):
         if maze.is_portal(self.x, self.y):
             self.x, self.y = maze.exit_portal(self.x, self.y)
             self.steps += 1
-            self.path.append((self.x, self.y)) 
+            self.path.append((self.x, self.y))
+            self.replay.portal() 
@@ -1,43 +1,37 @@
 import pygame
 import math
-import os
+from collections import OrderedDict
 from src.core.maze import CellType
+from web.assets import load_image
+from web.fonts import get_font
 
 CELL = 32
 
 _sprites = {}
 _animation_frame = 0
 
-def get_asset_path(filename):
-
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    return os.path.join(project_root, 'assets', filename)
+# the portal pulse is a sine, so one period sampled at PORTAL_PHASES points covers every frame
+PORTAL_PHASES = 32
+PULSE_SPEED = 0.1
+_portal_atlas = {}
+
+SPRITE_FILES = {
+    'grass': 'grass.png',
+    'wall':  'wall.png',
+    'cat':   'cat.png',
+    'fish':  'fish.png'
+}
+SPRITE_FALLBACK = {
+    'grass': (34, 139, 34),
+    'wall': (70, 70, 70),
+    'cat': (255, 165, 0),
+    'fish': (0, 0, 255),
+}
 
 def load_sprites():
-
-    assets = {
-        'grass': 'grass.png',
-        'wall':  'wall.png',
-        'cat':   'cat.png',
-        'fish':  'fish.png'
-    }
-
-    for key, filename in assets.items():
-        path = get_asset_path(filename)
-        try:
-            image = pygame.image.load(path).convert_alpha()
-
-            _sprites[key] = pygame.transform.scale(image, (CELL, CELL))
-        except (FileNotFoundError, pygame.error) as e:
-            #don't do no shit
-
-            fallback = pygame.Surface((CELL, CELL))
-            if key == 'grass': fallback.fill((34, 139, 34))
-            elif key == 'wall': fallback.fill((70, 70, 70))
-            elif key == 'cat': fallback.fill((255, 165, 0))
-            elif key == 'fish': fallback.fill((0, 0, 255))
-            _sprites[key] = fallback
+    # decoded and scaled once by the asset manager, usually already preloaded
+    for key, filename in SPRITE_FILES.items():
+        _sprites[key] = load_image(filename, (CELL, CELL), alpha=True, fallback=SPRITE_FALLBACK[key])
 
 
 
@@ -50,14 +44,14 @@ PORTAL_COLORS = [
     (0, 255, 128),   
 ]
 
-def _generate_portal(portal_id, frame):
+def _generate_portal(portal_id, angle, label):
 
     portal = pygame.Surface((CELL, CELL), pygame.SRCALPHA)
     color = PORTAL_COLORS[portal_id % len(PORTAL_COLORS)]
     center = CELL // 2
     
 
-    pulse = math.sin(frame * 0.1) * 0.2 + 0.8
+    pulse = math.sin(angle) * 0.2 + 0.8
     radius = int((CELL // 2 - 2) * pulse)
     
 
@@ -74,13 +68,42 @@ def _generate_portal(portal_id, frame):
     pygame.draw.circle(portal, inner_color, (center, center), inner_radius)
     
 
-    font = pygame.font.SysFont("Arial", CELL // 2, bold=True)
-    text = font.render(str(portal_id), True, (255, 255, 255))
-    text_rect = text.get_rect(center=(center, center))
-    portal.blit(text, text_rect)
+    portal.blit(label, label.get_rect(center=(center, center)))
     
     return portal
 
+def _build_portal_frames(portal_id):
+
+    label = get_font("Arial", CELL // 2, bold=True).render(str(portal_id), True, (255, 255, 255))
+
+    frames = []
+    for phase in range(PORTAL_PHASES):
+        surf = _generate_portal(portal_id, phase * 2 * math.pi / PORTAL_PHASES, label)
+        # display-format copies blit fastest; headless tools have no display to match
+        frames.append(surf.convert_alpha() if pygame.display.get_surface() else surf)
+    return frames
+
+def portal_phase(frame):
+
+    return int(frame * PULSE_SPEED / (2 * math.pi) * PORTAL_PHASES) % PORTAL_PHASES
+
+def _portal_frames(portal_id, size):
+
+    frames = _portal_atlas.get((portal_id, size))
+    if frames is None:
+        if size == CELL:
+            frames = _build_portal_frames(portal_id)
+        else:
+            frames = [pygame.transform.smoothscale(f, (size, size)) for f in _portal_frames(portal_id, CELL)]
+        _portal_atlas[(portal_id, size)] = frames
+    return frames
+
+def portal_surface(portal_id, frame=None, size=CELL):
+
+    if frame is None:
+        frame = _animation_frame
+    return _portal_frames(portal_id, size)[portal_phase(frame)]
+
 def get_portal_color(pid):
 
     return PORTAL_COLORS[pid % len(PORTAL_COLORS)]
@@ -94,65 +117,225 @@ def update_animation():
 
 
 
-def draw_maze(screen, maze, font):
+LAYER_BG = (20, 25, 40)
+GRID_LINE = (255, 255, 255, 10)
 
-    global _animation_frame
-    
+# tile sizes the play view can zoom between
+ZOOM_LEVELS = (8, 16, 32)
+# layers are cached in square chunks of CHUNK cells, up to CACHE_PIXELS per layer
+# (96 full-zoom chunks), so zoomed-out views can keep proportionally more of them
+CHUNK = 8
+CACHE_PIXELS = 96 * (CHUNK * CELL) ** 2
 
-    if not _sprites:
-        load_sprites()
-    
-    for i in range(maze.rows):
-        for j in range(maze.cols):
-            cell = maze.grid[i][j]
-            x = j * CELL
-            y = i * CELL
-            
-
-            screen.blit(_sprites['grass'], (x, y))
-            
-
-            if cell.type == CellType.WALL:
-                screen.blit(_sprites['wall'], (x, y))
-            
-            elif cell.type == CellType.PORTAL:
-                portal_tile = _generate_portal(cell.portal_id, _animation_frame)
-                screen.blit(portal_tile, (x, y))
-            
-            elif cell.type == CellType.GOAL:
-                screen.blit(_sprites['fish'], (x, y))
-
-def draw_player(screen, player):
+_scaled = {}
+
+def sprite(key, size=CELL):
 
-    global _animation_frame
-    
     if not _sprites:
         load_sprites()
+    if size == CELL:
+        return _sprites[key]
+    surf = _scaled.get((key, size))
+    if surf is None:
+        src = _sprites[key]
+        scale = pygame.transform.smoothscale if src.get_bitsize() in (24, 32) else pygame.transform.scale
+        surf = _scaled[(key, size)] = scale(src, (size, size))
+    return surf
+
+class Camera:
+    """Top-left pixel of the view over a maze drawn at `tile` px per cell."""
+
+    def __init__(self, maze, view_w, view_h, tile=CELL):
+        self.maze = maze
+        self.view_w = view_w
+        self.view_h = view_h
+        self.tile = tile
+        self.x = 0
+        self.y = 0
+
+    def follow(self, row, col):
+        # centre on the cell, clamped so the view never leaves the maze
+        t = self.tile
+        self.x = max(0, min(col * t + t // 2 - self.view_w // 2, self.maze.cols * t - self.view_w))
+        self.y = max(0, min(row * t + t // 2 - self.view_h // 2, self.maze.rows * t - self.view_h))
+
+    def visible_cells(self):
+        """(row0, row1, col0, col1), end-exclusive, of every cell at least partly in view."""
+        t = self.tile
+        return (self.y // t, min(self.maze.rows, (self.y + self.view_h + t - 1) // t),
+                self.x // t, min(self.maze.cols, (self.x + self.view_w + t - 1) // t))
+
+    def visible_chunks(self):
+        r0, r1, c0, c1 = self.visible_cells()
+        return [(cr, cc) for cr in range(r0 // CHUNK, (r1 - 1) // CHUNK + 1)
+                for cc in range(c0 // CHUNK, (c1 - 1) // CHUNK + 1)]
+
+    def to_view(self, row, col):
+        return col * self.tile - self.x, row * self.tile - self.y
+
+class _ChunkCache:
+
+    def __init__(self):
+        self.chunks = OrderedDict()   # (tile, chunk row, chunk col) -> Surface
+        self.pixels = 0
+
+    def get(self, key, build):
+        surf = self.chunks.get(key)
+        if surf is None:
+            surf = self.chunks[key] = build(*key)
+            self.pixels += surf.get_width() * surf.get_height()
+            while self.pixels > CACHE_PIXELS and len(self.chunks) > 1:
+                _, old = self.chunks.popitem(last=False)
+                self.pixels -= old.get_width() * old.get_height()
+        else:
+            self.chunks.move_to_end(key)
+        return surf
+
+    def cached(self, cr, cc):
+        return [(key[0], surf) for key, surf in self.chunks.items() if key[1] == cr and key[2] == cc]
+
+class MazeLayer:
+    """Floor, walls, goal and grid lines, rendered lazily in chunks per zoom level.
+
+    Listens to maze.set_cell and redraws just that cell in whichever chunks
+    are cached, so a frame is a few chunk blits plus the visible portals.
+    """
+
+    def __init__(self, maze):
+        self.maze = maze
+        self.cache = _ChunkCache()
+        maze.listeners.append(self.mark_dirty)
+
+    def mark_dirty(self, x, y):
+        for tile, surf in self.cache.cached(x // CHUNK, y // CHUNK):
+            self._draw_cell(surf, x, y, tile, (x // CHUNK) * CHUNK, (y // CHUNK) * CHUNK)
+
+    def _draw_cell(self, surf, i, j, tile, row0, col0):
+        cell = self.maze.grid[i][j]
+        x, y = (j - col0) * tile, (i - row0) * tile
+        surf.blit(sprite('grass', tile), (x, y))
+        if cell.type == CellType.WALL:
+            surf.blit(sprite('wall', tile), (x, y))
+        elif cell.type == CellType.GOAL:
+            surf.blit(sprite('fish', tile), (x, y))
+        pygame.draw.rect(surf, GRID_LINE, (x, y, tile, tile), 1)
+
+    def _build_chunk(self, tile, cr, cc):
+        row0, col0 = cr * CHUNK, cc * CHUNK
+        rows = min(CHUNK, self.maze.rows - row0)
+        cols = min(CHUNK, self.maze.cols - col0)
+        surf = pygame.Surface((cols * tile, rows * tile))
+        surf.fill(LAYER_BG)
+        for i in range(row0, row0 + rows):
+            for j in range(col0, col0 + cols):
+                self._draw_cell(surf, i, j, tile, row0, col0)
+        return surf
+
+    def draw(self, screen, camera):
+        t = camera.tile
+        for cr, cc in camera.visible_chunks():
+            surf = self.cache.get((t, cr, cc), self._build_chunk)
+            screen.blit(surf, camera.to_view(cr * CHUNK, cc * CHUNK))
+
+        r0, r1, c0, c1 = camera.visible_cells()
+        for pid, ends in self.maze.portals.items():
+            for i, j in ends:
+                if r0 <= i < r1 and c0 <= j < c1:
+                    x, y = camera.to_view(i, j)
+                    screen.blit(portal_surface(pid, size=t), (x, y))
+                    # the glow reaches the cell edge, so put the grid line back over it
+                    pygame.draw.rect(screen, GRID_LINE, (x, y, t, t), 1)
+
+    def close(self):
+        if self.mark_dirty in self.maze.listeners:
+            self.maze.listeners.remove(self.mark_dirty)
+
+class PathLayer:
+    """A path drawn once into transparent chunks, per zoom level.
+
+    sync() files the points appended since the last call into per-chunk
+    buckets and draws them into chunks already cached, so a growing trail
+    costs its new segments. Portal jumps span chunks and are drawn per frame.
+    """
+
+    def __init__(self, maze, color):
+        self.color = color
+        self.path = None
+        self.drawn = 0
+        self.cache = _ChunkCache()
+        self.buckets = {}   # (chunk row, chunk col) -> [(a, b) segment or (p, p) point]
+        self.jumps = []
+
+    def _reset(self, path):
+        self.path = path
+        self.drawn = 0
+        self.cache = _ChunkCache()
+        self.buckets = {}
+        self.jumps = []
+
+    def _draw_items(self, surf, items, tile, row0, col0):
+        half = tile // 2
+        width = max(1, 3 * tile // CELL)
+        radius = max(1, 4 * tile // CELL)
+        for a, b in items:
+            pa = ((a[1] - col0) * tile + half, (a[0] - row0) * tile + half)
+            if a == b:
+                pygame.draw.circle(surf, self.color, pa, radius)
+            else:
+                pb = ((b[1] - col0) * tile + half, (b[0] - row0) * tile + half)
+                pygame.draw.line(surf, self.color, pa, pb, width)
+
+    def _file(self, item, chunk):
+        self.buckets.setdefault(chunk, []).append(item)
+        for tile, surf in self.cache.cached(*chunk):
+            self._draw_items(surf, [item], tile, chunk[0] * CHUNK, chunk[1] * CHUNK)
+
+    def sync(self, path):
+        if path is not self.path or len(path) < self.drawn:
+            self._reset(path)
+        for k in range(self.drawn, len(path)):
+            p = path[k]
+            if k > 0:
+                a = path[k - 1]
+                if abs(a[0] - p[0]) + abs(a[1] - p[1]) > 1:
+                    self.jumps.append((a, p))
+                else:
+                    ca = (a[0] // CHUNK, a[1] // CHUNK)
+                    cp = (p[0] // CHUNK, p[1] // CHUNK)
+                    self._file((a, p), ca)
+                    if cp != ca:
+                        self._file((a, p), cp)
+            self._file((p, p), (p[0] // CHUNK, p[1] // CHUNK))
+        self.drawn = len(path)
+
+    def _build_chunk(self, tile, cr, cc):
+        surf = pygame.Surface((CHUNK * tile, CHUNK * tile), pygame.SRCALPHA)
+        items = self.buckets.get((cr, cc), [])
+        # lines first, then points on top
+        self._draw_items(surf, [i for i in items if i[0] != i[1]], tile, cr * CHUNK, cc * CHUNK)
+        self._draw_items(surf, [i for i in items if i[0] == i[1]], tile, cr * CHUNK, cc * CHUNK)
+        return surf
+
+    def draw(self, screen, path, camera):
+        if not path or len(path) < 2:
+            return
+        self.sync(path)
+        t = camera.tile
+        for chunk in camera.visible_chunks():
+            if chunk in self.buckets:
+                surf = self.cache.get((t,) + chunk, self._build_chunk)
+                screen.blit(surf, camera.to_view(chunk[0] * CHUNK, chunk[1] * CHUNK))
+        if self.jumps:
+            self._draw_items(screen, self.jumps, t, camera.y / t, camera.x / t)
+
+def draw_player(screen, player, camera=None):
 
-    x = player.y * CELL
-    y = player.x * CELL
-    
-
-    bounce = abs(math.sin(_animation_frame*0.2))*2
-    
-    screen.blit(_sprites['cat'], (x, int(y-bounce)))
-
-def draw_path(screen, path, color=(255, 215, 0)):
-
-    if not path or len(path)<2:
-        return
-    
+    global _animation_frame
 
-    points = []
-    for x, y in path:
-        px = y*CELL+CELL//2
-        py = x*CELL+CELL//2
-        points.append((px, py))
+    tile = camera.tile if camera else CELL
+    x, y = camera.to_view(player.x, player.y) if camera else (player.y * CELL, player.x * CELL)
     
 
-    if len(points)>=2:
-        pygame.draw.lines(screen, color, False, points, 3)
+    bounce = abs(math.sin(_animation_frame*0.2))*2*tile/CELL
     
-
-    for point in points:
-        pygame.draw.circle(screen, color, point, 4)
\ No newline at end of file
+    screen.blit(sprite('cat', tile), (x, int(y-bounce)))
@@ -0,0 +1,199 @@
+import asyncio
+import atexit
+import sys
+import threading
+from collections import OrderedDict
+
+from web.leaderboard import get_backend, sort_key
+
+IS_WEB = sys.platform == "emscripten"
+
+FLUSH_DELAY = 0.25
+# after a failed pass, retry after this long, doubling up to RETRY_MAX
+RETRY_MIN = 0.5
+RETRY_MAX = 30.0
+# rows either side of the player in the "around me" window of a ranked read
+AROUND_RADIUS = 1
+# seeds whose last read is kept; the least recently viewed go first
+MAX_PAGES = 32
+
+
+class ScoreClient:
+    """Write-behind leaderboard access that never blocks a frame.
+
+    submit() and request() only queue work; a worker (asyncio task under
+    pygbag, daemon thread on desktop) writes everything queued in one
+    add_scores batch, then runs the latest read per seed. Whatever fails is
+    put back and retried with backoff; reads still run when a write fails.
+    """
+
+    def __init__(self, flush_delay=FLUSH_DELAY):
+        self.flush_delay = flush_delay
+        self._lock = threading.Lock()
+        self._pending = []      # (seq, seed, entry) not yet written
+        self._recent = []       # (seq, seed, entry) written or pending, for optimistic merges
+        self._requests = {}     # seed -> (limit, rank_for); newer requests replace older ones
+        self._pages = OrderedDict()     # seed -> page dict from the last read, LRU by view()
+        self._seq = 0
+        self._flushed_seq = 0
+        self._wake = None
+        self._started = False
+        self._retry_in = None   # seconds until the next retry, None when nothing failed
+        # one pass at a time: the atexit flush may run while the worker is mid-pass
+        self._work_lock = threading.Lock()
+
+    def _start(self):
+        if self._started:
+            return
+        self._started = True
+        if IS_WEB:
+            asyncio.get_event_loop().create_task(self._run_async())
+        else:
+            self._wake = threading.Event()
+            threading.Thread(target=self._run_thread, daemon=True).start()
+            atexit.register(self.flush)
+
+    def _kick(self):
+        self._start()
+        if self._wake is not None:
+            self._wake.set()
+
+    def submit(self, seed, entry):
+        with self._lock:
+            self._seq += 1
+            item = (self._seq, seed, entry)
+            self._pending.append(item)
+            self._recent.append(item)
+        self._kick()
+
+    def request(self, seed, limit, rank_for=None):
+        with self._lock:
+            self._requests[seed] = (limit, rank_for)
+        self._kick()
+
+    def view(self, seed, limit):
+        """{"rows", "total", "rank", "around", "loaded"} from the last read plus unconfirmed local entries.
+
+        around is (rank of its first row, rows) centred on the ranked result when
+        that result falls below the top `limit`, else None.
+        """
+        with self._lock:
+            page = self._pages.get(seed)
+            if page is not None:
+                self._pages.move_to_end(seed)
+            since = page["seq"] if page else 0
+            local = [entry for seq, s, entry in self._recent if s == seed and seq > since]
+
+        if page is None:
+            rows = sorted(local, key=sort_key)[:limit]
+            return {"rows": rows, "total": len(local), "rank": None, "around": None, "loaded": False}
+
+        rows = sorted(page["rows"] + local, key=sort_key)[:limit]
+        return {"rows": rows, "total": page["total"] + len(local), "rank": page["rank"],
+                "around": page["around"], "loaded": True}
+
+    def _work(self):
+        with self._work_lock:
+            return self._pass()
+
+    def _pass(self):
+        with self._lock:
+            batch = self._pending
+            self._pending = []
+            requests = self._requests
+            self._requests = {}
+
+        backend = get_backend()
+        failed = False
+        if batch:
+            try:
+                backend.add_scores((seed, entry) for _, seed, entry in batch)
+            except Exception as e:
+                print(f"Score submit failed: {e}")
+                failed = True
+                with self._lock:
+                    self._pending = batch + self._pending
+            else:
+                with self._lock:
+                    self._flushed_seq = batch[-1][0]
+
+        with self._lock:
+            # every read below runs after this flush, so it already contains these;
+            # after a failed flush they stay local and view() keeps merging them
+            seen = self._flushed_seq
+
+        for seed, (limit, rank_for) in requests.items():
+            try:
+                page = {
+                    "rows": backend.get_scores(seed, 0, limit),
+                    "total": backend.count(seed),
+                    "rank": backend.get_rank(seed, *rank_for) if rank_for else None,
+                    "around": None,
+                    "seq": seen,
+                }
+                if page["rank"] is not None and page["rank"] > limit:
+                    page["around"] = backend.get_around(seed, *rank_for, AROUND_RADIUS)
+            except Exception as e:
+                print(f"Score fetch failed: {e}")
+                failed = True
+                with self._lock:
+                    # unless a newer request for the seed came in meanwhile
+                    self._requests.setdefault(seed, (limit, rank_for))
+                continue
+            with self._lock:
+                self._pages[seed] = page
+                self._pages.move_to_end(seed)
+                while len(self._pages) > MAX_PAGES:
+                    self._pages.popitem(last=False)
+
+        with self._lock:
+            self._recent = [item for item in self._recent if item[0] > self._merged_up_to(item[1], seen)]
+            if failed:
+                self._retry_in = min(RETRY_MAX, self._retry_in * 2) if self._retry_in else RETRY_MIN
+            else:
+                self._retry_in = None
+        return not failed
+
+    def _merged_up_to(self, seed, seen):
+        # called with the lock held: local entries of the seed at or below this seq are no
+        # longer needed by view(). The last page covers its own; with no page, written ones
+        # go too unless a read is still due to pick them up
+        page = self._pages.get(seed)
+        if page is not None:
+            return page["seq"]
+        return 0 if seed in self._requests else seen
+
+    def _has_work(self):
+        with self._lock:
+            return bool(self._pending or self._requests)
+
+    def _run_thread(self):
+        while True:
+            # a new submit/request wakes the worker early, even while backing off
+            self._wake.wait(self._retry_in)
+            self._wake.clear()
+            # let a burst of submits/requests pile up into one pass
+            threading.Event().wait(self.flush_delay)
+            if self._has_work():
+                self._work()
+
+    async def _run_async(self):
+        while True:
+            await asyncio.sleep(self._retry_in or self.flush_delay)
+            if self._has_work():
+                self._work()
+
+    def flush(self):
+        # waits out a pass the worker is in the middle of, then sends whatever is left
+        with self._work_lock:
+            if self._has_work():
+                self._pass()
+
+
+_client = None
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = ScoreClient()
+    return _client
@@ -1,17 +1,26 @@
 import pygame
 import time
-import base64
 import random
 
-from web.renderer import draw_maze, draw_player, draw_path, update_animation
+from web.renderer import Camera, MazeLayer, PathLayer, ZOOM_LEVELS, draw_player, update_animation
 from web.clipboard import copy, paste 
+from web.assets import load_image
+from web.backdrops import image_background, overlay, sky_gradient
+from web.dirty import repaint
+from web.fonts import get_font, preload
+from web.text_cache import render_text
 from web.state import GameState
-from web.leaderboard import add_score, get_scores
+from web.leaderboard import make_entry
+from web.score_client import get_client
 from web.player import Player
+import web.maze_store as maze_store
 
 from src.tools.dataset_generator import generate_maze
-from src.solver.AStarSolver import AStarSolver
+from src.tools.seed_codec import encode_generated, encode_maze, decode, short_code
+from src.tools.difficulty import bands_for, generate_targeted
 from src.solver.bfs_solver import BFSSolver
+from src.solver.cache import solve
+from src.tools.replay import compute_score
 
 COL_HUD_BG = (15, 23, 42, 240) 
 COL_ACCENT = (56, 189, 248)    
@@ -19,14 +28,35 @@ COL_TEXT = (226, 232, 240)
 COL_GOLD = (250, 204, 21)
 COL_DANGER = (239, 68, 68)
 COL_SUCCESS = (34, 197, 94)
+
+PLAY_BG_FALLBACK = (30, 41, 59)
+PLAY_BG_TINT = (10, 15, 30, 180)
+
+LEADERBOARD_ROWS = 8
+# rows the top list gives up for the "around you" window (separator plus radius 1)
+AROUND_ROWS = 4
+# room left around the maze view for the HUD and hint line
+VIEW_MARGIN_X = 40
+VIEW_MARGIN_Y = 75
+
+# R, C, portal_pairs, wall_noise used for generated maps
+GEN_PARAMS = (15, 15, 3, 15)
+
 class WelcomeScreen:
     def __init__(self, game):
         self.game = game
-        self.title_font = pygame.font.SysFont("Arial", 72, bold=True)
-        self.subtitle_font = pygame.font.SysFont("Arial", 24)
+        self.title_font = get_font("Arial", 72, bold=True)
+        self.subtitle_font = get_font("Arial", 24)
         
         self.blink_timer = 0
         self.show_text = True
+        self.painted = None
+        self.fonts_ready = False
+
+        w, h = self.game.screen.get_size()
+        sub_w, sub_h = self.subtitle_font.size("Press any key to start")
+        self.sub_area = pygame.Rect(0, 0, sub_w, sub_h)
+        self.sub_area.center = (w // 2, h // 2 + 60)
 
     def handle_events(self):
         for e in pygame.event.get():
@@ -38,17 +68,31 @@ class WelcomeScreen:
         if self.blink_timer > 30:
             self.show_text = not self.show_text
             self.blink_timer = 0
+        # one font per idle frame so the later screens don't hitch on SysFont
+        if not self.fonts_ready:
+            self.fonts_ready = preload(1)
 
     def draw(self):
+        # only the blinking line ever changes
+        if self.game.full_redraw:
+            self.painted = self.show_text
+            self._paint()
+            return None
+        if self.show_text == self.painted:
+            return []
+        self.painted = self.show_text
+        return repaint(self.game.screen, [self.sub_area], self._paint)
+
+    def _paint(self):
         self.game.screen.fill((0, 0, 0))
         w, h = self.game.screen.get_size()
 
-        title_surf = self.title_font.render("CAT & MAZE", True, (255, 255, 255))
+        title_surf = render_text(self.title_font, "CAT & MAZE", (255, 255, 255))
         title_rect = title_surf.get_rect(center=(w // 2, h // 2 - 40))
         self.game.screen.blit(title_surf, title_rect)
 
         if self.show_text:
-            sub_surf = self.subtitle_font.render("Press any key to start", True, (200, 200, 200))
+            sub_surf = render_text(self.subtitle_font, "Press any key to start", (200, 200, 200))
             sub_rect = sub_surf.get_rect(center=(w // 2, h // 2 + 60))
             self.game.screen.blit(sub_surf, sub_rect)
 
@@ -56,18 +100,15 @@ class WelcomeScreen:
 class NameScreen:
     def __init__(self, game):
         self.game = game
-        self.title_font = pygame.font.SysFont("Arial", 36, bold=True)
-        self.input_font = pygame.font.SysFont("Arial", 32)
-        self.hint_font = pygame.font.SysFont("Arial", 18)
+        self.title_font = get_font("Arial", 36, bold=True)
+        self.input_font = get_font("Arial", 32)
+        self.hint_font = get_font("Arial", 18)
         self.name = ""
         self.cursor_visible = True
         self.cursor_timer = 0
+        self.painted = None
         
-        try:
-            self.bg_image = pygame.image.load("assets/bg.png")
-            self.has_bg = True
-        except Exception:
-            self.has_bg = False
+        self.has_bg = load_image("bg.png") is not None
 
     def handle_events(self):
         for e in pygame.event.get():
@@ -78,8 +119,10 @@ class NameScreen:
                     self.game.player_name = self.name
                     
                     if hasattr(self.game, 'restart_maze') and self.game.restart_maze:
-                        self.game.switch(GameState.PLAY, custom_maze=self.game.restart_maze, fixed_k=self.game.restart_k)
+                        self.game.switch(GameState.PLAY, custom_maze=self.game.restart_maze, fixed_k=self.game.restart_k,
+                                         seed_code=getattr(self.game, 'restart_seed', None))
                         self.game.restart_maze = None
+                        self.game.restart_seed = None
                     else:
                         self.game.switch(GameState.MODE)
 
@@ -105,63 +148,64 @@ class NameScreen:
             self.cursor_visible = not self.cursor_visible
             self.cursor_timer = 0
 
+    def _box_rect(self):
+        w, h = self.game.screen.get_size()
+        box_width, box_height = 300, 50
+        return pygame.Rect(w // 2 - box_width//2, h // 2 - box_height//2, box_width, box_height)
+
     def draw(self):
+        state = (self.name, self.cursor_visible)
+        if self.game.full_redraw:
+            self.painted = state
+            self._paint()
+            return None
+        if state == self.painted:
+            return []
+        self.painted = state
+        return repaint(self.game.screen, [self._box_rect()], self._paint)
+
+    def _paint(self):
         w, h = self.game.screen.get_size()
         cx, cy = w // 2, h // 2
 
         if self.has_bg:
-
-            scaled_bg = pygame.transform.scale(self.bg_image, (w, h))
-            self.game.screen.blit(scaled_bg, (0, 0))
-            
-            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (0, 0, 0, 100), (0, 0, w, h))
-            self.game.screen.blit(overlay, (0, 0))
+            self.game.screen.blit(image_background("bg.png", (w, h), (0, 0, 0, 100)), (0, 0))
         else:
-            self.game.screen.fill((135, 206, 235))
-
-            for i in range(h):
-
-                color = (max(0, 135 - i//10), max(0, 206 - i//15), max(0, 235 - i//20))
-                pygame.draw.line(self.game.screen, color, (0, i), (w, i))
+            self.game.screen.blit(sky_gradient((w, h)), (0, 0))
         
-        title = self.title_font.render("Enter Your Name", True, (255, 255, 255))
+        title = render_text(self.title_font, "Enter Your Name", (255, 255, 255))
         title_rect = title.get_rect(center=(cx, cy - 80))
         
-        shadow = self.title_font.render("Enter Your Name", True, (0, 0, 0))
+        shadow = render_text(self.title_font, "Enter Your Name", (0, 0, 0))
         shadow_rect = shadow.get_rect(center=(cx + 2, cy - 78))
         self.game.screen.blit(shadow, shadow_rect)
         self.game.screen.blit(title, title_rect)
         
-        box_width, box_height = 300, 50
-        box_rect = pygame.Rect(cx - box_width//2, cy - box_height//2, box_width, box_height)
+        box_rect = self._box_rect()
         
         pygame.draw.rect(self.game.screen, (255, 255, 255), box_rect)
         pygame.draw.rect(self.game.screen, (100, 149, 237), box_rect, 3)
         
         cursor = "|" if self.cursor_visible else ""
-        name_text = self.input_font.render(self.name + cursor, True, (0, 0, 0))
+        name_text = render_text(self.input_font, self.name + cursor, (0, 0, 0))
         name_rect = name_text.get_rect(center=box_rect.center)
         self.game.screen.blit(name_text, name_rect)
         
-        hint = self.hint_font.render("Press ENTER to continue (Max 12 characters)", True, (255, 255, 255))
+        hint = render_text(self.hint_font, "Press ENTER to continue (Max 12 characters)", (255, 255, 255))
         hint_rect = hint.get_rect(center=(cx, cy + 50)) 
         self.game.screen.blit(hint, hint_rect)
 
 class ModeScreen:
     def __init__(self, game):
         self.game = game
-        self.title_font = pygame.font.SysFont("Arial", 40, bold=True)
-        self.option_font = pygame.font.SysFont("Arial", 26)
-        self.desc_font = pygame.font.SysFont("Arial", 18)
+        self.title_font = get_font("Arial", 40, bold=True)
+        self.option_font = get_font("Arial", 26)
+        self.desc_font = get_font("Arial", 18)
         self.selected = 0
         self.hover_alpha = 0
+        self.painted = None
         
-        try:
-            self.bg_image = pygame.image.load("assets/bg.png")
-            self.has_bg = True
-        except Exception as e:
-            self.has_bg = False
+        self.has_bg = load_image("bg.png") is not None
 
     def handle_events(self):
         for e in pygame.event.get():
@@ -195,39 +239,54 @@ class ModeScreen:
     def update(self):
         self.hover_alpha = (self.hover_alpha + 5) % 255
 
+    MENU_START_Y = 200
+    CARD_W, CARD_H = 500, 80
+    CARD_SPACING = 20
+
+    def _card_area(self, i):
+        # card plus its glow
+        w = self.game.screen.get_width()
+        y = self.MENU_START_Y + i * (self.CARD_H + self.CARD_SPACING)
+        return pygame.Rect((w - self.CARD_W) // 2 - 2, y - 2, self.CARD_W + 4, self.CARD_H + 4)
+
     def draw(self):
+        # the pulsing glow repaints the selected card; a selection change also the old one
+        if self.game.full_redraw:
+            self.painted = self.selected
+            self._paint()
+            return None
+        areas = [self._card_area(self.selected)]
+        if self.painted != self.selected:
+            areas.append(self._card_area(self.painted))
+            self.painted = self.selected
+        return repaint(self.game.screen, areas, self._paint)
+
+    def _paint(self):
         w, h = self.game.screen.get_size()
         cx = w // 2
 
         if self.has_bg:
-            scaled_bg = pygame.transform.scale(self.bg_image, (w, h))
-            self.game.screen.blit(scaled_bg, (0, 0))
-            overlay = pygame.Surface((w, h), pygame.SRCALPHA)
-            pygame.draw.rect(overlay, (0, 0, 0, 120), (0, 0, w, h))
-            self.game.screen.blit(overlay, (0, 0))
+            self.game.screen.blit(image_background("bg.png", (w, h), (0, 0, 0, 120)), (0, 0))
         else:
-            self.game.screen.fill((135, 206, 235))
-            for i in range(h):
-                color = (max(0, 135 - i//10), max(0, 206 - i//15), max(0, 235 - i//20))
-                pygame.draw.line(self.game.screen, color, (0, i), (w, i))
+            self.game.screen.blit(sky_gradient((w, h)), (0, 0))
         
-        title = self.title_font.render("Select Game Mode", True, (255, 255, 255))
+        title = render_text(self.title_font, "Select Game Mode", (255, 255, 255))
         title_rect = title.get_rect(center=(cx, 100))
-        shadow = self.title_font.render("Select Game Mode", True, (0, 0, 0))
+        shadow = render_text(self.title_font, "Select Game Mode", (0, 0, 0))
         shadow_rect = shadow.get_rect(center=(cx + 2, 102))
         self.game.screen.blit(shadow, shadow_rect)
         self.game.screen.blit(title, title_rect)
         
         options = [
             ("1", "Classic Mode", "No wall breaking allowed"),
-            ("2", "Break Mode", "Break walls with random K value"),
+            ("2", "Break Mode", "Break walls, K fitted to the map"),
             ("3", "Editor Mode", "Create your own maze"),
             ("4", "Load Seed", "Play a friend's maze"),
         ]
         
-        menu_start_y = 200
-        card_w, card_h = 500, 80
-        spacing = 20
+        menu_start_y = self.MENU_START_Y
+        card_w, card_h = self.CARD_W, self.CARD_H
+        spacing = self.CARD_SPACING
         
         for i, (key, name, desc) in enumerate(options):
             y = menu_start_y + i * (card_h + spacing)
@@ -237,9 +296,8 @@ class ModeScreen:
             card_color = (255, 255, 255) if i == self.selected else (240, 240, 240)
             
             if i == self.selected:
-                glow = pygame.Surface((card_w + 4, card_h + 4), pygame.SRCALPHA)
-                glow_alpha = int(abs(self.hover_alpha - 127) + 50)
-                pygame.draw.rect(glow, (100, 149, 237, glow_alpha), (0, 0, card_w + 4, card_h + 4), border_radius=10)
+                glow = overlay((card_w + 4, card_h + 4), (100, 149, 237, 255), radius=10)
+                glow.set_alpha(int(abs(self.hover_alpha - 127) + 50))
                 self.game.screen.blit(glow, (card_x - 2, y - 2))
             
             pygame.draw.rect(self.game.screen, card_color, card_rect, border_radius=8)
@@ -247,30 +305,34 @@ class ModeScreen:
             
             key_circle = pygame.Rect(card_x + 20, y + 20, 40, 40)
             pygame.draw.circle(self.game.screen, (100, 149, 237), key_circle.center, 20)
-            key_text = self.option_font.render(key, True, (255, 255, 255))
+            key_text = render_text(self.option_font, key, (255, 255, 255))
             key_rect = key_text.get_rect(center=key_circle.center)
             self.game.screen.blit(key_text, key_rect)
             
-            name_text = self.option_font.render(name, True, (0, 0, 0))
+            name_text = render_text(self.option_font, name, (0, 0, 0))
             self.game.screen.blit(name_text, (card_x + 80, y + 15))
             
 
-            desc_text = self.desc_font.render(desc, True, (100, 100, 100))
+            desc_text = render_text(self.desc_font, desc, (100, 100, 100))
             self.game.screen.blit(desc_text, (card_x + 80, y + 45))
-            hint = self.desc_font.render("Use number keys or arrow keys + ENTER", True, (255, 255, 255))
+            hint = render_text(self.desc_font, "Use number keys or arrow keys + ENTER", (255, 255, 255))
         hint_rect = hint.get_rect(center=(cx, h - 50))
         self.game.screen.blit(hint, hint_rect)
 class PlayScreen:
-    def __init__(self, game, custom_maze=None, fixed_k=None):
+    HUD_H = 70
+
+    def __init__(self, game, custom_maze=None, fixed_k=None, seed_code=None):
         self.game = game
+        self.seed_code = seed_code
         
-        self.font_title = pygame.font.SysFont("Segoe UI", 32, bold=True)
-        self.font_hud_label = pygame.font.SysFont("Segoe UI", 12, bold=True)
-        self.font_hud_val = pygame.font.SysFont("Segoe UI", 20, bold=True)
-        self.font_body = pygame.font.SysFont("Segoe UI", 16)
-        self.font_mono = pygame.font.SysFont("Consolas", 14)
+        self.font_title = get_font("Segoe UI", 32, bold=True)
+        self.font_hud_label = get_font("Segoe UI", 12, bold=True)
+        self.font_hud_val = get_font("Segoe UI", 20, bold=True)
+        self.font_body = get_font("Segoe UI", 16)
+        self.font_mono = get_font("Consolas", 14)
         
         self.CELL_SIZE = 32
+        self.tile = self.CELL_SIZE
         self.SCREEN_W, self.SCREEN_H = self.game.screen.get_size()
         
         self.start_time = time.time()
@@ -285,10 +347,13 @@ class PlayScreen:
         self.show_bfs = False
         self.show_leaderboard = False
         self.show_controls = False 
-        self.cached_scores = []
+        self.my_entry = None
+        self.painted_layout = None
+        self.painted_modal = None
 
-        self.bg_img = pygame.image.load("assets/playscreen_bg.png")
-        self.bg_img = pygame.transform.scale(self.bg_img, (self.SCREEN_W, self.SCREEN_H))
+        # scaled and tinted once per process; a plain backdrop if the image is missing
+        self.bg_img = image_background("playscreen_bg.png", (self.SCREEN_W, self.SCREEN_H),
+                                       PLAY_BG_TINT, fallback=PLAY_BG_FALLBACK)
 
         if custom_maze:
             self.maze = custom_maze
@@ -300,22 +365,41 @@ class PlayScreen:
         self._recalculate_layout()
 
     def _recalculate_layout(self):
-        maze_w = self.maze.cols * self.CELL_SIZE
-        maze_h = self.maze.rows * self.CELL_SIZE
-        self.maze_offset_x = (self.SCREEN_W - maze_w) // 2
-        self.maze_offset_y = (self.SCREEN_H - maze_h) // 2 + 20 
+        # mazes that don't fit get a scrolling view that follows the cat
+        view_w = min(self.maze.cols * self.tile, self.SCREEN_W - 2 * VIEW_MARGIN_X)
+        view_h = min(self.maze.rows * self.tile, self.SCREEN_H - 2 * VIEW_MARGIN_Y)
+        self.maze_offset_x = (self.SCREEN_W - view_w) // 2
+        self.maze_offset_y = (self.SCREEN_H - view_h) // 2 + 20 
+        self.camera = Camera(self.maze, view_w, view_h, self.tile)
+        self.camera.follow(self.player.x, self.player.y)
+
+    def close(self):
+        # the layer listens for set_cell on the maze, which outlives this screen on a retry
+        if getattr(self, "maze_layer", None):
+            self.maze_layer.close()
+
+    def _zoom(self, step):
+        i = ZOOM_LEVELS.index(self.tile) + step
+        if 0 <= i < len(ZOOM_LEVELS):
+            self.tile = ZOOM_LEVELS[i]
+            self._recalculate_layout()
 
     def generate_new_map(self):
-        while True:
-            self.K = 0 if self.game.mode == "CLASSIC" else random.randint(1, 5)
-            self.maze = generate_maze(15, 15, 3, 15)
-            bfs = BFSSolver(self.maze, self.K)
-            if bfs.shortest_path() != -1:
-                break 
+        if self.game.mode == "BREAK":
+            # K follows from how many walls the map actually needs broken
+            self.maze, self.K, gen_seed, _ = generate_targeted(bands_for(*GEN_PARAMS[:2])["medium"], *GEN_PARAMS, seed=random.getrandbits(32))
+        else:
+            while True:
+                self.K = 0
+                gen_seed = random.getrandbits(32)
+                self.maze = generate_maze(*GEN_PARAMS, gen_seed)
+                if BFSSolver(self.maze, self.K).is_solvable():
+                    break 
+        self.seed_code = encode_generated(*GEN_PARAMS, self.K, gen_seed)
         self._solve_and_ready()
 
     def _solve_and_ready(self):
-        self.cached_scores = [] 
+        self.my_entry = None
         self.finished = False
         self.score = None
         self.score_submitted = False
@@ -325,31 +409,24 @@ class PlayScreen:
         self.paused = False
         self.time_taken = 0 
 
-        bfs = BFSSolver(self.maze, self.K)
-        res = bfs.shortest_path_with_path()
-        self.bfs_dist, self.bfs_path = res if res else (0, [])
-
-        astar = AStarSolver(self.maze, self.K)
-        res = astar.shortest_path()
-        self.astar_dist, self.astar_path = res if res else (0, [])
-
         self.build_seed()
+        (self.bfs_dist, self.bfs_path), (self.astar_dist, self.astar_path) = solve(self.maze, self.K, self.maze_id)
+
         self.player = Player(self.maze.start, self.K)
+        self.close()
+        self.maze_layer = MazeLayer(self.maze)
+        self.bfs_layer = PathLayer(self.maze, (236, 72, 153))
+        self.astar_layer = PathLayer(self.maze, (6, 182, 212))
+        self.trail_layer = PathLayer(self.maze, COL_GOLD)
         self._recalculate_layout()
 
     def build_seed(self):
-        chars = []
-        for j in range(self.maze.rows):
-            for i in range(self.maze.cols):
-                cell = self.maze.grid[i][j]
-                if cell.type.name == "WALL": chars.append("#")
-                elif cell.type.name == "EMPTY": chars.append(".")
-                elif cell.type.name == "START": chars.append("S")
-                elif cell.type.name == "GOAL": chars.append("G")
-                else: chars.append(chr(ord("a") + cell.portal_id))
-        raw = "".join(chars).encode()
-        encoded = base64.urlsafe_b64encode(raw).decode()
-        self.game.current_seed = f"MS2|{self.maze.cols}x{self.maze.rows}|{self.K}|{encoded}"
+        if not self.seed_code:
+            self.seed_code = encode_maze(self.maze, self.K)
+        # leaderboard and solver cache key by the content hash, not the code
+        self.maze_id = maze_store.put(self.maze, self.K, self.seed_code)
+        self.game.current_seed = self.seed_code
+        self.game.current_maze_id = self.maze_id
 
     def toggle_pause(self, state=None):
         new_state = not self.paused if state is None else state
@@ -372,15 +449,6 @@ class PlayScreen:
         else:
             return now - self.start_time - self.total_pause_duration
 
-    def _draw_loading(self, msg="Loading..."):
-        self.draw() 
-        overlay = pygame.Surface((self.SCREEN_W, self.SCREEN_H), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 150))
-        self.game.screen.blit(overlay, (0,0))
-        txt = self.font_title.render(msg, True, COL_ACCENT)
-        self.game.screen.blit(txt, txt.get_rect(center=(self.SCREEN_W//2, self.SCREEN_H//2)))
-        pygame.display.flip()
-
     def handle_events(self):
         for e in pygame.event.get():
             if e.type != pygame.KEYDOWN: continue
@@ -400,9 +468,7 @@ class PlayScreen:
                 self.toggle_pause(self.show_leaderboard)
                 
                 if self.show_leaderboard:
-                    self._draw_loading("Fetching Scores...")
-                    try: self.cached_scores = get_scores(self.game.current_seed)
-                    except: self.cached_scores = []
+                    self._fetch_scores()
                 return
             
             if e.key == pygame.K_c:
@@ -412,13 +478,20 @@ class PlayScreen:
                 return
 
             if e.key == pygame.K_r:
-                self.game.restart_maze = self.maze
+                # rebuild from the code so walls broken this run come back
+                self.game.restart_maze = decode(self.seed_code)[0]
                 self.game.restart_k = self.K
+                self.game.restart_seed = self.seed_code
                 self.game.switch(GameState.NAME)
             elif e.key == pygame.K_t:
                 self.game.restart_maze = None
                 self.game.switch(GameState.NAME)
 
+            if e.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+                self._zoom(-1)
+            elif e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+                self._zoom(1)
+
             if self.paused or self.finished:
                 continue 
 
@@ -431,10 +504,17 @@ class PlayScreen:
             elif e.key == pygame.K_h: self.show_astar = not self.show_astar
             elif e.key == pygame.K_b: self.show_bfs = not self.show_bfs
 
+    def _fetch_scores(self):
+        # queued, never awaited: the modal draws whatever the client has so far
+        rank_for = (self.my_entry["score"], self.my_entry["time"]) if self.my_entry else None
+        get_client().request(self.game.current_maze_id, LEADERBOARD_ROWS, rank_for)
+
     def update(self):
         if self.paused or self.finished: return
         
         update_animation()
+        # keep the trail layer current move by move so the finish frame has nothing to catch up
+        self.trail_layer.sync(self.player.path)
         
         if (self.player.x, self.player.y) == self.maze.goal:
 
@@ -442,66 +522,91 @@ class PlayScreen:
             self.time_taken = round(final_time, 2)
             self.finished = True
             
-            if self.player.steps > 0:
-                self.score = (self.bfs_dist / self.player.steps) * 100
-            else:
-                self.score = 0
-            
-            self._draw_loading("Submitting Score...")
+            self.score = compute_score(self.bfs_dist, self.player.steps)
             
             if not self.score_submitted:
-                add_score(self.game.current_seed, self.game.player_name, self.score, self.time_taken)
+                # write-behind: the row is merged into the modal now and stored off-frame
+                self.my_entry = make_entry(self.game.player_name, self.score, self.time_taken,
+                                           self.player.replay.encode())
+                get_client().submit(self.game.current_maze_id, self.my_entry)
                 self.score_submitted = True
-                try: self.cached_scores = get_scores(self.game.current_seed)
-                except: self.cached_scores = []
+                self._fetch_scores()
 
             self.show_leaderboard = True
             self.toggle_pause(True)
 
     def draw(self):
+        # during play only the HUD and the maze view change; zoom and opening a modal repaint everything
+        layout = (self.tile, self.show_leaderboard, self.show_controls)
+        if self.game.full_redraw or layout != self.painted_layout:
+            self.painted_layout = layout
+            self.painted_modal = self._modal_state()
+            self._paint()
+            return None
+        if self.show_leaderboard or self.show_controls:
+            # the game is paused under a modal: only new scores change anything
+            modal = self._modal_state()
+            if modal == self.painted_modal:
+                return []
+            self.painted_modal = modal
+            # the panel is opaque, so it can be redrawn over itself
+            self._draw_modal()
+            return [self._modal_rect()]
+        hud = pygame.Rect(0, 0, self.SCREEN_W, self.HUD_H + 1)
+        view = pygame.Rect(self.maze_offset_x - 2, self.maze_offset_y - 2,
+                           self.camera.view_w + 12, self.camera.view_h + 12)
+        screen = self.game.screen
+        return repaint(screen, [hud], self._draw_hud_region) + repaint(screen, [view], self._draw_view_region)
+
+    def _draw_backdrop(self):
         self.game.screen.blit(self.bg_img, (0, 0))
-        s = pygame.Surface((self.SCREEN_W, self.SCREEN_H), pygame.SRCALPHA)
-        s.fill((10, 15, 30, 180)) 
-        self.game.screen.blit(s, (0,0))
+
+    def _draw_hud_region(self):
+        self._draw_backdrop()
+        self._draw_hud()
+
+    def _draw_view_region(self):
+        self._draw_backdrop()
+        self._draw_maze_layer()
+
+    def _paint(self):
+        self._draw_backdrop()
 
         self._draw_maze_layer()
         self._draw_hud()
         self._draw_hints()
 
-        if self.show_leaderboard:
+        if self.show_leaderboard or self.show_controls:
             self._draw_overlay_bg()
+            self._draw_modal()
+
+    def _draw_modal(self):
+        if self.show_leaderboard:
             self._draw_leaderboard_modal()
-        elif self.show_controls:
-            self._draw_overlay_bg()
+        else:
             self._draw_controls_modal()
 
     def _draw_maze_layer(self):
-        maze_w = self.maze.cols * self.CELL_SIZE
-        maze_h = self.maze.rows * self.CELL_SIZE
-        maze_surf = pygame.Surface((maze_w, maze_h))
-        maze_surf.fill((20, 25, 40)) 
-
-        draw_maze(maze_surf, self.maze, self.font_mono)
-        
-        for i in range(self.maze.cols):
-            for j in range(self.maze.rows):
-                pygame.draw.rect(maze_surf, (255, 255, 255, 10), (i*32, j*32, 32, 32), 1)
-
-        if self.show_bfs: draw_path(maze_surf, self.bfs_path, color=(236, 72, 153))
-        if self.show_astar: draw_path(maze_surf, self.astar_path, color=(6, 182, 212))
-        if self.finished: draw_path(maze_surf, self.player.path, color=COL_GOLD)
-        
-        draw_player(maze_surf, self.player)
+        maze_w = self.camera.view_w
+        maze_h = self.camera.view_h
 
         pygame.draw.rect(self.game.screen, (0, 0, 0, 150), (self.maze_offset_x+8, self.maze_offset_y+8, maze_w, maze_h), border_radius=4)
         pygame.draw.rect(self.game.screen, (71, 85, 105), (self.maze_offset_x-2, self.maze_offset_y-2, maze_w+4, maze_h+4), 2)
-        self.game.screen.blit(maze_surf, (self.maze_offset_x, self.maze_offset_y))
+
+        # static tiles come from the cached layer; paths and the player draw straight onto the screen
+        maze_surf = self.game.screen.subsurface((self.maze_offset_x, self.maze_offset_y, maze_w, maze_h))
+        self.camera.follow(self.player.x, self.player.y)
+        self.maze_layer.draw(maze_surf, self.camera)
+
+        if self.show_bfs: self.bfs_layer.draw(maze_surf, self.bfs_path, self.camera)
+        if self.show_astar: self.astar_layer.draw(maze_surf, self.astar_path, self.camera)
+        if self.finished: self.trail_layer.draw(maze_surf, self.player.path, self.camera)
+        
+        draw_player(maze_surf, self.player, self.camera)
 
     def _draw_hud(self):
-        hud_h = 70
-        s = pygame.Surface((self.SCREEN_W, hud_h), pygame.SRCALPHA)
-        s.fill(COL_HUD_BG)
-        self.game.screen.blit(s, (0, 0))
+        hud_h = self.HUD_H
+        self.game.screen.blit(overlay((self.SCREEN_W, hud_h), COL_HUD_BG), (0, 0))
         pygame.draw.line(self.game.screen, (56, 189, 248, 100), (0, hud_h), (self.SCREEN_W, hud_h), 1)
 
         if self.finished:
@@ -511,10 +616,10 @@ class PlayScreen:
         else:
             status_txt, status_col = "EXPLORING", COL_ACCENT
 
-        self._draw_hud_pill(40, "TIME", f"{self.get_display_time():.1f}s")
+        self._draw_hud_pill(40, "TIME", f"{self.get_display_time():.1f}s", cached=self.paused or self.finished)
         self._draw_hud_pill(160, "STEPS", str(self.player.steps))
         
-        title = self.font_title.render(status_txt, True, status_col)
+        title = render_text(self.font_title, status_txt, status_col)
         self.game.screen.blit(title, title.get_rect(center=(self.SCREEN_W // 2, hud_h // 2)))
 
         brk_col = COL_DANGER if self.player.breaks_left == 0 else COL_SUCCESS
@@ -523,71 +628,101 @@ class PlayScreen:
         if self.finished and self.score is not None:
              self._draw_hud_pill(self.SCREEN_W - 120, "SCORE", f"{self.score:.0f}", COL_GOLD)
 
-    def _draw_hud_pill(self, x, label, val, color=COL_ACCENT):
-        self.game.screen.blit(self.font_hud_label.render(label, True, (148, 163, 184)), (x, 15))
-        self.game.screen.blit(self.font_hud_val.render(str(val), True, color), (x, 35))
+    def _draw_hud_pill(self, x, label, val, color=COL_ACCENT, cached=True):
+        self.game.screen.blit(render_text(self.font_hud_label, label, (148, 163, 184)), (x, 15))
+        # values that change every frame would only churn the text cache
+        val_surf = render_text(self.font_hud_val, str(val), color) if cached else self.font_hud_val.render(str(val), True, color)
+        self.game.screen.blit(val_surf, (x, 35))
 
     def _draw_hints(self):
         hint_y = self.SCREEN_H - 30
         hints = "TAB: Leaderboard   |   C: Controls   |   ESC: Menu"
-        self.game.screen.blit(self.font_body.render(hints, True, (148, 163, 184)), (20, hint_y))
-        if self.game.current_seed:
-            lbl = self.font_mono.render(f"ID: {self.game.current_seed[:18]}...", True, (71, 85, 105))
+        self.game.screen.blit(render_text(self.font_body, hints, (148, 163, 184)), (20, hint_y))
+        if self.game.current_maze_id:
+            lbl = render_text(self.font_mono, f"ID: {short_code(self.game.current_maze_id)}", (71, 85, 105))
             self.game.screen.blit(lbl, (self.SCREEN_W - lbl.get_width() - 20, hint_y))
 
     def _draw_overlay_bg(self):
-        s = pygame.Surface((self.SCREEN_W, self.SCREEN_H), pygame.SRCALPHA)
-        s.fill((0, 0, 0, 180))
-        self.game.screen.blit(s, (0, 0))
+        self.game.screen.blit(overlay((self.SCREEN_W, self.SCREEN_H), (0, 0, 0, 180)), (0, 0))
+
+    def _modal_state(self):
+        if not self.show_leaderboard:
+            return None
+        board = get_client().view(self.game.current_maze_id, LEADERBOARD_ROWS)
+        return board, self.finished
+
+    def _modal_rect(self):
+        w, h = (520, 440) if self.show_leaderboard else (420, 412)
+        return pygame.Rect((self.SCREEN_W - w) // 2, (self.SCREEN_H - h) // 2, w, h)
 
     def _draw_leaderboard_modal(self):
-        w, h = 520, 440
-        x, y = (self.SCREEN_W - w) // 2, (self.SCREEN_H - h) // 2
+        x, y, w, h = self._modal_rect()
         pygame.draw.rect(self.game.screen, (30, 41, 59), (x, y, w, h), border_radius=12)
         pygame.draw.rect(self.game.screen, COL_ACCENT, (x, y, w, h), 2, border_radius=12)
 
-        self.game.screen.blit(self.font_title.render("LEADERBOARD", True, COL_ACCENT), (x + 25, y + 20))
-        self.game.screen.blit(self.font_body.render("[TAB] Close", True, (100, 100, 100)), (x + w - 110, y + 30))
+        self.game.screen.blit(render_text(self.font_title, "LEADERBOARD", COL_ACCENT), (x + 25, y + 20))
+        self.game.screen.blit(render_text(self.font_body, "[TAB] Close", (100, 100, 100)), (x + w - 110, y + 30))
+        board = self.painted_modal[0]
+        if board["rank"] is not None:
+            rank_lbl = render_text(self.font_hud_label, f"YOUR RANK #{board['rank']} / {board['total']}", COL_GOLD)
+            self.game.screen.blit(rank_lbl, (x + w - rank_lbl.get_width() - 25, y + 55))
 
         start_y = y + 80
         headers = ["#", "PLAYER", "SCORE", "TIME"]
         pxs = [x+25, x+70, x+320, x+420]
         for i, txt in enumerate(headers):
-            self.game.screen.blit(self.font_hud_label.render(txt, True, (148, 163, 184)), (pxs[i], start_y))
+            self.game.screen.blit(render_text(self.font_hud_label, txt, (148, 163, 184)), (pxs[i], start_y))
         pygame.draw.line(self.game.screen, (71, 85, 105), (x+20, start_y+20), (x+w-20, start_y+20))
         
         row_y = start_y + 35
-        if not self.cached_scores:
-            lbl = self.font_body.render("No scores yet. Be the first!", True, (200, 200, 200))
+        if not board["rows"]:
+            msg = "No scores yet. Be the first!" if board["loaded"] else "Fetching scores..."
+            lbl = render_text(self.font_body, msg, (200, 200, 200))
             self.game.screen.blit(lbl, (x + w//2 - lbl.get_width()//2, row_y + 40))
         else:
-            for i, s in enumerate(self.cached_scores[:8]):
-                col = COL_TEXT
-                if i == 0: col = COL_GOLD
-                elif i == 1: col = (192, 192, 192)
-                elif i == 2: col = (205, 127, 50)
-                name = s['name'][:14] + ".." if len(s['name']) > 14 else s['name']
-                self.game.screen.blit(self.font_body.render(str(i+1), True, col), (pxs[0], row_y))
-                self.game.screen.blit(self.font_body.render(name, True, col), (pxs[1], row_y))
-                self.game.screen.blit(self.font_body.render(f"{s['score']:.0f}", True, col), (pxs[2], row_y))
-                self.game.screen.blit(self.font_body.render(f"{s['time']:.1f}s", True, col), (pxs[3], row_y))
+            rows = board["rows"]
+            if board["around"] is not None:
+                # the player is below the top rows: shorten them and show the rows around the player
+                rows = rows[:LEADERBOARD_ROWS - AROUND_ROWS]
+            for i, s in enumerate(rows):
+                self._draw_board_row(pxs, row_y, i + 1, s)
                 row_y += 32
+            if board["around"] is not None:
+                first, around = board["around"]
+                dots = render_text(self.font_body, ". . .", (100, 116, 139))
+                self.game.screen.blit(dots, (pxs[1], row_y - 6))
+                row_y += 24
+                for i, s in enumerate(around):
+                    self._draw_board_row(pxs, row_y, first + i, s)
+                    row_y += 32
 
         if self.finished:
-            lbl = self.font_body.render("PRESS [R] TO RETRY   |   [T] NEW MAP", True, COL_SUCCESS)
+            lbl = render_text(self.font_body, "PRESS [R] TO RETRY   |   [T] NEW MAP", COL_SUCCESS)
             self.game.screen.blit(lbl, lbl.get_rect(center=(x+w//2, y+h-40)))
 
+    def _draw_board_row(self, pxs, row_y, rank, s):
+        mine = self.my_entry is not None and (s["name"], s["timestamp"]) == (self.my_entry["name"], self.my_entry["timestamp"])
+        col = COL_TEXT
+        if rank == 1: col = COL_GOLD
+        elif rank == 2: col = (192, 192, 192)
+        elif rank == 3: col = (205, 127, 50)
+        elif mine: col = COL_SUCCESS
+        name = s['name'][:14] + ".." if len(s['name']) > 14 else s['name']
+        self.game.screen.blit(render_text(self.font_body, str(rank), col), (pxs[0], row_y))
+        self.game.screen.blit(render_text(self.font_body, name, col), (pxs[1], row_y))
+        self.game.screen.blit(render_text(self.font_body, f"{s['score']:.0f}", col), (pxs[2], row_y))
+        self.game.screen.blit(render_text(self.font_body, f"{s['time']:.1f}s", col), (pxs[3], row_y))
+
     def _draw_controls_modal(self):
-        w, h = 420, 380
-        x, y = (self.SCREEN_W - w) // 2, (self.SCREEN_H - h) // 2
+        x, y, w, h = self._modal_rect()
         pygame.draw.rect(self.game.screen, (30, 41, 59), (x, y, w, h), border_radius=12)
         pygame.draw.rect(self.game.screen, (148, 163, 184), (x, y, w, h), 2, border_radius=12)
-        self.game.screen.blit(self.font_title.render("CONTROLS", True, (148, 163, 184)), (x + 25, y + 20))
+        self.game.screen.blit(render_text(self.font_title, "CONTROLS", (148, 163, 184)), (x + 25, y + 20))
         
         controls = [("WASD / Arrows", "Move"), ("SHIFT + Move", "Break Wall"), ("ENTER", "Use Portal"), 
-                    ("TAB", "Leaderboard"), ("B / H", "Toggle Hints"), ("R", "Retry"), ("T", "New Map"), ("ESC", "Menu")]
+                    ("TAB", "Leaderboard"), ("B / H", "Toggle Hints"), ("- / +", "Zoom"), ("R", "Retry"), ("T", "New Map"), ("ESC", "Menu")]
         cy = y + 80
         for key, desc in controls:
-            self.game.screen.blit(self.font_mono.render(key, True, COL_ACCENT), (x + 30, cy))
-            self.game.screen.blit(self.font_body.render(desc, True, COL_TEXT), (x + 200, cy))
+            self.game.screen.blit(render_text(self.font_mono, key, COL_ACCENT), (x + 30, cy))
+            self.game.screen.blit(render_text(self.font_body, desc, COL_TEXT), (x + 200, cy))
             cy += 32
\ No newline at end of file
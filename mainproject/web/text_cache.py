@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+# rendered strings kept; menus, HUD labels, controls and a page of scores fit easily
+TEXT_CACHE_SIZE = 512
+
+
+class TextCache:
+    """LRU of rendered text surfaces keyed by (font, text, color, antialias).
+
+    Blit the returned surface, don't draw on it: it's shared with every caller.
+    """
+
+    def __init__(self, size=TEXT_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._surfs = OrderedDict()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surf = self._surfs.get(key)
+        if surf is not None:
+            self._surfs.move_to_end(key)
+            self.hits += 1
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self._surfs[key] = surf
+        if len(self._surfs) > self.size:
+            self._surfs.popitem(last=False)
+        return surf
+
+    def hit_rate(self):
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def clear(self):
+        self._surfs.clear()
+
+
+_cache = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    return _cache.render(font, text, color, antialias)
+
+
+def text_stats():
+    return {"hits": _cache.hits, "misses": _cache.misses,
+            "size": len(_cache._surfs), "hit_rate": _cache.hit_rate()}